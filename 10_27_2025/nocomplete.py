@@ -1,5 +1,12 @@
+import argparse
 import math
-from sympy import isprime
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_fingerprint import FingerprintLog
+from trts_primes import is_prime
+from trts_telemetry import BitLengthTelemetry, RunBudget
 
 # Custom UnreducedRational class to avoid GCD
 class UnreducedRational:
@@ -51,43 +58,16 @@ class UnreducedRational:
         return False
     
     def __float__(self):
-        return float(self.numerator) / float(self.denominator)
+        # Integer true division stays finite for operands beyond float range
+        return self.numerator / self.denominator
     
     def __str__(self):
         return f"{self.numerator}/{self.denominator}"
 
-# Miller-Rabin primality test for large integers
-def is_miller_rabin_prime(n, k=5):
-    if n < 2:
-        return False
-    if n in (2, 3):
-        return True
-    if n % 2 == 0:
-        return False
-    
-    # Write n as d*2^r + 1
-    r, d = 0, n - 1
-    while d % 2 == 0:
-        r += 1
-        d //= 2
-    
-    # Witness loop
-    for _ in range(k):
-        a = random.randint(2, n - 2)
-        x = pow(a, d, n)
-        if x == 1 or x == n - 1:
-            continue
-        for _ in range(r - 1):
-            x = pow(x, 2, n)
-            if x == n - 1:
-                break
-        else:
-            return False
-    return True
-
 # TRTS Engine Implementation
 class TRTSEngine:
-    def __init__(self, psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q'):
+    def __init__(self, psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q',
+                 max_bits=None, max_rss_mb=None, fingerprint=False):
         self.upsilon = None
         self.beta = None
         self.koppa = UnreducedRational(0, 1)  # Default to 0
@@ -99,6 +79,12 @@ class TRTSEngine:
         self.psi_mode = psi_mode
         self.kappa_mode = kappa_mode
         self.engine_mode = engine_mode
+        # Unreduced operands grow without bound - track and cap them
+        self.telemetry = BitLengthTelemetry()
+        self.budget = RunBudget(max_bits, max_rss_mb)
+        self.status = 'ready'
+        # Rolling per-step fingerprint of the (reduced) state, see trts_fingerprint
+        self.fingerprints = FingerprintLog() if fingerprint else None
     
     def initialize_state(self, u_seed, b_seed):
         self.upsilon = u_seed
@@ -112,7 +98,7 @@ class TRTSEngine:
     
     def is_prime_trigger(self):
         num = abs(self.upsilon_num_unreduced)
-        return is_miller_rabin_prime(num)
+        return is_prime(num)
     
     def update_koppa(self, trigger):
         if trigger == 0:
@@ -183,8 +169,22 @@ class TRTSEngine:
     
     def execute_tick(self, total_steps=1000):
         results = []
+        self.status = 'running'
         for _ in range(total_steps * 11):  # 11 microticks per step
             self.process_microtick()
+            self.telemetry.observe(
+                (self.upsilon.numerator, self.upsilon.denominator),
+                (self.beta.numerator, self.beta.denominator),
+                (self.koppa.numerator, self.koppa.denominator))
+            reason = self.budget.check(self.telemetry) if self.budget else None
+            if reason:
+                self.status = f"stopped ({reason}) at step {self.step} mt{self.microtick}"
+                return results
+            if self.microtick == 11 and self.fingerprints is not None:
+                self.fingerprints.update(
+                    (self.upsilon.numerator, self.upsilon.denominator),
+                    (self.beta.numerator, self.beta.denominator),
+                    (self.koppa.numerator, self.koppa.denominator))
             if self.microtick == 11:  # Log at end of each tick
                 results.append({
                     'step': self.step,
@@ -197,44 +197,74 @@ class TRTSEngine:
                     'upsilon_unreduced': self.upsilon_num_unreduced,
                     'beta_unreduced': self.beta_num_unreduced
                 })
+        self.status = 'completed'
         return results
 
-# Test seeds with Fibonacci primes
-seeds = [
-    (UnreducedRational(13, 11), UnreducedRational(13, 7)),
-    (UnreducedRational(19, 7), UnreducedRational(89, 11)),
-    (UnreducedRational(2, 1), UnreducedRational(3, 1)),
-    (UnreducedRational(5, 1), UnreducedRational(13, 1)),
-    (UnreducedRational(22, 7), UnreducedRational(3, 11)),
-    (UnreducedRational(89, 1), UnreducedRational(233, 1))  # Fibonacci primes
-]
 
-import random
+def main():
+    # Test seeds with Fibonacci primes
+    seeds = [
+        (UnreducedRational(13, 11), UnreducedRational(13, 7)),
+        (UnreducedRational(19, 7), UnreducedRational(89, 11)),
+        (UnreducedRational(2, 1), UnreducedRational(3, 1)),
+        (UnreducedRational(5, 1), UnreducedRational(13, 1)),
+        (UnreducedRational(22, 7), UnreducedRational(3, 11)),
+        (UnreducedRational(89, 1), UnreducedRational(233, 1))  # Fibonacci primes
+    ]
+
+    parser = argparse.ArgumentParser(description='Unreduced TRTS seed runs')
+    parser.add_argument('--max-bits', type=int, default=None,
+                        help='Stop a seed cleanly once any operand exceeds this many bits')
+    parser.add_argument('--max-rss', type=float, default=None,
+                        help='Stop a seed cleanly once process RSS exceeds this many MB')
+    parser.add_argument('--fingerprints', type=str, default=None, metavar='PREFIX',
+                        help='Write each seed\'s rolling per-step state fingerprints '
+                             'to PREFIX<seed>.fp')
+    args = parser.parse_args()
+
+    # Run simulations
+    for i, (u_seed, b_seed) in enumerate(seeds):
+        engine = TRTSEngine(psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q',
+                            max_bits=args.max_bits, max_rss_mb=args.max_rss,
+                            fingerprint=bool(args.fingerprints))
+        engine.initialize_state(u_seed, b_seed)
+        results = engine.execute_tick(total_steps=500)
+    
+        print(f"Seed {i+1}: ({u_seed}, {b_seed})")
+        print(f"  Status: {engine.status}")
+        print(f"  {engine.telemetry.format_summary()}")
+        if engine.fingerprints is not None:
+            engine.fingerprints.save(f"{args.fingerprints}{i+1}.fp")
+            print(f"  Fingerprint after step {len(engine.fingerprints)}: "
+                  f"{engine.fingerprints.value:016x}")
+        if not results:
+            print()
+            continue
+    
+        # Analyze final state
+        final = results[-1]
+        print(f"  Final ratio: {final['ratio']:.6f}")
+        print(f"  Final kappa: {final['koppa']:.6f}")
+        print(f"  Prime triggers: {sum(1 for r in results if r['rho'] == 1)}")
+        print(f"  Converged to √2: {abs(final['ratio'] - math.sqrt(2)) < 1e-5}")
+        print(f"  Converged to 1.0: {abs(final['ratio'] - 1.0) < 1e-5}")
+        print()
+
+    # Check for fine-structure constant approximation
+    alpha = 1 / 137.035999084
+    print(f"Fine-structure constant (α): {alpha:.10f}")
+    print("Checking if any ratios approximate α...")
+    for i, (u_seed, b_seed) in enumerate(seeds):
+        engine = TRTSEngine(psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q',
+                            max_bits=args.max_bits, max_rss_mb=args.max_rss)
+        engine.initialize_state(u_seed, b_seed)
+        results = engine.execute_tick(total_steps=500)
+        if not results:
+            continue
+        final_ratio = results[-1]['ratio']
+        if abs(final_ratio - alpha) < 0.001:  # Allow some tolerance
+            print(f"Seed {i+1} approximates α: {final_ratio:.6f} vs {alpha:.6f}")
 
-# Run simulations
-for i, (u_seed, b_seed) in enumerate(seeds):
-    engine = TRTSEngine(psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q')
-    engine.initialize_state(u_seed, b_seed)
-    results = engine.execute_tick(total_steps=500)
-    
-    # Analyze final state
-    final = results[-1]
-    print(f"Seed {i+1}: ({u_seed}, {b_seed})")
-    print(f"  Final ratio: {final['ratio']:.6f}")
-    print(f"  Final kappa: {final['koppa']:.6f}")
-    print(f"  Prime triggers: {sum(1 for r in results if r['rho'] == 1)}")
-    print(f"  Converged to √2: {abs(final['ratio'] - math.sqrt(2)) < 1e-5}")
-    print(f"  Converged to 1.0: {abs(final['ratio'] - 1.0) < 1e-5}")
-    print()
 
-# Check for fine-structure constant approximation
-alpha = 1 / 137.035999084
-print(f"Fine-structure constant (α): {alpha:.10f}")
-print("Checking if any ratios approximate α...")
-for i, (u_seed, b_seed) in enumerate(seeds):
-    engine = TRTSEngine(psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q')
-    engine.initialize_state(u_seed, b_seed)
-    results = engine.execute_tick(total_steps=500)
-    final_ratio = results[-1]['ratio']
-    if abs(final_ratio - alpha) < 0.001:  # Allow some tolerance
-        print(f"Seed {i+1} approximates α: {final_ratio:.6f} vs {alpha:.6f}")
+if __name__ == '__main__':
+    main()
@@ -45,5 +45,8 @@ public:
     std::string get_upsilon_ratio() const;
     std::string get_beta_ratio() const;
     std::string get_koppa_ratio() const;
+    const Rational& get_upsilon() const { return upsilon; }
+    const Rational& get_beta() const { return beta; }
+    const Rational& get_koppa() const { return koppa; }
 };
 
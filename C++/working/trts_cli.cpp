@@ -1,5 +1,7 @@
 #include "TRTS_Engine.h"
+#include "trts_fingerprint.h"
 #include <boost/program_options.hpp>
+#include <iomanip>
 #include <iostream>
 #include <sstream>
 
@@ -51,6 +53,7 @@ int main(int argc, char* argv[]) {
     std::string psi_str, koppa_str, engine_str;
     std::string u_seed_str, b_seed_str;
     int ticks = 5;
+    bool fingerprint = false;
 
     po::options_description desc("TRTS Shadow Core (compact CLI)");
     desc.add_options()
@@ -60,7 +63,8 @@ int main(int argc, char* argv[]) {
         ("engine,e", po::value(&engine_str)->default_value("3"), "Engine: [0=ADD,1=MULTI,2=ROT,3=QUIET]")
         ("u,u_seed", po::value(&u_seed_str)->required(), "Upsilon seed (e.g. 22/7)")
         ("b,b_seed", po::value(&b_seed_str)->required(), "Beta seed (e.g. 19/11)")
-        ("ticks,t", po::value(&ticks)->default_value(5), "Number of macro-ticks");
+        ("ticks,t", po::value(&ticks)->default_value(5), "Number of macro-ticks")
+        ("fingerprint,f", po::bool_switch(&fingerprint), "Print the rolling state fingerprint after each tick (FP <tick> <hex>)");
 
     po::variables_map vm;
     try {
@@ -96,11 +100,18 @@ int main(int argc, char* argv[]) {
         std::cout << "υ₀=" << truncate(u_seed_str) << ", β₀=" << truncate(b_seed_str)
                   << " | ticks=" << ticks << "\n";
 
+        std::uint64_t rolling = 0;
         for (int t = 1; t <= ticks; ++t) {
             engine.execute_step();
             std::cout << "\n[TICK " << t << "] υ=" << truncate(engine.get_upsilon_ratio())
                       << "  β=" << truncate(engine.get_beta_ratio())
                       << "  κ=" << truncate(engine.get_koppa_ratio()) << std::endl;
+            if (fingerprint) {
+                rolling = trts_fingerprint::roll(rolling, engine.get_upsilon(),
+                                                 engine.get_beta(), engine.get_koppa());
+                std::cout << "FP " << t << " " << std::hex << std::setw(16) << std::setfill('0')
+                          << rolling << std::dec << std::setfill(' ') << std::endl;
+            }
         }
 
         std::cout << "\n--- PROPAGATION COMPLETE ---\n";
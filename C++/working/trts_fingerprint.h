@@ -0,0 +1,40 @@
+#pragma once
+#include "TRTS_Engine.h"
+#include <zlib.h>
+#include <cstdint>
+#include <iterator>
+#include <vector>
+
+// Rolling state fingerprint, byte-for-byte the one in trts_fingerprint.py:
+// each integer is a sign byte, a 4-byte little-endian length and its
+// little-endian magnitude; a tick's value is crc32 << 32 | adler32 over
+// the previous value (8 bytes LE) followed by reduced υ, β, κ.
+// boost::rational is always reduced with a positive denominator, which
+// is already the canonical form.
+
+namespace trts_fingerprint {
+
+inline void encode(const HighPrecisionInt& value, std::vector<unsigned char>& out) {
+    std::vector<unsigned char> magnitude;
+    if (value != 0)
+        boost::multiprecision::export_bits(HighPrecisionInt(abs(value)), std::back_inserter(magnitude), 8, false);
+    out.push_back(value < 0 ? 1 : 0);
+    const std::uint32_t length = static_cast<std::uint32_t>(magnitude.size());
+    for (int i = 0; i < 4; ++i) out.push_back((length >> (8 * i)) & 0xff);
+    out.insert(out.end(), magnitude.begin(), magnitude.end());
+}
+
+inline std::uint64_t roll(std::uint64_t previous, const Rational& upsilon,
+                          const Rational& beta, const Rational& koppa) {
+    std::vector<unsigned char> data;
+    for (int i = 0; i < 8; ++i) data.push_back((previous >> (8 * i)) & 0xff);
+    for (const Rational* r : {&upsilon, &beta, &koppa}) {
+        encode(r->numerator(), data);
+        encode(r->denominator(), data);
+    }
+    const uLong crc = crc32(0L, data.data(), static_cast<uInt>(data.size()));
+    const uLong adler = adler32(1L, data.data(), static_cast<uInt>(data.size()));
+    return (static_cast<std::uint64_t>(crc) << 32) | static_cast<std::uint32_t>(adler);
+}
+
+} // namespace trts_fingerprint
@@ -1,21 +1,13 @@
+import argparse
 import math
-import random
+import os
+import sys
+from collections import deque
 
-def is_prime(n):
-    if n < 2: return False
-    for p in [2,3,5,7,11,13,17,19,23,29]:
-        if n % p == 0: return n == p
-    d, s = n-1, 0
-    while d % 2 == 0: d, s = d//2, s+1
-    for _ in range(3):
-        a = random.randint(2, n-2)
-        x = pow(a, d, n)
-        if x in [1, n-1]: continue
-        for _ in range(s-1):
-            x = pow(x, 2, n)
-            if x == n-1: break
-        else: return False
-    return True
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..'))
+from trts_monitors import MonitorSet, parse_monitor
+from trts_primes import is_prime
+from trts_telemetry import BitLengthTelemetry, RunBudget
 
 class Rat:
     def __init__(self, n, d=1):
@@ -28,9 +20,16 @@ class Rat:
     def __str__(self): return f"{self.n}/{self.d}"
 
 class TRTS:
-    def __init__(self):
+    def __init__(self, max_bits=None, max_rss_mb=None, monitor_every='step'):
         self.u = self.b = self.k = Rat(0,1)
         self.rho = self.mt = 0
+        self.telemetry = BitLengthTelemetry(('u', 'b', 'k'))
+        self.budget = RunBudget(max_bits, max_rss_mb)
+        self.status = 'ready'
+        self.monitors = MonitorSet(monitor_every)
+    
+    def add_monitor(self, monitor):
+        return self.monitors.add(monitor)
     
     def init_state(self, u_seed, b_seed):
         self.u, self.b = u_seed, b_seed
@@ -44,7 +43,7 @@ class TRTS:
         if self.mt in [1,4]: 
             self.k = self.k + (self.u - self.b)
         elif self.mt == 7: 
-            if float(self.k) == 0: self.k = Rat(1,1)
+            if self.k.n == 0: self.k = Rat(1,1)
             self.k = self.k * (self.u / self.b)
         elif self.mt == 10: 
             self.k = self.u / self.b
@@ -72,18 +71,55 @@ class TRTS:
         
         self.propagate()
     
-    def run(self, steps, u_seed, b_seed):
+    def run(self, steps, u_seed, b_seed, keep=100):
+        """
+        Run steps microticks; returns (emissions, υ/β of the last keep microticks).
+        
+        Only the trailing exact (υ, β) pairs are kept, and turned into
+        floats once at the end.
+        """
         self.init_state(u_seed, b_seed)
         emissions = 0
-        ratios = []
+        tail = deque(maxlen=keep)
+        monitors = self.monitors
+        self.status = 'running'
         for i in range(steps):
             self.step()
+            self.telemetry.observe((self.u.n, self.u.d), (self.b.n, self.b.d), (self.k.n, self.k.d))
+            reason = self.budget.check(self.telemetry) if self.budget else None
+            if reason:
+                self.status = f"stopped ({reason}) at microtick {i}"
+                return emissions, self._ratios(tail)
             if self.rho: 
                 emissions += 1
                 self.rho = 0
-            # Record ratio at each step
-            ratios.append(float(self.u)/float(self.b))
-        return emissions, ratios
+            # Keep the exact state of each step
+            tail.append((self.u, self.b))
+            if monitors and monitors.due(i // 11, self.mt):
+                monitors.check(i // 11, self.mt, (self.u.n, self.u.d), (self.b.n, self.b.d),
+                               (self.k.n, self.k.d))
+                if monitors.stopped_by:
+                    self.status = f"stopped (monitor {monitors.stopped_by.name}) at microtick {i}"
+                    return emissions, self._ratios(tail)
+        self.status = 'completed'
+        return emissions, self._ratios(tail)
+    
+    @staticmethod
+    def _ratios(tail):
+        return [float(u)/float(b) for u, b in tail]
+
+parser = argparse.ArgumentParser(description='TRTS zeta-zero seed runs')
+parser.add_argument('--max-bits', type=int, default=None,
+                    help='Stop a seed cleanly once any operand exceeds this many bits')
+parser.add_argument('--max-rss', type=float, default=None,
+                    help='Stop a seed cleanly once process RSS exceeds this many MB')
+parser.add_argument('--monitor', type=str, action='append', default=[],
+                    help='Count hits of ratio=LOW:HIGH, square=TARGET:EPS or bits=B')
+parser.add_argument('--stop-when', type=str, action='append', default=[],
+                    help='Stop a seed cleanly the first time this predicate holds')
+parser.add_argument('--monitor-every', type=str, default='step',
+                    help='Monitor granularity: ' + '|'.join(MonitorSet.GRANULARITIES))
+args = parser.parse_args()
 
 print("=== ZETA ZEROS EMERGENCE ===")
 
@@ -96,8 +132,19 @@ seeds = [
 
 for u_seed, b_seed in seeds:
     print(f"\n--- Seed: {u_seed}, {b_seed} ---")
-    engine = TRTS()
+    engine = TRTS(max_bits=args.max_bits, max_rss_mb=args.max_rss,
+                  monitor_every=args.monitor_every)
+    for spec in args.monitor:
+        engine.add_monitor(parse_monitor(spec))
+    for spec in args.stop_when:
+        engine.add_monitor(parse_monitor(spec, stop=True))
     emissions, ratios = engine.run(500, u_seed, b_seed)
+    print(f"Status: {engine.status}")
+    print(engine.telemetry.format_summary())
+    if engine.monitors:
+        print(engine.monitors.format_summary())
+    if not ratios:
+        continue
     
     # Analyze the ratio patterns for zeta zero structure
     print(f"Final ratio: {ratios[-1]:.6f}")
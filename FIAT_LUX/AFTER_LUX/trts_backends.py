@@ -0,0 +1,175 @@
+"""
+TRTS Numeric Backends
+Pluggable rational arithmetic for the TRTS engine.
+
+Backends:
+- sympy: sympy.Rational (reduced by GCD on every operation)
+- int:   raw unreduced (numerator, denominator) pairs of Python ints
+- gmpy2: raw unreduced pairs of gmpy2.mpz (falls back to int if missing)
+
+Unreduced backends never take a GCD. Sign is carried by the numerator
+(denominator kept positive) so abs()-based trigger checks and the
+Ψ/κ operations behave exactly as with sympy.
+
+Sums reuse a denominator when one is a multiple of the other, so with
+additive κ modes (ACCUMULATE, DUMP, OSCILLATE) υ, β and κ stay on a
+common denominator that grows linearly, about 53 bits per step on the
+default trtsd run (1,900 bits at step 35, against 1,500 for sympy). Products always multiply, so under κ FEED (κ *= υ/β) the pairs
+grow about 3.4x in bits per microtick: 80,000 bits at step 0 mt8, 3.2
+million at mt11 (8 s for that microtick alone). That is where the
+unreduced backends stop being usable; bound such runs with --max-bits.
+"""
+
+from typing import Callable, Dict
+
+
+class PairRational:
+    """Unreduced rational stored as a raw numerator/denominator pair."""
+
+    __slots__ = ('numerator', 'denominator')
+
+    def __init__(self, numerator, denominator):
+        if denominator == 0:
+            raise ZeroDivisionError(f"PairRational({numerator}, 0)")
+        if denominator < 0:
+            numerator, denominator = -numerator, -denominator
+        self.numerator = numerator
+        self.denominator = denominator
+
+    def _coerce(self, other):
+        if isinstance(other, PairRational):
+            return other.numerator, other.denominator
+        return other, 1
+
+    def as_numer_denom(self):
+        return self.numerator, self.denominator
+
+    def _common(self, n, d):
+        """
+        self and n/d as numerators over one denominator.
+
+        When one denominator is a multiple of the other (always true for
+        equal denominators and integers) the larger one is shared, so
+        sums of values that came from the same denominators stay on
+        them; otherwise the denominators are multiplied. This is an
+        exact-multiple test, not a GCD: pairs stay unreduced.
+        """
+        sd = self.denominator
+        if d == sd:
+            return self.numerator, n, sd
+        if sd % d == 0:
+            return self.numerator, n * (sd // d), sd
+        if d % sd == 0:
+            return self.numerator * (d // sd), n, d
+        return self.numerator * d, n * sd, sd * d
+
+    def __add__(self, other):
+        a, b, d = self._common(*self._coerce(other))
+        return PairRational(a + b, d)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        a, b, d = self._common(*self._coerce(other))
+        return PairRational(a - b, d)
+
+    def __rsub__(self, other):
+        a, b, d = self._common(*self._coerce(other))
+        return PairRational(b - a, d)
+
+    def __mul__(self, other):
+        n, d = self._coerce(other)
+        return PairRational(self.numerator * n, self.denominator * d)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        n, d = self._coerce(other)
+        return PairRational(self.numerator * d, self.denominator * n)
+
+    def __rtruediv__(self, other):
+        n, d = self._coerce(other)
+        return PairRational(n * self.denominator, d * self.numerator)
+
+    def __neg__(self):
+        return PairRational(-self.numerator, self.denominator)
+
+    def __eq__(self, other):
+        n, d = self._coerce(other)
+        return self.numerator * d == n * self.denominator
+
+    # Equal values can have different pairs, so no hash consistent with __eq__
+    __hash__ = None
+
+    def __float__(self):
+        # Integer true division is correctly rounded for arbitrarily large operands
+        return float(int(self.numerator) / int(self.denominator))
+
+    def __repr__(self):
+        return f"{self.numerator}/{self.denominator}"
+
+
+class NumericBackend:
+    """Factory for the rational type used by the engine."""
+
+    name = 'base'
+
+    def rational(self, numerator, denominator=1):
+        raise NotImplementedError
+
+    def one(self):
+        return self.rational(1, 1)
+
+
+class SympyBackend(NumericBackend):
+    """Reference backend: sympy.Rational with implicit GCD reduction."""
+
+    name = 'sympy'
+
+    def __init__(self):
+        import sympy as sp
+        self._rational = sp.Rational
+
+    def rational(self, numerator, denominator=1):
+        return self._rational(numerator, denominator)
+
+
+class IntPairBackend(NumericBackend):
+    """Unreduced numerator/denominator pairs of native integers."""
+
+    name = 'int'
+
+    def __init__(self, int_type: Callable = int):
+        self.int_type = int_type
+
+    def rational(self, numerator, denominator=1):
+        return PairRational(self.int_type(numerator), self.int_type(denominator))
+
+
+class Gmpy2Backend(IntPairBackend):
+    """Unreduced pairs of gmpy2.mpz integers."""
+
+    name = 'gmpy2'
+
+    def __init__(self):
+        import gmpy2
+        super().__init__(gmpy2.mpz)
+
+
+BACKENDS: Dict[str, Callable[[], NumericBackend]] = {
+    'sympy': SympyBackend,
+    'int': IntPairBackend,
+    'gmpy2': Gmpy2Backend,
+}
+
+
+def get_backend(name: str = 'sympy') -> NumericBackend:
+    """Return a backend by name. gmpy2 falls back to int pairs if not installed."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend '{name}' (choose from {', '.join(BACKENDS)})")
+    try:
+        return BACKENDS[name]()
+    except ImportError:
+        if name == 'gmpy2':
+            return IntPairBackend()
+        raise
@@ -0,0 +1,60 @@
+"""
+TRTS Linear Jump-Ahead
+Exact matrix arithmetic for mode combinations whose microticks are
+linear maps of (υ, β, κ).
+
+A step map with rational coefficients M is stored as an integer matrix
+A = D·M and a scalar denominator D, so N steps are A^N / D^N: O(log N)
+big-integer products by repeated squaring, with no GCD along the way.
+"""
+
+import math
+from fractions import Fraction
+from typing import List, Sequence, Tuple
+
+Matrix = List[List]
+
+
+def identity(size: int) -> Matrix:
+    return [[int(i == j) for j in range(size)] for i in range(size)]
+
+
+def mat_mul(a: Matrix, b: Matrix) -> Matrix:
+    """Product a·b (entries may be ints or Fractions)."""
+    columns = list(zip(*b))
+    return [[sum(x * y for x, y in zip(row, col)) for col in columns] for row in a]
+
+
+def mat_pow(m: Matrix, exponent: int) -> Matrix:
+    """m^exponent by repeated squaring."""
+    result = identity(len(m))
+    while exponent:
+        if exponent & 1:
+            result = mat_mul(result, m)
+        exponent >>= 1
+        if exponent:
+            m = mat_mul(m, m)
+    return result
+
+
+def mat_vec(m: Matrix, v: Sequence[int]) -> List[int]:
+    return [sum(x * y for x, y in zip(row, v)) for row in m]
+
+
+def integer_matrix(m: Matrix) -> Tuple[Matrix, int]:
+    """(A, D) with A = D·m integral, D the lcm of m's denominators."""
+    denominator = math.lcm(*(Fraction(x).denominator for row in m for x in row))
+    return [[int(Fraction(x) * denominator) for x in row] for row in m], denominator
+
+
+def jump(matrix: Matrix, denominator: int, state: Sequence[Tuple[int, int]],
+         steps: int) -> List[Tuple[int, int]]:
+    """
+    Advance (numerator, denominator) pairs by steps applications of
+    matrix / denominator. The results share one (unreduced) denominator.
+    """
+    common = math.lcm(*(den for _, den in state))
+    vector = [num * (common // den) for num, den in state]
+    vector = mat_vec(mat_pow(matrix, steps), vector)
+    scale = common * denominator ** steps
+    return [(num, scale) for num in vector]
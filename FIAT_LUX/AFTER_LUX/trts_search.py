@@ -0,0 +1,370 @@
+"""
+TRTS Target-Window Seed Search
+The inverse of trts_target.py: which (seeds, modes) ever put υ/β inside
+a Standard Model target window?
+
+Seed and mode space is enumerated like trts_sweep and evaluated on a
+process pool. Every completed step is tested against each window with
+exact integer cross-multiplication (no float conversion of υ/β). A run
+is pruned as soon as |υ/β| exceeds --max-ratio (diverged) or an operand
+outgrows --max-bits.
+
+Results go into an SQLite index: one coverage row per (configuration,
+target) and one hit row per configuration that entered the window. A
+repeated search skips every configuration whose requested targets are
+already covered to at least the requested number of steps (or whose
+earlier run was pruned under a --max-bits / --max-ratio no smaller than
+the current one), and --query TARGET reads hits back without running
+anything.
+"""
+
+import argparse
+import itertools
+import os
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from fractions import Fraction
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from trtsd import EngineType, KoppaMode, PsiMode, TRTSEngine
+from trts_sweep import parse_int_list, parse_modes
+
+# Columns added to coverage after its first release (indexes created before get them NULL)
+COVERAGE_BUDGET_COLUMNS = {'max_bits': 'INTEGER', 'max_ratio': 'TEXT'}
+
+# name -> (low, high), both exclusive, as in trts_target.py
+DEFAULT_TARGETS = {
+    'alpha_inverse': ('137.0', '137.1'),
+    'proton_electron': ('1800', '1900'),
+}
+
+CONFIG_FIELDS = [
+    'psi_mode', 'koppa_mode', 'engine_type',
+    'u_seed', 'u_denom', 'b_seed', 'b_denom', 'backend',
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS targets (
+    name TEXT PRIMARY KEY,
+    low TEXT NOT NULL,
+    high TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS coverage (
+    config TEXT NOT NULL,
+    target TEXT NOT NULL,
+    steps INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    max_bits INTEGER,
+    max_ratio TEXT,
+    PRIMARY KEY (config, target)
+);
+CREATE TABLE IF NOT EXISTS hits (
+    config TEXT NOT NULL,
+    target TEXT NOT NULL,
+    psi_mode TEXT, koppa_mode TEXT, engine_type TEXT,
+    u_seed INTEGER, u_denom INTEGER, b_seed INTEGER, b_denom INTEGER,
+    backend TEXT,
+    first_step INTEGER NOT NULL,
+    steps_in_window INTEGER NOT NULL,
+    ratio_num TEXT NOT NULL,
+    ratio_den TEXT NOT NULL,
+    PRIMARY KEY (config, target)
+);
+CREATE INDEX IF NOT EXISTS hits_by_target ON hits (target, first_step);
+"""
+
+
+class TargetWindow:
+    """Open interval (low, high) tested exactly against an integer ratio P/Q."""
+
+    def __init__(self, name: str, low, high):
+        self.name = name
+        self.low = Fraction(low)
+        self.high = Fraction(high)
+        if self.low >= self.high:
+            raise ValueError(f"Empty target window '{name}' ({low}, {high})")
+
+    def contains(self, p: int, q: int) -> bool:
+        """low < p/q < high, for q > 0, by cross-multiplication only."""
+        low, high = self.low, self.high
+        return (low.numerator * q < low.denominator * p and
+                high.denominator * p < high.numerator * q)
+
+    def spec(self) -> Tuple[str, str, str]:
+        return self.name, str(self.low), str(self.high)
+
+
+def parse_targets(specs: Optional[Sequence[str]]) -> List[TargetWindow]:
+    """'name=low:high' entries (decimals are read exactly); default: DEFAULT_TARGETS."""
+    if not specs:
+        return [TargetWindow(name, *bounds) for name, bounds in DEFAULT_TARGETS.items()]
+    windows = []
+    for spec in specs:
+        name, sep, bounds = spec.partition('=')
+        low, colon, high = bounds.partition(':')
+        if not (sep and colon and name):
+            raise ValueError(f"Bad target '{spec}' (expected name=low:high)")
+        windows.append(TargetWindow(name.strip(), low.strip(), high.strip()))
+    return windows
+
+
+def config_key(config: Dict) -> str:
+    return '|'.join(str(config[field]) for field in CONFIG_FIELDS)
+
+
+def iter_configs(args) -> Iterator[Dict]:
+    """Cartesian product of modes and seeds (zero denominators skipped)."""
+    grid = itertools.product(
+        parse_modes(args.psi_modes, PsiMode),
+        parse_modes(args.koppa_modes, KoppaMode),
+        parse_modes(args.engine_types, EngineType),
+        parse_int_list(args.u_seeds), parse_int_list(args.u_denoms),
+        parse_int_list(args.b_seeds), parse_int_list(args.b_denoms),
+    )
+    for psi, koppa, engine, u_seed, u_denom, b_seed, b_denom in grid:
+        if u_denom == 0 or b_denom == 0 or b_seed == 0:
+            continue
+        yield {
+            'psi_mode': psi, 'koppa_mode': koppa, 'engine_type': engine,
+            'u_seed': u_seed, 'u_denom': u_denom,
+            'b_seed': b_seed, 'b_denom': b_denom,
+            'backend': args.backend,
+        }
+
+
+def search_configuration(config: Dict, windows: Sequence[TargetWindow], ticks: int,
+                         max_bits: Optional[int], max_ratio: Fraction) -> Dict:
+    """
+    Worker: run one configuration, testing every step end against each window.
+
+    Returns the steps run, a status (completed / pruned (...) / error) and,
+    per window entered, the first step, the ratio there and the number
+    of steps spent inside.
+    """
+    result = {'config': config, 'steps': 0, 'hits': {},
+              'max_bits': max_bits or None, 'max_ratio': str(max_ratio)}
+    try:
+        engine = TRTSEngine(
+            u_seed=config['u_seed'], u_denom=config['u_denom'],
+            b_seed=config['b_seed'], b_denom=config['b_denom'],
+            psi_mode=PsiMode(config['psi_mode']),
+            koppa_mode=KoppaMode(config['koppa_mode']),
+            engine_type=EngineType(config['engine_type']),
+            backend=config['backend'],
+            record='none',
+            max_bits=max_bits,
+        )
+        hits = result['hits']
+        result['status'] = 'completed'
+        for step in range(ticks):
+            engine.execute_step(1)
+            if engine.status.startswith('stopped'):
+                result['status'] = 'pruned (bits)'
+                break
+            result['steps'] = step + 1
+
+            # υ/β = (un·bd) / (ud·bn), sign carried by the numerator
+            p = int(engine.upsilon.numerator) * int(engine.beta.denominator)
+            q = int(engine.upsilon.denominator) * int(engine.beta.numerator)
+            if q == 0:
+                result['status'] = 'pruned (diverged)'
+                break
+            if q < 0:
+                p, q = -p, -q
+            for window in windows:
+                if window.contains(p, q):
+                    hit = hits.setdefault(window.name, {'first_step': step, 'steps_in_window': 0,
+                                                        'ratio_num': p, 'ratio_den': q})
+                    hit['steps_in_window'] += 1
+            if abs(p) * max_ratio.denominator > max_ratio.numerator * q:
+                result['status'] = 'pruned (diverged)'
+                break
+    except Exception as e:  # a failing configuration must not stop the search
+        result['status'] = f"error: {type(e).__name__}"
+    return result
+
+
+class SearchIndex:
+    """SQLite store of target definitions, coverage and hits."""
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+        columns = {row[1] for row in self.db.execute('PRAGMA table_info(coverage)')}
+        for name, kind in COVERAGE_BUDGET_COLUMNS.items():
+            if name not in columns:
+                self.db.execute(f'ALTER TABLE coverage ADD COLUMN {name} {kind}')
+        self.db.commit()
+
+    def register(self, windows: Sequence[TargetWindow]):
+        """
+        Record the target bounds. A name whose bounds changed has its
+        coverage and hits dropped, since they answer a different question.
+        """
+        for window in windows:
+            name, low, high = window.spec()
+            row = self.db.execute('SELECT low, high FROM targets WHERE name = ?', (name,)).fetchone()
+            if row is not None and tuple(row) != (low, high):
+                self.db.execute('DELETE FROM coverage WHERE target = ?', (name,))
+                self.db.execute('DELETE FROM hits WHERE target = ?', (name,))
+            self.db.execute('INSERT OR REPLACE INTO targets VALUES (?, ?, ?)', (name, low, high))
+        self.db.commit()
+
+    def is_covered(self, key: str, targets: Sequence[str], ticks: int,
+                   max_bits: Optional[int], max_ratio: Fraction) -> bool:
+        """
+        Whether every target already has an answer for this run length
+        and budget. A pruned run only counts while the budget that pruned
+        it is at least the current one (unknown budgets are re-run).
+        """
+        for target in targets:
+            row = self.db.execute('SELECT steps, status, max_bits, max_ratio FROM coverage '
+                                  'WHERE config = ? AND target = ?', (key, target)).fetchone()
+            if row is None:
+                return False
+            steps, status, pruned_bits, pruned_ratio = row
+            if status == 'completed' and steps < ticks:
+                return False
+            if status.startswith('error'):
+                return False
+            if status == 'pruned (bits)' and (pruned_bits is None or not max_bits
+                                              or max_bits > pruned_bits):
+                return False
+            if status == 'pruned (diverged)' and (pruned_ratio is None
+                                                  or max_ratio > Fraction(pruned_ratio)):
+                return False
+        return True
+
+    def store(self, result: Dict, targets: Sequence[str]):
+        config = result['config']
+        key = config_key(config)
+        for target in targets:
+            self.db.execute('INSERT OR REPLACE INTO coverage '
+                            '(config, target, steps, status, max_bits, max_ratio) '
+                            'VALUES (?, ?, ?, ?, ?, ?)',
+                            (key, target, result['steps'], result['status'],
+                             result['max_bits'], result['max_ratio']))
+            hit = result['hits'].get(target)
+            if hit is None:
+                self.db.execute('DELETE FROM hits WHERE config = ? AND target = ?', (key, target))
+                continue
+            self.db.execute(
+                'INSERT OR REPLACE INTO hits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, target, *(config[field] for field in CONFIG_FIELDS),
+                 hit['first_step'], hit['steps_in_window'],
+                 str(hit['ratio_num']), str(hit['ratio_den'])))
+
+    def commit(self):
+        self.db.commit()
+
+    def query(self, target: str, limit: Optional[int] = None) -> List[Dict]:
+        """Hits for one target, earliest entry first."""
+        sql = ('SELECT * FROM hits WHERE target = ? ORDER BY first_step, config'
+               + (' LIMIT ?' if limit else ''))
+        cursor = self.db.execute(sql, (target, limit) if limit else (target,))
+        names = [column[0] for column in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def close(self):
+        self.db.close()
+
+
+def run_search(args) -> int:
+    """Evaluate every uncovered configuration, indexing results as they complete."""
+    windows = parse_targets(args.target)
+    targets = [window.name for window in windows]
+    max_ratio = Fraction(args.max_ratio)
+    index = SearchIndex(args.index)
+    index.register(windows)
+
+    pending = (c for c in iter_configs(args)
+               if not index.is_covered(config_key(c), targets, args.ticks,
+                                       args.max_bits, max_ratio))
+    workers = args.workers or os.cpu_count()
+    max_in_flight = workers * 4
+    done = hits = 0
+    start = time.perf_counter()
+
+    def collect(in_flight):
+        nonlocal done, hits
+        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in finished:
+            result = future.result()
+            index.store(result, targets)
+            done += 1
+            hits += bool(result['hits'])
+        index.commit()
+        if args.verbose:
+            print(f"  {done} runs evaluated, {hits} with hits")
+        return in_flight
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for config in pending:
+            if len(in_flight) >= max_in_flight:
+                in_flight = collect(in_flight)
+            in_flight.add(pool.submit(search_configuration, config, windows,
+                                      args.ticks, args.max_bits, max_ratio))
+        while in_flight:
+            in_flight = collect(in_flight)
+
+    index.close()
+    print(f"Search finished: {done} new runs ({hits} with hits) in "
+          f"{time.perf_counter() - start:.1f}s; index {args.index}")
+    return done
+
+
+def print_query(args):
+    index = SearchIndex(args.index)
+    rows = index.query(args.query, args.limit)
+    index.close()
+    print(f"=== {args.query}: {len(rows)} hit configurations ===")
+    for row in rows:
+        ratio = int(row['ratio_num']) / int(row['ratio_den'])
+        print(f"Ψ={row['psi_mode']} κ={row['koppa_mode']} {row['engine_type']} "
+              f"υ={row['u_seed']}/{row['u_denom']} β={row['b_seed']}/{row['b_denom']} "
+              f"[{row['backend']}]: step {row['first_step']} (ratio {ratio:.6f}), "
+              f"{row['steps_in_window']} steps in window")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TRTS target-window seed search (indexed, multi-process)')
+    parser.add_argument('--psi-modes', type=str, default='ALL', help="Comma list of Ψ modes or ALL")
+    parser.add_argument('--koppa-modes', type=str, default='ALL', help="Comma list of κ modes or ALL")
+    parser.add_argument('--engine-types', type=str, default='ALL',
+                       help="Comma list of engine types or ALL")
+    parser.add_argument('--u-seeds', type=str, default='1-20', help="υ numerators, e.g. 1-20 or 13,22")
+    parser.add_argument('--u-denoms', type=str, default='1-11', help="υ denominators")
+    parser.add_argument('--b-seeds', type=str, default='1-20', help="β numerators")
+    parser.add_argument('--b-denoms', type=str, default='1-11', help="β denominators")
+    parser.add_argument('--ticks', type=int, default=50, help='Steps per run')
+    parser.add_argument('--backend', type=str, default='sympy', help='Numeric backend per run')
+    parser.add_argument('--target', type=str, action='append', default=None,
+                       help="Target window name=low:high (repeatable; default: "
+                            + ', '.join(f"{n}={lo}:{hi}" for n, (lo, hi) in DEFAULT_TARGETS.items()) + ')')
+    parser.add_argument('--max-bits', type=int, default=4096,
+                       help='Prune runs once any operand exceeds this many bits (0 = no limit)')
+    parser.add_argument('--max-ratio', type=str, default='1e6',
+                       help='Prune runs once |υ/β| exceeds this (diverged)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--index', type=str, default='trts_search.db', help='SQLite hit index')
+    parser.add_argument('--query', type=str, default=None,
+                       help='Print indexed hits for this target and exit')
+    parser.add_argument('--limit', type=int, default=None, help='Rows shown by --query')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print progress')
+    args = parser.parse_args()
+
+    if args.query:
+        print_query(args)
+        return
+    try:
+        parse_targets(args.target)
+        Fraction(args.max_ratio)
+    except ValueError as e:
+        parser.error(str(e))
+    run_search(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+TRTS Mode-Space Sweep
+Runs every PsiMode × KoppaMode × EngineType × seed combination of
+trtsd.TRTSEngine on a process pool and merges the per-run convergence
+summaries into one CSV result table.
+
+The table is appended (and flushed) as each run finishes, so a crashed
+sweep resumes by re-running the same command: configurations already in
+the table are skipped. A configuration includes the budget, stop
+predicates and recording policy, so changing any of them re-runs it.
+--stop-when predicates (see trts_monitors) let runs that have settled
+or blown up end early. Workers record end-of-step states only
+(--record), so min/max/avg error are at step resolution.
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Set, Tuple
+
+from trtsd import EngineType, KoppaMode, PsiMode, TRTSEngine
+from trts_monitors import MonitorSet, parse_monitor
+from trts_recorder import RecordPolicy
+
+CONFIG_FIELDS = [
+    'psi_mode', 'koppa_mode', 'engine_type',
+    'u_seed', 'u_denom', 'b_seed', 'b_denom', 'ticks', 'backend',
+    'max_bits', 'stop_when', 'monitor_every', 'record',
+]
+
+RESULT_FIELDS = CONFIG_FIELDS + [
+    'status', 'peak_bits', 'final_ratio', 'final_error', 'min_error', 'max_error',
+    'avg_error', 'total_emissions', 'converged', 'elapsed',
+]
+
+
+_RANGE = re.compile(r'^(-?\d+)(?:-(-?\d+))?(?::(\d+))?$')
+
+
+def parse_int_list(spec: str) -> List[int]:
+    """Parse '13', '1,2,5', '1-20' or '1-20:3' (and comma-joined mixes)."""
+    values = []
+    for part in spec.split(','):
+        match = _RANGE.match(part.strip())
+        if not match:
+            raise ValueError(f"Bad integer list '{part}'")
+        lo, hi, step = match.groups()
+        if hi is None:
+            values.append(int(lo))
+        else:
+            values.extend(range(int(lo), int(hi) + 1, int(step or 1)))
+    return values
+
+
+def parse_modes(spec: str, enum) -> List[str]:
+    """Parse 'ALL' or a comma-separated list of enum values."""
+    if spec.upper() == 'ALL':
+        return [m.value for m in enum]
+    return [enum(name.strip().upper()).value for name in spec.split(',')]
+
+
+def config_key(config: Dict) -> Tuple[str, ...]:
+    # Rows from tables written before a field existed read back as ''
+    return tuple(str(config.get(field, '')) for field in CONFIG_FIELDS)
+
+
+def iter_configs(args) -> Iterator[Dict]:
+    """Cartesian product of every swept parameter."""
+    grid = itertools.product(
+        parse_modes(args.psi_modes, PsiMode),
+        parse_modes(args.koppa_modes, KoppaMode),
+        parse_modes(args.engine_types, EngineType),
+        parse_int_list(args.u_seeds), parse_int_list(args.u_denoms),
+        parse_int_list(args.b_seeds), parse_int_list(args.b_denoms),
+    )
+    for psi, koppa, engine, u_seed, u_denom, b_seed, b_denom in grid:
+        yield {
+            'psi_mode': psi, 'koppa_mode': koppa, 'engine_type': engine,
+            'u_seed': u_seed, 'u_denom': u_denom,
+            'b_seed': b_seed, 'b_denom': b_denom,
+            'ticks': args.ticks, 'backend': args.backend,
+            # Stored in the table as written here (0 = no bit budget)
+            'max_bits': args.max_bits or 0, 'max_rss_mb': args.max_rss,
+            'stop_when': ';'.join(args.stop_when), 'monitor_every': args.monitor_every,
+            'record': args.record,
+        }
+
+
+def run_configuration(config: Dict) -> Dict:
+    """Worker: build one engine, run it and return its summary row."""
+    result = dict(config)
+    start = time.perf_counter()
+    try:
+        engine = TRTSEngine(
+            u_seed=config['u_seed'], u_denom=config['u_denom'],
+            b_seed=config['b_seed'], b_denom=config['b_denom'],
+            psi_mode=PsiMode(config['psi_mode']),
+            koppa_mode=KoppaMode(config['koppa_mode']),
+            engine_type=EngineType(config['engine_type']),
+            backend=config['backend'],
+            record=config.get('record', 'step'),
+            max_bits=config.get('max_bits') or None,
+            max_rss_mb=config.get('max_rss_mb'),
+            monitor_every=config.get('monitor_every', 'step'),
+        )
+        for spec in filter(None, (config.get('stop_when') or '').split(';')):
+            engine.add_monitor(parse_monitor(spec, stop=True))
+        engine.execute_step(config['ticks'])
+        analysis = engine.get_convergence_analysis()
+        result['status'] = engine.status
+        result['peak_bits'] = max(engine.telemetry.peak)
+        for field in RESULT_FIELDS:
+            if field in analysis:
+                result[field] = analysis[field]
+    except Exception as e:  # a diverging configuration must not stop the sweep
+        result['status'] = f"error: {type(e).__name__}"
+    result['elapsed'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def load_completed(results_path: str) -> Set[Tuple[str, ...]]:
+    """
+    Read the keys already in the result table.
+
+    A crash can leave a truncated last line; the table is rewritten with
+    only complete rows so appends continue from a clean file.
+    """
+    if not os.path.exists(results_path):
+        return set()
+
+    with open(results_path, newline='') as f:
+        rows = [row for row in csv.DictReader(f)
+                if row.get('elapsed') not in (None, '')]
+
+    tmp_path = results_path + '.tmp'
+    with open(tmp_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, results_path)
+
+    return {config_key(row) for row in rows}
+
+
+def run_sweep(args) -> int:
+    """Run every pending configuration, appending rows as they complete."""
+    completed = load_completed(args.results)
+    pending = (c for c in iter_configs(args) if config_key(c) not in completed)
+
+    new_file = not os.path.exists(args.results)
+    workers = args.workers or os.cpu_count()
+    max_in_flight = workers * 4
+    done = 0
+    with open(args.results, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS, extrasaction='ignore')
+        if new_file:
+            writer.writeheader()
+
+        def collect(in_flight):
+            nonlocal done
+            finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in finished:
+                writer.writerow(future.result())
+                done += 1
+            f.flush()
+            if args.verbose:
+                print(f"  {done} runs complete")
+            return in_flight
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Bounded submission keeps huge grids cheap to schedule
+            in_flight = set()
+            for config in pending:
+                if len(in_flight) >= max_in_flight:
+                    in_flight = collect(in_flight)
+                in_flight.add(pool.submit(run_configuration, config))
+            while in_flight:
+                in_flight = collect(in_flight)
+
+    print(f"Sweep finished: {done} new runs, {len(completed)} resumed from {args.results}")
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TRTS mode-space sweep (resumable, multi-process)')
+    parser.add_argument('--psi-modes', type=str, default='ALL',
+                       help="Comma list of Ψ modes or ALL")
+    parser.add_argument('--koppa-modes', type=str, default='ALL',
+                       help="Comma list of κ modes or ALL")
+    parser.add_argument('--engine-types', type=str, default='ALL',
+                       help="Comma list of engine types or ALL")
+    parser.add_argument('--u-seeds', type=str, default='13', help="υ numerators, e.g. 1-20 or 13,22")
+    parser.add_argument('--u-denoms', type=str, default='7', help="υ denominators")
+    parser.add_argument('--b-seeds', type=str, default='3', help="β numerators")
+    parser.add_argument('--b-denoms', type=str, default='11', help="β denominators")
+    parser.add_argument('--ticks', type=int, default=100, help='Steps per run')
+    parser.add_argument('--backend', type=str, default='sympy', help='Numeric backend per run')
+    parser.add_argument('--max-bits', type=int, default=None,
+                       help='Per-run operand bit budget; runs that exceed it stop early')
+    parser.add_argument('--max-rss', type=float, default=None, help='Per-worker RSS budget in MB')
+    parser.add_argument('--stop-when', type=str, action='append', default=[],
+                       help='End a run the first time this exact predicate holds: ratio=LOW:HIGH, '
+                            'square=TARGET:EPS or bits=B (repeatable)')
+    parser.add_argument('--monitor-every', type=str, default='step',
+                       help='When --stop-when is evaluated: microtick|step|every:N')
+    parser.add_argument('--record', type=str, default='step',
+                       help='States each run records: ' + '|'.join(RecordPolicy.CHOICES)
+                            + ' (min/max/avg error cover these)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: all cores)')
+    parser.add_argument('--results', type=str, default='trts_sweep.csv', help='Result table (resumable)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Print progress')
+    args = parser.parse_args()
+    try:
+        for spec in args.stop_when:
+            parse_monitor(spec)
+        MonitorSet(args.monitor_every)
+        RecordPolicy(args.record)
+    except ValueError as e:
+        parser.error(str(e))
+
+    run_sweep(args)
+
+
+if __name__ == "__main__":
+    main()
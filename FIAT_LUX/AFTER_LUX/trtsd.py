@@ -3,13 +3,32 @@ TRTS (Triadic Rational Time-Step) Framework - FIXED VERSION
 Fully Parameterized Implementation with No Hardcoding
 """
 
-import sympy as sp
-import csv
 import math
+import os
+import sys
 import argparse
-from typing import List, Dict, Tuple, Optional
+import time
+from fractions import Fraction
+from typing import List, Dict, Tuple, Optional, Union
 from enum import Enum
 
+from trts_backends import BACKENDS, NumericBackend, get_backend
+from trts_linear import identity, integer_matrix, jump, mat_mul
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from trts_checkpoint import read_checkpoint, write_checkpoint
+from trts_fingerprint import FingerprintLog
+from trts_lazy import lazy_import
+from trts_monitors import Monitor, MonitorSet, parse_monitor
+from trts_primes import PrimeTrigger
+from trts_recorder import (CSVStreamSink, DEFAULT_CHUNK, RecordPolicy, TraceRecorder, TraceRow,
+                           ratio_float)
+from trts_telemetry import BitLengthTelemetry, RunBudget
+from trts_tracefile import CSV_HEADERS, TRACE_EXTENSION, TraceFileWriter, csv_row, write_trace
+
+# asyncio and the telemetry server load only for runs started with --telemetry
+trts_live = lazy_import('trts_live')
+
 class PsiMode(Enum):
     RHO = "RHO"           # Ψ only on ρ-trigger
     DUAL = "DUAL"         # Ψ on ρ-trigger OR microtick 11
@@ -48,21 +67,66 @@ class TRTSEngine:
                  fib_primes: Optional[List[int]] = None,
                  emission_microticks: Optional[List[int]] = None,
                  rho_threshold: float = 0.0,
-                 convergence_target: float = math.sqrt(2)):
+                 convergence_target: float = math.sqrt(2),
+                 backend: Union[str, NumericBackend] = 'sympy',
+                 stream_output: Optional[str] = None,
+                 flush_every: int = DEFAULT_CHUNK,
+                 compression: Optional[str] = None,
+                 record: str = 'microtick',
+                 max_bits: Optional[int] = None,
+                 max_rss_mb: Optional[float] = None,
+                 checkpoint_path: Optional[str] = None,
+                 checkpoint_every: Optional[int] = None,
+                 checkpoint_seconds: Optional[float] = None,
+                 jump_ahead: bool = False,
+                 monitor_every: str = 'step',
+                 fingerprint: bool = False):
         """
         Fully parameterized TRTS initialization.
+
+        backend selects the rational arithmetic: 'sympy' (reduced),
+        'int' or 'gmpy2' (raw unreduced numerator/denominator pairs).
+        stream_output streams the CSV trace while running, flushing every
+        flush_every rows (gzip/xz by extension or compression); a .trts
+        file name streams a binary trace file instead (see trts_tracefile).
+        record is the recording policy: microtick, step, every:N,
+        emissions or none (see trts_recorder.RecordPolicy).
+        max_bits / max_rss_mb stop the run cleanly (see self.status) once
+        any operand or the process outgrows them.
+        checkpoint_path receives a binary checkpoint every checkpoint_every
+        steps and/or checkpoint_seconds seconds (and on a budget stop);
+        see TRTSEngine.resume().
+        jump_ahead advances linear mode combinations (see is_linear) by
+        powers of the compiled step matrix instead of microtick by
+        microtick; jumped-over microticks are neither recorded nor ρ-checked
+        (so a run with jumped steps reports no emission or error statistics).
+        Jumps stop short of max_bits, and monitors turn jump_ahead off.
+        monitor_every is the granularity at which monitors registered with
+        add_monitor() are evaluated: microtick, step or every:N.
+        fingerprint keeps a rolling fingerprint of (υ, β, κ) after every
+        step in self.fingerprints (see trts_fingerprint); it needs every
+        step, so it turns jump_ahead off.
         """
+        self.backend = get_backend(backend) if isinstance(backend, str) else backend
+        rational = self.backend.rational
+
         # Reset state
         self.step_count = 0
+        self.steps_completed = 0
+        self.jumped_steps = 0
         self.microtick = 0
         self.rho_triggered = False
         self.rho_prime = None
         self.imbalance_active = True
         
         # Core oscillators - fully parameterized
-        self.upsilon = sp.Rational(u_seed, u_denom)
-        self.beta = sp.Rational(b_seed, b_denom)
-        self.koppa = sp.Rational(k_seed_num, k_seed_den)
+        self.upsilon = rational(u_seed, u_denom)
+        self.beta = rational(b_seed, b_denom)
+        self.koppa = rational(k_seed_num, k_seed_den)
+        self._weight = rational(1, 100)
+        # Constant operands of the κ and propagation kernels (no per-call coercion)
+        self._half = rational(1, 2)
+        self._tenth = rational(1, 10)
         
         # Operational parameters
         self.psi_mode = psi_mode
@@ -73,37 +137,45 @@ class TRTSEngine:
         
         # Configurable sequences
         self.fib_primes = fib_primes or [2, 3, 5, 13, 89, 233, 1597, 28657, 514229]
+        self.prime_trigger = PrimeTrigger(self.fib_primes)
         self.emission_microticks = emission_microticks or [1, 4, 7, 10]
+        self.jump_ahead = jump_ahead
+        self.compile_schedule()
+        
+        # Tracking - columnar trace (emissions are the ρ-triggered rows)
+        self.stream_output = stream_output
+        self.compression = compression
+        self.record_policy = RecordPolicy(record)
+        if stream_output:
+            sink = self._open_sink(stream_output, compression)
+            self.recorder = TraceRecorder(chunk_size=flush_every, sink=sink,
+                                          ratio_target=convergence_target)
+        else:
+            self.recorder = TraceRecorder(ratio_target=convergence_target)
+        
+        # Operand growth telemetry and budgets
+        self.telemetry = BitLengthTelemetry()
+        self.budget = RunBudget(max_bits, max_rss_mb)
+        self.status = 'ready'
+        self.emissions_by_microtick = [0] * 12  # ρ-triggers by microtick (live telemetry)
         
-        # Tracking
-        self.state_history = []
-        self.emission_history = []
-        self.csv_data = []
+        # Exact predicates on the state (see add_monitor)
+        self.monitors = MonitorSet(monitor_every)
         
-        self._initialize_csv_headers()
-    
-    def _initialize_csv_headers(self):
-        """Comprehensive CSV headers for analysis."""
-        headers = [
-            'step', 'microtick', 
-            'upsilon_num', 'upsilon_den', 'upsilon_value',
-            'beta_num', 'beta_den', 'beta_value',
-            'koppa_num', 'koppa_den', 'koppa_value',
-            'ratio_value', 'target_value', 'convergence_error',
-            'rho_triggered', 'rho_prime', 'imbalance_active',
-            'psi_mode', 'koppa_mode', 'engine_type',
-            'emission_count', 'structural_phase'
-        ]
-        self.csv_data.append(headers)
+        # Rolling per-step fingerprints (cross-engine comparison)
+        self.fingerprints = FingerprintLog() if fingerprint else None
+        
+        # Periodic checkpoints
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self._last_checkpoint_time = time.monotonic()
     
     def is_prime_trigger(self, n: int) -> bool:
         """Configurable prime detection."""
-        abs_val = abs(n)
-        if abs_val <= 1:
-            return False
-        return abs_val in self.fib_primes
+        return self.prime_trigger(n)
     
-    def should_trigger_rho(self, current_val: sp.Rational) -> bool:
+    def should_trigger_rho(self, current_val) -> bool:
         """Configurable ρ-trigger logic."""
         num_prime = self.is_prime_trigger(current_val.numerator)
         den_prime = self.is_prime_trigger(current_val.denominator)
@@ -116,86 +188,174 @@ class TRTSEngine:
         
         return num_prime or den_prime
     
-    def psi_transform(self, a: sp.Rational, b: sp.Rational) -> Tuple[sp.Rational, sp.Rational]:
+    def psi_transform(self, a, b) -> Tuple:
         """Ψ-transformation with configurable variants."""
         num_a, den_a = a.as_numer_denom()
         num_b, den_b = b.as_numer_denom()
         
         if self.psi_mode == PsiMode.RHO:
             # Standard Ψ: (a/b, c/d) → (d/a, b/c)
-            return sp.Rational(den_b, num_a), sp.Rational(num_a, den_b)
+            return self.backend.rational(den_b, num_a), self.backend.rational(num_a, den_b)
         elif self.psi_mode == PsiMode.DUAL:
             # Dual transformation
-            return sp.Rational(den_a, num_b), sp.Rational(num_b, den_a)
+            return self.backend.rational(den_a, num_b), self.backend.rational(num_b, den_a)
         else:
             # Identity transformation
             return a, b
     
     def apply_koppa_operation(self):
         """Apply κ operation based on selected mode."""
-        if self.koppa_mode == KoppaMode.ACCUMULATE:
-            self.koppa += (self.upsilon + self.beta) / 2
-        elif self.koppa_mode == KoppaMode.FEED:
-            self.koppa *= (self.upsilon / self.beta)
-        elif self.koppa_mode == KoppaMode.OSCILLATE:
-            sign = -1 if self.step_count % 2 == 0 else 1
-            self.koppa = sp.Rational(sign * abs(self.koppa.numerator), abs(self.koppa.denominator))
-        elif self.koppa_mode == KoppaMode.DUMP and self.rho_triggered:
-            self.koppa = sp.Rational(1, 1)  # Reset on emission
-        # KoppaMode.NONE does nothing
+        if self._koppa_op is not None:
+            self._koppa_op()
+    
+    def _koppa_accumulate(self):
+        # Linear accumulation
+        self.koppa += (self.upsilon + self.beta) * self._half
+    
+    def _koppa_feed(self):
+        # Ratio feeding
+        self.koppa *= (self.upsilon / self.beta)
+    
+    def _koppa_oscillate(self):
+        sign = -1 if self.step_count % 2 == 0 else 1
+        self.koppa = self.backend.rational(sign * abs(self.koppa.numerator), abs(self.koppa.denominator))
+    
+    def _koppa_dump(self):
+        if self.rho_triggered:
+            self.koppa = self.backend.one()  # Reset on emission
     
     def apply_engine_propagation(self):
         """Apply engine-specific propagation logic."""
-        if self.engine_type == EngineType.ADDITIVE:
-            # Linear additive propagation
-            self.upsilon += self.koppa / 10
-            self.beta += self.koppa / 10
-        elif self.engine_type == EngineType.QUIET:
-            # Weighted fractional propagation
-            weight = sp.Rational(1, 100)
-            self.upsilon = self.upsilon * (1 + weight) + self.koppa * weight
-            self.beta = self.beta * (1 - weight) + self.koppa * weight
-        elif self.engine_type == EngineType.PHASE_LOCKED:
-            # Phase-synchronized propagation
-            phase = (self.microtick - 1) % 3
-            if phase == 0:  # E phase
-                self.upsilon += self.koppa
-            elif phase == 1:  # M phase  
-                self.beta += self.koppa
-            # R phase does nothing
-        # EngineType.PURE and EngineType.CANONICAL use default propagation
+        propagate = self._propagation[(self.microtick - 1) % 3]
+        if propagate is not None:
+            propagate()
+    
+    def _propagate_additive(self):
+        # Linear additive propagation (κ/10 is the same value for both)
+        step = self.koppa * self._tenth
+        self.upsilon += step
+        self.beta += step
+    
+    def _propagate_quiet(self):
+        # Weighted fractional propagation
+        weight = self._weight
+        self.upsilon = self.upsilon * (1 + weight) + self.koppa * weight
+        self.beta = self.beta * (1 - weight) + self.koppa * weight
+    
+    def _propagate_e_phase(self):
+        self.upsilon += self.koppa
+    
+    def _propagate_m_phase(self):
+        self.beta += self.koppa
+    
+    def _check_upsilon(self):
+        self._emission_check(self.upsilon)
+    
+    def _check_beta(self):
+        self._emission_check(self.beta)
+    
+    def _emission_check(self, current_val):
+        """ρ-trigger on current_val, followed by Ψ in RHO/DUAL modes."""
+        if self.rho_threshold > 0:
+            triggered = self.should_trigger_rho(current_val)
+        else:
+            trigger = self.prime_trigger
+            triggered = trigger(current_val.numerator) or trigger(current_val.denominator)
+        if triggered:
+            self.rho_triggered = True
+            self.rho_prime = current_val.numerator
+            self.emissions_by_microtick[self.microtick] += 1
+            if self._psi_active:
+                self.upsilon, self.beta = self.psi_transform(self.upsilon, self.beta)
+    
+    def compile_schedule(self):
+        """
+        Compile the mode configuration into an 11-slot dispatch table.
+        
+        Slot mt holds only the operations that can act on microtick mt, in
+        order: the ρ-check (emission microticks), the κ operation, the
+        propagation and the Ω ejection at mt 11. NONE modes, PURE/CANONICAL
+        propagation and the idle PHASE_LOCKED R phase leave no entry.
+        The step matrix for jump-ahead is compiled from the same table.
+        Call again after changing a mode or emission_microticks.
+        """
+        # FORCED Ψ is the identity transform, so only RHO/DUAL act
+        self._psi_active = self.psi_mode in (PsiMode.RHO, PsiMode.DUAL)
+        self._koppa_op = {
+            KoppaMode.ACCUMULATE: self._koppa_accumulate,
+            KoppaMode.FEED: self._koppa_feed,
+            KoppaMode.OSCILLATE: self._koppa_oscillate,
+            KoppaMode.DUMP: self._koppa_dump,
+        }.get(self.koppa_mode)
+        # Propagation per phase (mt - 1) % 3
+        self._propagation = {
+            EngineType.ADDITIVE: (self._propagate_additive,) * 3,
+            EngineType.QUIET: (self._propagate_quiet,) * 3,
+            EngineType.PHASE_LOCKED: (self._propagate_e_phase, self._propagate_m_phase, None),
+        }.get(self.engine_type, (None, None, None))
+        
+        schedule = [()]  # slot 0 unused; indexed by microtick
+        for mt in range(1, 12):
+            ops = []
+            if mt in self.emission_microticks:
+                ops.append(self._check_upsilon if mt in (1, 7) else self._check_beta)
+            if self._koppa_op is not None:
+                ops.append(self._koppa_op)
+            if self._propagation[(mt - 1) % 3] is not None:
+                ops.append(self._propagation[(mt - 1) % 3])
+            if mt == 11:
+                ops.append(self._eject_null_tick)
+            schedule.append(tuple(ops))
+        self._schedule = tuple(schedule)
+        self._step_matrix = self._compile_step_matrix()
+    
+    def _compile_step_matrix(self) -> Optional[Tuple[list, int]]:
+        """
+        The 11-microtick map of (υ, β, κ) as an integer matrix and denominator.
+        
+        None unless every scheduled operation is linear: κ ACCUMULATE/NONE,
+        any propagation, and ρ-checks / Ω ejection only while Ψ is inactive
+        (triggers then never feed back into υ, β or κ).
+        """
+        def fraction(value) -> Fraction:
+            return Fraction(int(value.numerator), int(value.denominator))
+        
+        half, tenth, weight = fraction(self._half), fraction(self._tenth), fraction(self._weight)
+        # Row i gives the new value of component i of (υ, β, κ)
+        linear_ops = {
+            self._koppa_accumulate: [[1, 0, 0], [0, 1, 0], [half, half, 1]],
+            self._propagate_additive: [[1, 0, tenth], [0, 1, tenth], [0, 0, 1]],
+            self._propagate_quiet: [[1 + weight, 0, weight], [0, 1 - weight, weight], [0, 0, 1]],
+            self._propagate_e_phase: [[1, 0, 1], [0, 1, 0], [0, 0, 1]],
+            self._propagate_m_phase: [[1, 0, 0], [0, 1, 1], [0, 0, 1]],
+        }
+        passive_ops = [self._eject_null_tick]
+        if not self._psi_active:
+            passive_ops += [self._check_upsilon, self._check_beta]
+        
+        step = identity(3)
+        for ops in self._schedule[1:]:
+            for op in ops:
+                if op in linear_ops:
+                    step = mat_mul(linear_ops[op], step)
+                elif op not in passive_ops:
+                    return None
+        return integer_matrix(step)
+    
+    @property
+    def is_linear(self) -> bool:
+        """Whether the current modes admit matrix jump-ahead."""
+        return self._step_matrix is not None
     
     def advance_microtick(self):
-        """Execute one microtick with full parameterization."""
+        """Execute one microtick through the compiled dispatch table."""
         self.microtick += 1
         if self.microtick > 11:
             self.microtick = 1
             self.step_count += 1
         
-        # Emission check at configurable microticks
-        if self.microtick in self.emission_microticks:
-            current_val = self.upsilon if self.microtick in [1, 7] else self.beta
-            
-            if self.should_trigger_rho(current_val):
-                self.rho_triggered = True
-                self.rho_prime = current_val.numerator
-                
-                # Apply Ψ based on mode
-                if self.psi_mode in [PsiMode.RHO, PsiMode.DUAL]:
-                    self.upsilon, self.beta = self.psi_transform(self.upsilon, self.beta)
-                elif self.psi_mode == PsiMode.FORCED:
-                    # Force Ψ every time
-                    self.upsilon, self.beta = self.psi_transform(self.upsilon, self.beta)
-        
-        # Apply κ operations
-        self.apply_koppa_operation()
-        
-        # Apply engine propagation
-        self.apply_engine_propagation()
-        
-        # Ω ejection at microtick 11
-        if self.microtick == 11:
-            self._eject_null_tick()
+        for op in self._schedule[self.microtick]:
+            op()
     
     def _eject_null_tick(self):
         """Eject Ω null tick."""
@@ -204,78 +364,456 @@ class TRTSEngine:
         self.imbalance_active = not self.imbalance_active
     
     def execute_step(self, steps: int = 1):
-        """Execute steps with state recording."""
-        for _ in range(steps):
-            for mt in range(11):
-                self.advance_microtick()
-                self._record_state()
+        """
+        Execute steps with state recording. Stops early if a budget is exceeded.
+
+        A step left unfinished (e.g. resumed after a budget stop) is
+        completed first and counts as the first of the steps.
+        """
+        if self.status.startswith('stopped'):
+            return
+        self.status = 'running'
+        microticks = steps * 11 - self.microtick % 11
+        if (self.jump_ahead and self.is_linear and self.fingerprints is None
+                and not self.monitors and microticks > 11):
+            # Finish a partial step normally, then jump whole steps
+            partial = -self.microtick % 11
+            if not self._run_microticks(partial):
+                return
+            if not self._jump_steps((microticks - partial) // 11):
+                return
+        elif not self._run_microticks(microticks):
+            return
+        self.status = 'completed'
     
-    def _record_state(self):
-        """Record current state to CSV."""
-        ratio_val = float(self.upsilon / self.beta)
-        error = abs(ratio_val - self.convergence_target)
-        phase = (self.microtick - 1) % 3
+    def add_monitor(self, monitor: Monitor) -> Monitor:
+        """
+        Register an exact predicate on (υ, β, κ) (see trts_monitors).
+
+        It is evaluated at the engine's monitor granularity; a monitor
+        with stop=True ends the run cleanly the first time it holds.
+        """
+        return self.monitors.add(monitor)
+    
+    def _run_microticks(self, count: int) -> bool:
+        """Step and record count microticks; False if a budget or monitor stopped the run."""
+        # Fused kernel: advance_microtick inlined over the compiled schedule
+        schedule = self._schedule
+        record, over_budget = self._record_state, self._over_budget
+        monitors, monitor_stop = self.monitors, self._monitor_stop
+        fingerprints = self.fingerprints
+        record_all, wants, skip = (self.record_policy.records_all,
+                                   self.record_policy.wants, self.recorder.skip)
+        for _ in range(count):
+            mt = self.microtick + 1
+            if mt > 11:
+                mt = 1
+                self.step_count += 1
+            self.microtick = mt
+            for op in schedule[mt]:
+                op()
+            if record_all or wants(self.step_count, mt, self.rho_triggered):
+                record()
+            else:
+                skip(self.step_count, self.rho_triggered)
+            if over_budget():
+                if self.checkpoint_path:
+                    self.save_checkpoint(self.checkpoint_path)
+                return False
+            if mt == 11:
+                self.steps_completed += 1
+                if fingerprints is not None:
+                    fingerprints.update(
+                        (self.upsilon.numerator, self.upsilon.denominator),
+                        (self.beta.numerator, self.beta.denominator),
+                        (self.koppa.numerator, self.koppa.denominator))
+                if self._checkpoint_due():
+                    self.save_checkpoint(self.checkpoint_path)
+            if monitors and monitors.due(self.step_count, mt) and monitor_stop():
+                return False
+        return True
+    
+    def _jump_steps(self, steps: int) -> bool:
+        """
+        Advance whole steps from a step boundary by a power of the step matrix.
+        
+        Only the final state (microtick 11) is offered to the recording
+        policy; the microticks jumped over are counted as skipped. The
+        jump stops at the last step boundary within max_bits and the
+        remaining steps run microtick by microtick, so a bit-budget stop
+        lands where it would without jumping.
+        """
+        if steps <= 0:
+            return True
+        jumped, values = self._jump_within_bits(steps)
+        if jumped and not self._commit_jump(jumped, values):
+            return False
+        if jumped < steps:
+            return self._run_microticks((steps - jumped) * 11)
+        return True
+    
+    def _jump_within_bits(self, steps: int) -> Tuple[int, list]:
+        """
+        The most steps (at most steps) that keep every operand within
+        max_bits, and the (υ, β, κ) they lead to. Bit-lengths grow with
+        the step count, so the boundary is bisected.
+        """
+        matrix, denominator = self._step_matrix
+        state = [(int(value.numerator), int(value.denominator))
+                 for value in (self.upsilon, self.beta, self.koppa)]
+        rational, max_bits = self.backend.rational, self.budget.max_bits
+        
+        def advance(count: int) -> list:
+            return [rational(num, den) for num, den in jump(matrix, denominator, state, count)]
+        
+        def within(values: list) -> bool:
+            return all(max(int(v.numerator).bit_length(), int(v.denominator).bit_length()) <= max_bits
+                       for v in values)
         
-        record = [
+        values = advance(steps)
+        if not max_bits or within(values):
+            return steps, values
+        low, high, values = 0, steps, None
+        while high - low > 1:
+            middle = (low + high) // 2
+            candidate = advance(middle)
+            if within(candidate):
+                low, values = middle, candidate
+            else:
+                high = middle
+        return low, values
+    
+    def _commit_jump(self, steps: int, values: list) -> bool:
+        """Install a jumped state and do the step-end bookkeeping; False on a stop."""
+        self.upsilon, self.beta, self.koppa = values
+        
+        # Step bookkeeping as if the microticks had run (mt 0 is before step 0)
+        self.step_count += steps if self.microtick else steps - 1
+        self.microtick = 11
+        self.steps_completed += steps
+        self.jumped_steps += steps
+        self.rho_triggered = False
+        self.rho_prime = None
+        self.imbalance_active ^= bool(steps % 2)
+        
+        self.recorder.skip_jumped(steps * 11 - 1)
+        if self.record_policy.wants(self.step_count, 11, False):
+            self._record_state()
+        else:
+            self.recorder.skip(self.step_count, False)
+        if self._over_budget():
+            if self.checkpoint_path:
+                self.save_checkpoint(self.checkpoint_path)
+            return False
+        if self._checkpoint_due():
+            self.save_checkpoint(self.checkpoint_path)
+        return True
+    
+    def _checkpoint_due(self) -> bool:
+        if not self.checkpoint_path:
+            return False
+        if self.checkpoint_every and self.steps_completed % self.checkpoint_every == 0:
+            return True
+        return bool(self.checkpoint_seconds and
+                    time.monotonic() - self._last_checkpoint_time >= self.checkpoint_seconds)
+    
+    def _over_budget(self) -> bool:
+        """Track operand bit-lengths; flag a clean stop when a budget is blown."""
+        self.telemetry.observe(
+            (self.upsilon.numerator, self.upsilon.denominator),
+            (self.beta.numerator, self.beta.denominator),
+            (self.koppa.numerator, self.koppa.denominator)
+        )
+        if not self.budget:
+            return False
+        reason = self.budget.check(self.telemetry)
+        if reason:
+            self.status = f"stopped ({reason}) at step {self.step_count} mt{self.microtick}"
+            return True
+        return False
+    
+    def _monitor_stop(self) -> bool:
+        """Evaluate the monitors; flag a clean stop when a stopping one holds."""
+        self.monitors.check(
             self.step_count, self.microtick,
-            int(self.upsilon.numerator), int(self.upsilon.denominator), float(self.upsilon),
-            int(self.beta.numerator), int(self.beta.denominator), float(self.beta),
-            int(self.koppa.numerator), int(self.koppa.denominator), float(self.koppa),
-            ratio_val, self.convergence_target, error,
-            self.rho_triggered, self.rho_prime if self.rho_prime else 0, self.imbalance_active,
-            self.psi_mode.value, self.koppa_mode.value, self.engine_type.value,
-            len(self.emission_history), phase
-        ]
+            (self.upsilon.numerator, self.upsilon.denominator),
+            (self.beta.numerator, self.beta.denominator),
+            (self.koppa.numerator, self.koppa.denominator)
+        )
+        stopper = self.monitors.stopped_by
+        if stopper:
+            self.status = f"stopped (monitor {stopper.name}) at step {self.step_count} mt{self.microtick}"
+            return True
+        return False
+    
+    def _ratio_error(self) -> Tuple[float, float]:
+        """Current υ/β and its distance from the convergence target."""
+        ratio_val = ratio_float((self.upsilon.numerator, self.upsilon.denominator),
+                                (self.beta.numerator, self.beta.denominator))
+        return ratio_val, abs(ratio_val - self.convergence_target)
+    
+    def _record_state(self):
+        """Record current state to the columnar trace (ratio/error are derived on export)."""
+        self.recorder.append(
+            self.step_count, self.microtick,
+            (self.upsilon.numerator, self.upsilon.denominator),
+            (self.beta.numerator, self.beta.denominator),
+            (self.koppa.numerator, self.koppa.denominator),
+            self.rho_triggered, self.rho_prime, self.imbalance_active
+        )
+    
+    def save_checkpoint(self, path: str):
+        """
+        Write a binary checkpoint of the full engine state.
+
+        When streaming, pending rows are flushed and the stream's byte
+        offset is saved; otherwise the in-memory trace is saved with it.
+        """
+        sink = self.recorder.sink
+        stream_offset = stream_rows = None
+        if sink is not None:
+            self.recorder.flush()
+            stream_offset, stream_rows = sink.checkpoint()
         
-        self.csv_data.append(record)
-        self.state_history.append({
-            'step': self.step_count,
+        write_checkpoint(path, {
+            'config': {
+                'psi_mode': self.psi_mode.value,
+                'koppa_mode': self.koppa_mode.value,
+                'engine_type': self.engine_type.value,
+                'backend': self.backend.name,
+                'fib_primes': self.fib_primes,
+                'emission_microticks': self.emission_microticks,
+                'rho_threshold': float(self.rho_threshold),
+                'convergence_target': float(self.convergence_target),
+                'stream_output': self.stream_output,
+                'record': self.record_policy.spec,
+                'compression': sink.compression if sink is not None else None,
+            },
+            'upsilon_num': self.upsilon.numerator, 'upsilon_den': self.upsilon.denominator,
+            'beta_num': self.beta.numerator, 'beta_den': self.beta.denominator,
+            'koppa_num': self.koppa.numerator, 'koppa_den': self.koppa.denominator,
             'microtick': self.microtick,
-            'upsilon': self.upsilon,
-            'beta': self.beta,
-            'koppa': self.koppa,
-            'ratio': ratio_val,
-            'error': error
+            'step_count': self.step_count,
+            'steps_completed': self.steps_completed,
+            'jumped_steps': self.jumped_steps,
+            'rho_triggered': self.rho_triggered,
+            'rho_prime': self.rho_prime,
+            'imbalance_active': self.imbalance_active,
+            'stream_offset': stream_offset,
+            'stream_rows': stream_rows,
+            'recorder': self.recorder.get_state(),
+            'telemetry': self.telemetry.get_state(),
+            'emissions_by_microtick': self.emissions_by_microtick,
+            'fingerprints': (self.fingerprints.to_bytes()
+                             if self.fingerprints is not None else None),
         })
+        self._last_checkpoint_time = time.monotonic()
+    
+    @classmethod
+    def resume(cls, path: str, flush_every: int = DEFAULT_CHUNK, **kwargs) -> 'TRTSEngine':
+        """
+        Rebuild an engine from a checkpoint.
+
+        Modes, backend and trigger configuration come from the checkpoint;
+        kwargs may set the run-time options (budgets, checkpointing). A
+        streamed trace is truncated to the checkpointed offset and
+        appended to, so the finished trace matches an uninterrupted run.
+        """
+        state = read_checkpoint(path)
+        config = state['config']
+        engine = cls(
+            psi_mode=PsiMode(config['psi_mode']),
+            koppa_mode=KoppaMode(config['koppa_mode']),
+            engine_type=EngineType(config['engine_type']),
+            fib_primes=config['fib_primes'],
+            emission_microticks=config['emission_microticks'],
+            rho_threshold=config['rho_threshold'],
+            convergence_target=config['convergence_target'],
+            backend=config['backend'],
+            record=config['record'],
+            **kwargs
+        )
         
-        if self.rho_triggered:
-            self.emission_history.append({
-                'step': self.step_count,
-                'microtick': self.microtick,
-                'prime': self.rho_prime,
-                'upsilon': self.upsilon,
-                'beta': self.beta
-            })
-    
-    def export_csv(self, filename: str):
-        """Export data to CSV."""
-        with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerows(self.csv_data)
+        rational = engine.backend.rational
+        engine.upsilon = rational(state['upsilon_num'], state['upsilon_den'])
+        engine.beta = rational(state['beta_num'], state['beta_den'])
+        engine.koppa = rational(state['koppa_num'], state['koppa_den'])
+        engine.microtick = state['microtick']
+        engine.step_count = state['step_count']
+        engine.steps_completed = state['steps_completed']
+        engine.jumped_steps = state.get('jumped_steps', 0)
+        engine.rho_triggered = bool(state['rho_triggered'])
+        engine.rho_prime = state['rho_prime']
+        engine.imbalance_active = bool(state['imbalance_active'])
+        engine.telemetry.set_state(state['telemetry'])
+        if state.get('emissions_by_microtick') is not None:
+            engine.emissions_by_microtick = list(state['emissions_by_microtick'])
+        if state.get('fingerprints') is not None:
+            engine.fingerprints = FingerprintLog.from_bytes(state['fingerprints'])
+        
+        if config['stream_output']:
+            engine.stream_output = config['stream_output']
+            sink = engine._open_sink(config['stream_output'], config['compression'],
+                                     resume_at=(state['stream_offset'], state['stream_rows']))
+            engine.recorder = TraceRecorder(chunk_size=flush_every, sink=sink,
+                                            ratio_target=engine.convergence_target)
+        engine.recorder.set_state(state['recorder'])
+        return engine
+    
+    def _csv_row(self, row: TraceRow) -> list:
+        """Expand a recorded state into the CSV layout."""
+        return csv_row(row, self.convergence_target,
+                       (self.psi_mode.value, self.koppa_mode.value, self.engine_type.value))
+    
+    def _trace_config(self) -> Dict:
+        """Run configuration stored in a binary trace file's header."""
+        return {
+            'psi_mode': self.psi_mode.value,
+            'koppa_mode': self.koppa_mode.value,
+            'engine_type': self.engine_type.value,
+            'backend': self.backend.name,
+            'fib_primes': self.fib_primes,
+            'emission_microticks': self.emission_microticks,
+            'rho_threshold': float(self.rho_threshold),
+            'convergence_target': float(self.convergence_target),
+            'record': self.record_policy.spec,
+        }
+    
+    def _open_sink(self, filename: str, compression: Optional[str] = None,
+                   resume_at: Optional[Tuple[int, int]] = None):
+        """Streaming sink for filename: a binary trace for .trts, else CSV."""
+        if filename.endswith(TRACE_EXTENSION):
+            return TraceFileWriter(filename, self._trace_config(), resume_at=resume_at)
+        return CSVStreamSink(filename, CSV_HEADERS, self._csv_row, compression,
+                             resume_at=resume_at)
+    
+    def export_csv(self, filename: Optional[str] = None):
+        """
+        Export data to CSV, or to a binary trace file for a .trts name
+        (or finish the stream when streaming).
+        """
+        sink = self.recorder.sink
+        if sink is not None:
+            self.recorder.close()
+            print(f"Data streamed to {sink.filename} ({sink.rows_written} rows)")
+            return
+        if filename.endswith(TRACE_EXTENSION):
+            write_trace(filename, self.recorder, self._trace_config())
+        else:
+            self.recorder.write_csv(filename, CSV_HEADERS, self._csv_row)
         print(f"Data exported to {filename}")
     
     def get_convergence_analysis(self) -> Dict:
-        """Comprehensive convergence analysis."""
-        if len(self.state_history) < 2:
+        """
+        Comprehensive convergence analysis.
+
+        The final ratio/error come from the live state and the emission
+        totals cover every microtick run; min/max/avg error cover the rows
+        kept by the recording policy (just the final state if none were).
+        After jump-ahead the ρ-checks and most rows of the jumped steps
+        never happened, so the emission and min/max/avg error entries are
+        None (jumped_steps says how many steps were skipped).
+        """
+        summary = self.recorder.summary()
+        if summary['observed'] < 2:
             return {}
         
-        ratios = [state['ratio'] for state in self.state_history]
-        errors = [state['error'] for state in self.state_history]
+        final_ratio, final_error = self._ratio_error()
+        if summary['rows']:
+            min_error, max_error = summary['min_error'], summary['max_error']
+            avg_error = summary['sum_error'] / summary['rows']
+        else:
+            min_error = max_error = avg_error = final_error
+        total_emissions, emission_steps = self.recorder.emission_count, summary['emission_steps']
+        if self.jumped_steps:
+            min_error = max_error = avg_error = total_emissions = emission_steps = None
         
         return {
-            'final_ratio': ratios[-1],
+            'final_ratio': final_ratio,
             'target': self.convergence_target,
-            'final_error': errors[-1],
-            'error_percentage': (errors[-1] / self.convergence_target) * 100,
-            'min_error': min(errors),
-            'max_error': max(errors),
-            'avg_error': sum(errors) / len(errors),
-            'total_emissions': len(self.emission_history),
-            'emission_steps': [e['step'] for e in self.emission_history],
-            'converged': errors[-1] < 0.001
+            'final_error': final_error,
+            'error_percentage': (final_error / self.convergence_target) * 100,
+            'min_error': min_error,
+            'max_error': max_error,
+            'avg_error': avg_error,
+            'total_emissions': total_emissions,
+            'emission_steps': emission_steps,
+            'jumped_steps': self.jumped_steps,
+            'converged': final_error < 0.001
         }
 
 
+def _same_value(a, b) -> bool:
+    """Exact rational equality by cross-multiplication (backend independent)."""
+    return int(a.numerator) * int(b.denominator) == int(b.numerator) * int(a.denominator)
+
+
+PARITY_MAX_BITS = 1 << 16
+PARITY_MIN_MICROTICKS = 110  # ten steps compared before a PASS means anything
+
+
+def check_backend_parity(steps: int, candidate: str = 'int',
+                         max_bits: Optional[int] = PARITY_MAX_BITS,
+                         min_microticks: int = PARITY_MIN_MICROTICKS, **engine_kwargs) -> Dict:
+    """
+    Run the sympy reference and a candidate backend in lockstep.
+
+    Unreduced numerators/denominators can fire different ρ-triggers than
+    their reduced forms; the comparison ends at the first microtick
+    where the trigger decisions differ. It also ends once a candidate
+    operand exceeds max_bits: under multiplicative κ modes (FEED) unreduced pairs grow
+    about 3.4x in bits per microtick, and would take minutes per
+    microtick by the end of the first step (see trts_backends).
+    
+    verdict is PASS only when every requested microtick (and at least
+    min_microticks) matched; FAIL on a value mismatch or a trigger
+    divergence (the candidate would emit differently); INCONCLUSIVE
+    when the bit limit or a short run ended the comparison first.
+    """
+    if get_backend(candidate).name == 'sympy':
+        raise ValueError("Parity compares a candidate backend against sympy; choose int or gmpy2")
+    reference = TRTSEngine(backend='sympy', **engine_kwargs)
+    engine = TRTSEngine(backend=candidate, **engine_kwargs)
+    
+    result = {
+        'backend': engine.backend.name,
+        'total_microticks': steps * 11,
+        'matched_microticks': 0,
+        'trigger_divergence': None,
+        'value_mismatch': None,
+        'bit_limit': None,
+    }
+    
+    for _ in range(steps * 11):
+        reference.advance_microtick()
+        engine.advance_microtick()
+        position = (reference.step_count, reference.microtick)
+        
+        if reference.rho_triggered != engine.rho_triggered:
+            result['trigger_divergence'] = position
+            break
+        if not (_same_value(reference.upsilon, engine.upsilon) and
+                _same_value(reference.beta, engine.beta) and
+                _same_value(reference.koppa, engine.koppa)):
+            result['value_mismatch'] = position
+            break
+        result['matched_microticks'] += 1
+        if max_bits and max(max(abs(x.numerator).bit_length(), x.denominator.bit_length())
+                            for x in (engine.upsilon, engine.beta, engine.koppa)) > max_bits:
+            result['bit_limit'] = position
+            break
+    
+    if result['value_mismatch'] or result['trigger_divergence']:
+        result['verdict'] = 'FAIL'
+    elif (result['bit_limit'] or result['matched_microticks'] < result['total_microticks']
+          or result['matched_microticks'] < min_microticks):
+        result['verdict'] = 'INCONCLUSIVE'
+    else:
+        result['verdict'] = 'PASS'
+    result['passed'] = result['verdict'] == 'PASS'
+    return result
+
+
 def create_engine_from_args(args) -> TRTSEngine:
     """Create TRTS engine from command line arguments."""
     return TRTSEngine(
@@ -291,10 +829,31 @@ def create_engine_from_args(args) -> TRTSEngine:
         fib_primes=args.fib_primes,
         emission_microticks=args.emission_microticks,
         rho_threshold=args.rho_threshold,
-        convergence_target=args.convergence_target
+        convergence_target=args.convergence_target,
+        backend=args.backend,
+        stream_output=args.stream_output,
+        flush_every=args.flush_every,
+        compression=args.compress,
+        record=args.record,
+        max_bits=args.max_bits,
+        max_rss_mb=args.max_rss,
+        checkpoint_path=args.checkpoint,
+        checkpoint_every=args.checkpoint_every,
+        checkpoint_seconds=args.checkpoint_seconds,
+        jump_ahead=args.jump,
+        monitor_every=args.monitor_every,
+        fingerprint=bool(args.fingerprints)
     )
 
 
+def add_monitors_from_args(engine: TRTSEngine, args):
+    """Register the --monitor (record only) and --stop-when (stopping) specs."""
+    for spec in args.monitor:
+        engine.add_monitor(parse_monitor(spec))
+    for spec in args.stop_when:
+        engine.add_monitor(parse_monitor(spec, stop=True))
+
+
 def main():
     """Main function with full command-line interface."""
     parser = argparse.ArgumentParser(description='TRTS Framework - Fully Parameterized')
@@ -326,23 +885,143 @@ def main():
                        help='Threshold for ρ-trigger (0 = prime only)')
     parser.add_argument('--convergence_target', type=float, default=math.sqrt(2),
                        help='Target value for convergence analysis')
+    parser.add_argument('--backend', type=str, default=None,
+                       choices=list(BACKENDS),
+                       help='Rational arithmetic backend (int/gmpy2 = unreduced pairs; '
+                            'default sympy, or int with --check-parity)')
+    parser.add_argument('--check-parity', action='store_true',
+                       help='Compare the selected backend against sympy and exit '
+                            '(exit 0 PASS, 1 FAIL, 2 INCONCLUSIVE)')
+    parser.add_argument('--jump', action='store_true',
+                       help='Advance linear mode combinations by step-matrix powers '
+                            '(only the final state is recorded; no emission or error statistics)')
     
     # Execution parameters
     parser.add_argument('--ticks', type=int, default=100, help='Number of ticks to run')
     parser.add_argument('--output', type=str, default='trts_output.csv', 
-                       help='Output CSV filename')
+                       help='Output CSV filename (.trts: binary trace file)')
+    parser.add_argument('--stream-output', type=str, default=None,
+                       help='Stream the CSV trace to this file while running (constant memory; '
+                            '.trts: binary trace file)')
+    parser.add_argument('--flush-every', type=int, default=DEFAULT_CHUNK,
+                       help='Rows per streamed batch')
+    parser.add_argument('--compress', type=str, default=None, choices=['gzip', 'xz'],
+                       help='Compress the streamed trace (default: by .gz/.xz extension)')
+    parser.add_argument('--record', type=str, default='microtick',
+                       help='Recording policy: ' + '|'.join(RecordPolicy.CHOICES))
+    parser.add_argument('--max-bits', type=int, default=None,
+                       help='Stop cleanly once any operand exceeds this many bits '
+                            '(also bounds --check-parity, default 65536 there)')
+    parser.add_argument('--max-rss', type=float, default=None,
+                       help='Stop cleanly once process RSS exceeds this many MB')
+    parser.add_argument('--checkpoint', type=str, default=None,
+                       help='Binary checkpoint file (written periodically and on a budget stop)')
+    parser.add_argument('--checkpoint-every', type=int, default=None,
+                       help='Checkpoint every N steps')
+    parser.add_argument('--checkpoint-seconds', type=float, default=None,
+                       help='Checkpoint every T seconds')
+    parser.add_argument('--resume', type=str, default=None,
+                       help='Continue from this checkpoint up to --ticks total steps '
+                            '(modes, seeds and stream file come from the checkpoint)')
+    parser.add_argument('--monitor', type=str, action='append', default=[],
+                       help='Count hits of an exact predicate: ratio=LOW:HIGH, '
+                            'square=TARGET:EPS or bits=B (repeatable)')
+    parser.add_argument('--stop-when', type=str, action='append', default=[],
+                       help='Stop cleanly the first time this predicate holds (same forms)')
+    parser.add_argument('--monitor-every', type=str, default='step',
+                       help='Monitor granularity: ' + '|'.join(MonitorSet.GRANULARITIES))
+    parser.add_argument('--fingerprints', type=str, default=None,
+                       help='Write the rolling per-step state fingerprints to this file '
+                            '(compare runs with trts_bisect.py)')
+    parser.add_argument('--telemetry', type=str, default=None,
+                       help='Serve live JSON status on PORT, HOST:PORT or a socket path '
+                            '(watch with trts_live.py)')
+    parser.add_argument('--telemetry-interval', type=float, default=1.0,
+                       help='Seconds between telemetry samples')
     
     args = parser.parse_args()
+    try:
+        RecordPolicy(args.record)
+        MonitorSet(args.monitor_every)
+        for spec in args.monitor + args.stop_when:
+            parse_monitor(spec)
+        if args.check_parity and args.backend == 'sympy':
+            raise ValueError("--check-parity compares against sympy; choose --backend int or gmpy2")
+    except ValueError as e:
+        parser.error(str(e))
+    if (args.checkpoint_every or args.checkpoint_seconds) and not args.checkpoint:
+        args.checkpoint = args.resume or 'trts_checkpoint.bin'
+    args.backend = args.backend or ('int' if args.check_parity else 'sympy')
+    
+    if args.check_parity:
+        parity = check_backend_parity(
+            args.ticks, args.backend,
+            u_seed=args.u_seed, u_denom=args.u_denom,
+            b_seed=args.b_seed, b_denom=args.b_denom,
+            k_seed_num=args.k_seed_num, k_seed_den=args.k_seed_den,
+            psi_mode=PsiMode(args.psi_mode),
+            koppa_mode=KoppaMode(args.koppa_mode),
+            engine_type=EngineType(args.engine_type),
+            fib_primes=args.fib_primes,
+            emission_microticks=args.emission_microticks,
+            rho_threshold=args.rho_threshold,
+            max_bits=args.max_bits or PARITY_MAX_BITS)
+        print(f"=== BACKEND PARITY: sympy vs {parity['backend']} ===")
+        print(f"Matched microticks: {parity['matched_microticks']}/{parity['total_microticks']}")
+        if parity['trigger_divergence']:
+            print(f"TRIGGER DIVERGENCE at step/mt {parity['trigger_divergence']} "
+                  f"(reduction-dependent ρ-checks; the runs differ from here)")
+        if parity['value_mismatch']:
+            print(f"VALUE MISMATCH at step/mt {parity['value_mismatch']}")
+        if parity['bit_limit']:
+            print(f"Stopped at step/mt {parity['bit_limit']}: unreduced operands passed "
+                  f"{args.max_bits or PARITY_MAX_BITS} bits (raise with --max-bits)")
+        if parity['verdict'] == 'INCONCLUSIVE' and not parity['bit_limit']:
+            print(f"Only {parity['matched_microticks']} microticks compared "
+                  f"(PASS needs {PARITY_MIN_MICROTICKS}; raise --ticks)")
+        print(f"Parity: {parity['verdict']}")
+        return {'PASS': 0, 'FAIL': 1}.get(parity['verdict'], 2)
+    
+    if args.resume:
+        engine = TRTSEngine.resume(
+            args.resume, flush_every=args.flush_every,
+            max_bits=args.max_bits, max_rss_mb=args.max_rss,
+            checkpoint_path=args.checkpoint,
+            checkpoint_every=args.checkpoint_every,
+            checkpoint_seconds=args.checkpoint_seconds,
+            jump_ahead=args.jump,
+            monitor_every=args.monitor_every,
+            fingerprint=bool(args.fingerprints))
+    else:
+        engine = create_engine_from_args(args)
+    add_monitors_from_args(engine, args)
     
     print("=== TRTS FRAMEWORK - FULLY PARAMETERIZED ===")
-    print(f"Seeds: υ={args.u_seed}/{args.u_denom}, β={args.b_seed}/{args.b_denom}")
-    print(f"Modes: Ψ={args.psi_mode}, κ={args.koppa_mode}, Engine={args.engine_type}")
-    print(f"Target: {args.convergence_target}, Ticks: {args.ticks}")
+    if args.resume:
+        print(f"Resumed from {args.resume} after {engine.steps_completed} steps")
+    else:
+        print(f"Seeds: υ={args.u_seed}/{args.u_denom}, β={args.b_seed}/{args.b_denom}")
+    print(f"Modes: Ψ={engine.psi_mode.value}, κ={engine.koppa_mode.value}, Engine={engine.engine_type.value}")
+    print(f"Backend: {engine.backend.name}")
+    if args.jump:
+        if not engine.is_linear:
+            jump_mode = 'off (nonlinear modes)'
+        elif engine.monitors or engine.fingerprints is not None:
+            jump_mode = 'off (monitors/fingerprints need every step)'
+        else:
+            jump_mode = 'matrix powers'
+        print(f"Jump-ahead: {jump_mode}")
+    print(f"Target: {engine.convergence_target}, Ticks: {args.ticks}")
     print()
     
-    # Create and run engine
-    engine = create_engine_from_args(args)
-    engine.execute_step(args.ticks)
+    # Run the remaining steps
+    telemetry = (trts_live.serve_engine(engine, args.telemetry, args.telemetry_interval)
+                 if args.telemetry else None)
+    try:
+        engine.execute_step(args.ticks - engine.steps_completed)
+    finally:
+        if telemetry is not None:
+            telemetry.stop(engine.status)
     
     # Analyze results
     analysis = engine.get_convergence_analysis()
@@ -351,14 +1030,27 @@ def main():
     print(f"Final ratio: {analysis['final_ratio']:.6f}")
     print(f"Target: {analysis['target']:.6f}")
     print(f"Error: {analysis['final_error']:.8f} ({analysis['error_percentage']:.4f}%)")
-    print(f"Emissions: {analysis['total_emissions']} at steps {analysis['emission_steps']}")
+    if analysis['jumped_steps']:
+        print(f"Emissions: n/a ({analysis['jumped_steps']} steps jumped without ρ-checks; "
+              f"run without --jump for emissions and error statistics)")
+    else:
+        print(f"Emissions: {analysis['total_emissions']} at steps {analysis['emission_steps']}")
     print(f"Converged: {analysis['converged']}")
+    print(f"Status: {engine.status}")
+    print(engine.telemetry.format_summary())
+    if engine.monitors:
+        print(engine.monitors.format_summary())
+    if engine.fingerprints is not None and args.fingerprints:
+        engine.fingerprints.save(args.fingerprints)
+        print(f"Fingerprint after step {len(engine.fingerprints)}: "
+              f"{engine.fingerprints.value:016x} (log: {args.fingerprints})")
     
     # Export data
     engine.export_csv(args.output)
     
-    print(f"\nData exported to {args.output}")
+    if not engine.stream_output:
+        print(f"\nData exported to {args.output}")
 
 
 if __name__ == "__main__":
-    main()
+    exit(main())
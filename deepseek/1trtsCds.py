@@ -7,15 +7,27 @@ import sympy as sp
 import csv
 import math
 import argparse
+import os
+import sys
 from fractions import Fraction
 from typing import List, Dict, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_fingerprint import FingerprintLog
+from trts_lazy import lazy_import
+from trts_primes import PrimeTrigger
+from trts_recorder import RecordPolicy
+
+# asyncio and the telemetry server load only for runs started with --telemetry
+trts_live = lazy_import('trts_live')
+
 class TRTSEngine:
     """Pure Rational TRTS Propagation Engine."""
     
     def __init__(self, u_seed: int = 13, b_seed: int = 3, 
                  psi_mode: str = "RHO", koppa_mode: str = "ACCUMULATE", 
-                 engine_type: str = "ADDITIVE"):
+                 engine_type: str = "ADDITIVE", record: str = "microtick",
+                 fingerprint: bool = False):
         self.step_count = 0
         self.microtick = 0
         self.rho_triggered = False
@@ -31,11 +43,15 @@ class TRTSEngine:
         self.koppa_mode = koppa_mode.upper()
         self.engine_type = engine_type.upper()
         
+        self.record_policy = RecordPolicy(record)
         self.state_history = []
         self.emission_history = []
+        self.emissions_by_microtick = [0] * 12
         self.csv_data = []
+        self.fingerprints = FingerprintLog() if fingerprint else None
         
         self.fib_primes = [2, 3, 5, 13, 89, 233, 1597, 28657, 514229]
+        self.prime_trigger = PrimeTrigger(self.fib_primes)
         self._initialize_csv_headers()
     
     def _initialize_csv_headers(self):
@@ -47,10 +63,7 @@ class TRTSEngine:
         self.csv_data.append(headers)
     
     def is_prime_trigger(self, n: int) -> bool:
-        abs_val = abs(n)
-        if abs_val <= 1:
-            return False
-        return abs_val in self.fib_primes
+        return self.prime_trigger(n)
     
     def psi_transform(self, a: sp.Rational, b: sp.Rational) -> Tuple[sp.Rational, sp.Rational]:
         num_a, den_a = a.as_numer_denom()
@@ -83,6 +96,7 @@ class TRTSEngine:
             if num_prime or den_prime:
                 self.rho_triggered = True
                 self.rho_prime = current_val.numerator if num_prime else current_val.denominator
+                self.emissions_by_microtick[self.microtick] += 1
                 
                 # Apply Ψ-transformation based on mode
                 if self.psi_mode in ["RHO", "DUAL"]:
@@ -109,10 +123,17 @@ class TRTSEngine:
         self.imbalance_active = not self.imbalance_active
     
     def execute_step(self, steps: int = 1, verbose: bool = False):
+        record_all, wants = self.record_policy.records_all, self.record_policy.wants
         for s in range(steps):
             for mt in range(11):
                 self.advance_microtick()
-                self._record_state()
+                if record_all or wants(self.step_count, self.microtick, self.rho_triggered):
+                    self._record_state()
+            if self.fingerprints is not None:
+                self.fingerprints.update(
+                    (self.upsilon.numerator, self.upsilon.denominator),
+                    (self.beta.numerator, self.beta.denominator),
+                    (self.koppa.numerator, self.koppa.denominator))
             
             if verbose and (s == 0 or (s + 1) % 10 == 0 or s == steps - 1):
                 ratio = float(self.upsilon / self.beta)
@@ -149,12 +170,13 @@ class TRTSEngine:
         return float(self.upsilon / self.beta)
     
     def print_summary(self):
-        if not self.state_history:
+        if self.microtick == 0:
             print("No propagation data available")
             return
         
-        final_ratio = self.state_history[-1]['ratio']
-        final_error = self.state_history[-1]['error']
+        # Live state: the last microtick may not be recorded under every policy
+        final_ratio = self.get_final_ratio()
+        final_error = abs(final_ratio - math.sqrt(2))
         
         print(f"\n{'='*60}")
         print(f"TRTS PROPAGATION SUMMARY")
@@ -225,8 +247,19 @@ Examples:
                        help='Print progress during propagation')
     parser.add_argument('--no-csv', action='store_true',
                        help='Skip CSV export')
+    parser.add_argument('--record', type=str, default='microtick',
+                       help='Recording policy: ' + '|'.join(RecordPolicy.CHOICES))
+    parser.add_argument('--fingerprints', type=str, default=None,
+                       help='Write the rolling per-step state fingerprints to this file')
+    parser.add_argument('--telemetry', type=str, default=None,
+                       help='Serve live JSON status on PORT, HOST:PORT or a socket path '
+                            '(watch with trts_live.py)')
     
     args = parser.parse_args()
+    try:
+        RecordPolicy(args.record)
+    except ValueError as e:
+        parser.error(str(e))
     
     print(f"{'='*60}")
     print(f"TRTS PURE RATIONAL PROPAGATION ENGINE")
@@ -243,10 +276,13 @@ Examples:
         b_seed=args.beta,
         psi_mode=args.psi,
         koppa_mode=args.koppa,
-        engine_type=args.engine
+        engine_type=args.engine,
+        record=args.record,
+        fingerprint=bool(args.fingerprints)
     )
     
     # Execute propagation
+    telemetry = trts_live.serve_engine(engine, args.telemetry) if args.telemetry else None
     try:
         engine.execute_step(steps=args.ticks, verbose=args.verbose)
     except KeyboardInterrupt:
@@ -254,9 +290,16 @@ Examples:
     except Exception as e:
         print(f"\n❌ Error during propagation: {e}")
         return 1
+    finally:
+        if telemetry is not None:
+            telemetry.stop()
     
     # Print summary
     engine.print_summary()
+    if engine.fingerprints is not None:
+        engine.fingerprints.save(args.fingerprints)
+        print(f"Fingerprint after step {len(engine.fingerprints)}: "
+              f"{engine.fingerprints.value:016x} (log: {args.fingerprints})")
     
     # Export CSV
     if not args.no_csv:
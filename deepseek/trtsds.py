@@ -15,8 +15,25 @@ Key Features:
 import sympy as sp
 import csv
 import math
+import os
+import sys
 from fractions import Fraction
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_eventbus import Emission, EventBus, NullTick, PsiTransform
+from trts_primes import PrimeTrigger
+from trts_recorder import TraceRecorder, TraceRow, fraction_float
+
+CSV_HEADERS = [
+    'step', 'microtick', 'upsilon_num', 'upsilon_den', 'beta_num', 'beta_den',
+    'koppa_num', 'koppa_den', 'rho_triggered', 'rho_prime', 'imbalance_active',
+    'upsilon_beta_ratio', 'convergence_error', 'phase_limit', 'structural_deviation',
+    'emission_count', 'psi_transformed', 'microtick_phase'
+]
+
+SQRT2 = math.sqrt(2)
+PHASE_LIMITS = [1 + SQRT2, SQRT2, 1 / SQRT2]  # L2, L3, L1
 
 class TRTSEngine:
     """
@@ -27,7 +44,7 @@ class TRTSEngine:
     
     def __init__(self, u_seed: int = 13, b_seed: int = 3, 
                  psi_mode: str = "RHO", koppa_mode: str = "ACCUMULATE", 
-                 engine_type: str = "ADDITIVE"):
+                 engine_type: str = "ADDITIVE", events: Optional[EventBus] = None):
         """
         Initialize TRTS engine with specified parameters.
         
@@ -37,6 +54,7 @@ class TRTSEngine:
             psi_mode: Ψ transformation behavior ("RHO", "DUAL", "FORCED")
             koppa_mode: κ imbalance handling ("ACCUMULATE", "FEED", "OSCILLATE")
             engine_type: Propagation method ("ADDITIVE", "QUIET", "PURE")
+            events: Bus for emission / Ψ / Ω events (default: no sinks, silent)
         """
         self.step_count = 0
         self.microtick = 0
@@ -54,26 +72,14 @@ class TRTSEngine:
         self.koppa_mode = koppa_mode
         self.engine_type = engine_type
         
-        # Track state history for analysis
-        self.state_history = []
-        self.emission_history = []
-        self.csv_data = []
+        # Columnar trace for analysis (emissions are the ρ-triggered rows)
+        self.recorder = TraceRecorder(ratio_target=SQRT2)
         
         # Fibonacci primes for ρ-trigger detection
         self.fib_primes = [2, 3, 5, 13, 89, 233, 1597, 28657, 514229]
+        self.prime_trigger = PrimeTrigger(self.fib_primes)
         
-        # Initialize CSV headers
-        self._initialize_csv_headers()
-    
-    def _initialize_csv_headers(self):
-        """Initialize CSV headers for comprehensive data collection."""
-        headers = [
-            'step', 'microtick', 'upsilon_num', 'upsilon_den', 'beta_num', 'beta_den',
-            'koppa_num', 'koppa_den', 'rho_triggered', 'rho_prime', 'imbalance_active',
-            'upsilon_beta_ratio', 'convergence_error', 'phase_limit', 'structural_deviation',
-            'emission_count', 'psi_transformed', 'microtick_phase'
-        ]
-        self.csv_data.append(headers)
+        self.events = events if events is not None else EventBus()
     
     def is_prime_trigger(self, n: int) -> bool:
         """
@@ -86,10 +92,7 @@ class TRTSEngine:
             bool: True if absolute value of n is a Fibonacci prime
         """
         # Use absolute value ONLY for prime check
-        abs_val = abs(n)
-        if abs_val <= 1:
-            return False
-        return abs_val in self.fib_primes
+        return self.prime_trigger(n)
     
     def psi_transform(self, a: sp.Rational, b: sp.Rational) -> Tuple[sp.Rational, sp.Rational]:
         """
@@ -131,10 +134,15 @@ class TRTSEngine:
             if num_prime or den_prime:
                 self.rho_triggered = True
                 self.rho_prime = current_val.numerator if num_prime else current_val.denominator
+                if self.events:
+                    self.events.publish(Emission(self.step_count, self.microtick, self.rho_prime))
                 
                 # Apply Ψ-transformation based on mode
                 if self.psi_mode in ["RHO", "DUAL"]:
                     self.upsilon, self.beta = self.psi_transform(self.upsilon, self.beta)
+                    if self.events:
+                        self.events.publish(PsiTransform(self.step_count, self.microtick,
+                                                         self.upsilon, self.beta))
         
         # κ-imbalance handling based on mode
         self._handle_koppa_imbalance()
@@ -143,6 +151,8 @@ class TRTSEngine:
         if self.microtick == 11 and self.rho_triggered:
             # Time emerges as causal expression
             self._eject_null_tick()
+            if self.events:
+                self.events.publish(NullTick(self.step_count))
     
     def _handle_koppa_imbalance(self):
         """Handle κ-imbalance accumulation based on operational mode."""
@@ -179,49 +189,30 @@ class TRTSEngine:
                 self._record_state()
     
     def _record_state(self):
-        """Record current state to history and CSV data."""
-        # Calculate convergence metrics
-        ratio_float = float(self.upsilon / self.beta)
-        sqrt2 = math.sqrt(2)
-        convergence_error = abs(ratio_float - sqrt2)
-        
-        # Determine phase limit based on microtick position
-        phase_index = (self.microtick - 1) % 3
-        phase_limits = [1 + sqrt2, sqrt2, 1/sqrt2]  # L2, L3, L1
-        phase_limit = phase_limits[phase_index]
-        structural_deviation = abs(ratio_float - phase_limit)
-        
-        # Compile state record
-        record = [
+        """Record current state to the columnar trace (ratio/error are derived on export)."""
+        self.recorder.append(
             self.step_count, self.microtick,
-            int(self.upsilon.numerator), int(self.upsilon.denominator),
-            int(self.beta.numerator), int(self.beta.denominator),
-            int(self.koppa.numerator), int(self.koppa.denominator),
-            self.rho_triggered, self.rho_prime if self.rho_prime else 0,
-            self.imbalance_active,
-            ratio_float, convergence_error, phase_limit, structural_deviation,
-            len(self.emission_history), self.rho_triggered, self.microtick
-        ]
-        
-        self.csv_data.append(record)
-        self.state_history.append({
-            'step': self.step_count,
-            'microtick': self.microtick,
-            'upsilon': self.upsilon,
-            'beta': self.beta,
-            'koppa': self.koppa,
-            'ratio': ratio_float,
-            'error': convergence_error
-        })
+            (self.upsilon.numerator, self.upsilon.denominator),
+            (self.beta.numerator, self.beta.denominator),
+            (self.koppa.numerator, self.koppa.denominator),
+            self.rho_triggered, self.rho_prime, self.imbalance_active
+        )
+    
+    def _csv_row(self, row: TraceRow) -> list:
+        """
+        Expand a recorded state into the CSV layout.
         
-        if self.rho_triggered:
-            self.emission_history.append({
-                'step': self.step_count,
-                'microtick': self.microtick,
-                'prime': self.rho_prime,
-                'upsilon': self.upsilon,
-                'beta': self.beta
-            })
+        Phase limit is selected by microtick position (L2, L3, L1).
+        """
+        phase_limit = PHASE_LIMITS[(row.microtick - 1) % 3]
+        structural_deviation = abs(row.ratio - phase_limit)
+        return [
+            row.step, row.microtick,
+            *row.upsilon, *row.beta, *row.koppa,
+            row.rho_triggered, row.rho_prime, row.imbalance_active,
+            row.ratio, row.error, phase_limit, structural_deviation,
+            row.emission_count, row.rho_triggered, row.microtick
+        ]
     
     def export_csv(self, filename: str = "trts_propagation.csv"):
         """
@@ -230,9 +221,7 @@ class TRTSEngine:
         Args:
             filename: Output CSV filename
         """
-        with open(filename, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerows(self.csv_data)
+        self.recorder.write_csv(filename, CSV_HEADERS, self._csv_row)
         print(f"TRTS data exported to {filename}")
     
     def analyze_convergence(self) -> Dict:
@@ -242,12 +231,12 @@ class TRTSEngine:
         Returns:
             Dictionary with convergence analysis results
         """
-        if len(self.state_history) < 2:
+        if len(self.recorder) < 2:
             return {}
         
-        # Extract ratios and errors
-        ratios = [state['ratio'] for state in self.state_history]
-        errors = [state['error'] for state in self.state_history]
+        # Read ratios and errors straight from the trace columns
+        ratios = self.recorder.column('ratio')
+        errors = self.recorder.column('error')
         
         # Calculate convergence metrics
         final_error = errors[-1]
@@ -256,8 +245,9 @@ class TRTSEngine:
         max_error = max(errors)
         
         # Analyze ρ-emission patterns
-        emission_steps = [e['step'] for e in self.emission_history]
-        emission_primes = [e['prime'] for e in self.emission_history]
+        emissions = list(self.recorder.emissions())
+        emission_steps = [e.step for e in emissions]
+        emission_primes = [e.rho_prime for e in emissions]
         
         return {
             'final_ratio': ratios[-1],
@@ -267,7 +257,7 @@ class TRTSEngine:
             'average_error': avg_error,
             'min_error': min_error,
             'max_error': max_error,
-            'total_emissions': len(self.emission_history),
+            'total_emissions': self.recorder.emission_count,
             'emission_steps': emission_steps,
             'emission_primes': emission_primes,
             'convergence_achieved': final_error < 0.001
@@ -336,8 +326,8 @@ def analyze_standard_model_emergence(engine: TRTSEngine) -> Dict:
     print("\n=== STANDARD MODEL EMERGENCE ANALYSIS ===")
     
     # Extract key ratios and patterns
-    ratios = [state['ratio'] for state in engine.state_history]
-    koppa_vals = [float(state['koppa']) for state in engine.state_history]
+    ratios = engine.recorder.column('ratio')
+    koppa_vals = [fraction_float(*row.koppa) for row in engine.recorder]
     
     # Calculate emergent constants (simplified model)
     # These are illustrative relationships based on the framework
@@ -1,61 +1,14 @@
 from fractions import Fraction
-import boost # Placeholder for high-precision math, using standard int for primality
 import math # Only for isqrt, a stdlib integer-only operation
+import os
+import sys
 
-# --- Primality Test (Miller-Rabin) ---
-# This is a Python port of the C++ is_miller_rabin_prime logic.
-# It is only used to set the 'rho' (p) trigger.
-
-def power(a, d, n):
-    """Calculates (a^d) % n"""
-    result = 1
-    a = a % n
-    while d > 0:
-        if d % 2 == 1:
-            result = (result * a) % n
-        d = d >> 1
-        a = (a * a) % n
-    return result
-
-def is_miller_rabin_prime(n):
-    """
-    Python implementation of the Miller-Rabin primality test.
-    This logic matches the C++ header's intent.
-    """
-    if n <= 1: return False
-    if n <= 3: return True
-    if n % 2 == 0: return False
-
-    # Write n as 2^s * d + 1
-    d = n - 1
-    s = 0
-    while d % 2 == 0:
-        d //= 2
-        s += 1
-    
-    # Bases from the C++ implementation
-    test_bases = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29]
-
-    for a in test_bases:
-        if a >= n:
-            break
-        
-        x = power(a, d, n) # x = (a^d) % n
-
-        if x == 1 or x == n - 1:
-            continue
-
-        is_composite = True
-        for _ in range(s - 1):
-            x = power(x, 2, n) # x = (x^2) % n
-            if x == n - 1:
-                is_composite = False
-                break
-        
-        if is_composite:
-            return False # Definitely composite
-
-    return True # Probably prime
+# --- Primality Test ---
+# Shared deterministic Miller-Rabin / BPSW service (replaces the port of
+# the C++ is_miller_rabin_prime logic). Only used to set the 'rho' (p) trigger.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_fingerprint import FingerprintLog
+from trts_primes import is_prime
 
 # --- Canonical 11-Microtick Engine (C11-ME) ---
 
@@ -64,7 +17,7 @@ class TRTS_Engine_C11:
     Canonical 11-Microtick Engine (C11-ME).
     Synthesized from all provided TRTS axioms and C++ code.
     """
-    def __init__(self, upsilon_seed, beta_seed):
+    def __init__(self, upsilon_seed, beta_seed, fingerprint=False):
         # State Variables
         self.upsilon = upsilon_seed
         self.beta = beta_seed
@@ -81,19 +34,18 @@ class TRTS_Engine_C11:
         self.microtick = 0 # Will run 1-11
         self.rho = 0 # Prime trigger (p)
 
+        # Rolling per-step fingerprint of (U, B, K), see trts_fingerprint
+        self.fingerprints = FingerprintLog() if fingerprint else None
+
     def is_prime_trigger(self):
         """
         Checks if Upsilon numerator triggers a prime event.
        
         """
         # We only check the numerator as per the simplest C++ implementation
-        try:
-            num = self.upsilon.numerator
-            if num < 0: num = -num # Use absolute value
-            return is_miller_rabin_prime(int(num))
-        except OverflowError:
-            # Number is too large for standard int primality test
-            return False 
+        num = self.upsilon.numerator
+        if num < 0: num = -num # Use absolute value
+        return is_prime(num)
 
     def update_koppa(self):
         """
@@ -189,6 +141,11 @@ class TRTS_Engine_C11:
         if self.microtick == 11:
             self.microtick = 0
             self.step += 1
+            if self.fingerprints is not None:
+                self.fingerprints.update(
+                    (self.upsilon.numerator, self.upsilon.denominator),
+                    (self.beta.numerator, self.beta.denominator),
+                    (self.koppa.numerator, self.koppa.denominator))
 
     def run_simulation(self, num_steps):
         """Runs the engine for a total number of steps."""
@@ -25,17 +25,39 @@ typedef struct {
     int symbolic_output;
 } TRTS_Config;
 
+// TRTS STATE - EVERYTHING NEEDED TO CONTINUE A RUN
+typedef struct {
+    Rational u;
+    Rational b;
+    Rational k;
+    int rho;
+    int64_t tick;        // completed ticks
+    int microtick;       // completed microticks of the current tick (0-10)
+} TRTS_State;
+
 // PURE RATIONAL ARITHMETIC - NO GCD
-static Rational r_add(Rational a, Rational b) {
-    return (Rational){a.num * b.den + b.num * a.den, a.den * b.den};
+// int64 results wrap; *overflow is set when any product or sum did
+static Rational r_add(Rational a, Rational b, bool *overflow) {
+    int64_t x, y, num, den;
+    *overflow |= __builtin_mul_overflow(a.num, b.den, &x);
+    *overflow |= __builtin_mul_overflow(b.num, a.den, &y);
+    *overflow |= __builtin_add_overflow(x, y, &num);
+    *overflow |= __builtin_mul_overflow(a.den, b.den, &den);
+    return (Rational){num, den};
 }
 
-static Rational r_mul(Rational a, Rational b) {
-    return (Rational){a.num * b.num, a.den * b.den};
+static Rational r_mul(Rational a, Rational b, bool *overflow) {
+    int64_t num, den;
+    *overflow |= __builtin_mul_overflow(a.num, b.num, &num);
+    *overflow |= __builtin_mul_overflow(a.den, b.den, &den);
+    return (Rational){num, den};
 }
 
-static Rational r_div(Rational a, Rational b) {
-    return (Rational){a.num * b.den, a.den * b.num};
+static Rational r_div(Rational a, Rational b, bool *overflow) {
+    int64_t num, den;
+    *overflow |= __builtin_mul_overflow(a.num, b.den, &num);
+    *overflow |= __builtin_mul_overflow(a.den, b.num, &den);
+    return (Rational){num, den};
 }
 
 // PURE PRIME CHECK - PRESERVES SIGN
@@ -88,80 +110,105 @@ void print_symbolic_step(TRTS_Config config, int tick, int microtick,
     }
 }
 
+// ONE MICROTICK OF PURE TRTS PROPAGATION
+// Returns true if an int64 operation overflowed (the state then holds wrapped values)
+static bool trts_microtick(const TRTS_Config *config, TRTS_State *s) {
+    bool overflow = false;
+    int mt = s->microtick + 1;
+    
+    switch (mt) {
+        case 1: case 4: case 7: case 10: // EPSILON
+            if ((config->psi_behavior == 0) || // forced
+                (config->psi_behavior == 1 && is_prime_preserve_sign(s->u.num)) || // rho only
+                (config->psi_behavior == 2 && (mt == 2 || mt == 5 || mt == 8 || mt == 11)) || // all mu
+                (config->psi_behavior == 3 && (is_prime_preserve_sign(s->u.num) || mt == 10))) { // rho+mstep
+                s->rho = (s->rho % 4) + 1;
+            }
+            break;
+            
+        case 2: case 5: case 8: case 11: // MU  
+            if (s->rho > 0) {
+                switch (config->engine_type) {
+                    case 0: s->u = r_add(s->u, s->k, &overflow); break; // additive
+                    case 1: s->u = r_mul(s->u, s->k, &overflow); break; // multiplicative  
+                    case 2: s->u = r_div(r_add(s->u, s->k, &overflow), (Rational){2,1}, &overflow); break; // rotational
+                }
+            }
+            break;
+            
+        case 3: case 6: case 9: // PHI
+            switch (config->engine_type) {
+                case 0: s->b = r_add(s->u, s->b, &overflow); break;
+                case 1: s->b = r_mul(s->u, s->b, &overflow); break;
+                case 2: s->b = r_div(r_add(s->u, s->b, &overflow), (Rational){2,1}, &overflow); break;
+            }
+            break;
+    }
+    
+    // KOPPA MODE HANDLING
+    switch (config->koppa_mode) {
+        case 0: // dump - reset periodically
+            if (mt == 11) s->k = config->seed_k;
+            break;
+        case 1: // accumulate - no change
+            break;
+        case 2: // pop - modify based on state
+            if (mt == 11 && s->rho > 0) {
+                s->k = r_add(s->k, (Rational){s->rho, 1}, &overflow);
+            }
+            break;
+    }
+    
+    if (mt == 11) {
+        s->microtick = 0;
+        s->tick++;
+    } else {
+        s->microtick = mt;
+    }
+    return overflow;
+}
+
+// LIBRARY ENTRY POINT - ADVANCE UP TO count MICROTICKS
+// Stops before a microtick that would overflow int64 and returns the number completed,
+// so a caller with arbitrary-precision arithmetic can take over from an exact state.
+int64_t trts_advance(const TRTS_Config *config, TRTS_State *state, int64_t count) {
+    for (int64_t i = 0; i < count; i++) {
+        TRTS_State next = *state;
+        if (trts_microtick(config, &next)) return i;
+        *state = next;
+    }
+    return count;
+}
+
 // PURE TRTS PROPAGATION
 void run_trts(TRTS_Config config) {
-    Rational u = config.seed_u;
-    Rational b = config.seed_b; 
-    Rational k = config.seed_k;
-    int rho = 0;
+    TRTS_State s = {config.seed_u, config.seed_b, config.seed_k, 0, 0, 0};
     
     printf("=== PURE TRTS PROPAGATION ===\n");
     printf("SEEDS: υ=%ld/%ld, β=%ld/%ld, ϙ=%ld/%ld\n", 
-           u.num, u.den, b.num, b.den, k.num, k.den);
+           s.u.num, s.u.den, s.b.num, s.b.den, s.k.num, s.k.den);
     printf("CONFIG: psi=%d, koppa=%d, engine=%d, ticks=%d\n\n",
            config.psi_behavior, config.koppa_mode, config.engine_type, config.total_ticks);
     
     for (int tick = 0; tick < config.total_ticks; tick++) {
         for (int mt = 1; mt <= 11; mt++) {
             if (config.verbose >= 2) {
-                print_symbolic_step(config, tick, mt, u, b, k, rho);
-            }
-            
-            switch (mt) {
-                case 1: case 4: case 7: case 10: // EPSILON
-                    if ((config.psi_behavior == 0) || // forced
-                        (config.psi_behavior == 1 && is_prime_preserve_sign(u.num)) || // rho only
-                        (config.psi_behavior == 2 && (mt == 2 || mt == 5 || mt == 8 || mt == 11)) || // all mu
-                        (config.psi_behavior == 3 && (is_prime_preserve_sign(u.num) || mt == 10))) { // rho+mstep
-                        rho = (rho % 4) + 1;
-                    }
-                    break;
-                    
-                case 2: case 5: case 8: case 11: // MU  
-                    if (rho > 0) {
-                        switch (config.engine_type) {
-                            case 0: u = r_add(u, k); break; // additive
-                            case 1: u = r_mul(u, k); break; // multiplicative  
-                            case 2: u = r_div(r_add(u, k), (Rational){2,1}); break; // rotational
-                        }
-                    }
-                    break;
-                    
-                case 3: case 6: case 9: // PHI
-                    switch (config.engine_type) {
-                        case 0: b = r_add(u, b); break;
-                        case 1: b = r_mul(u, b); break;
-                        case 2: b = r_div(r_add(u, b), (Rational){2,1}); break;
-                    }
-                    break;
-            }
-            
-            // KOPPA MODE HANDLING
-            switch (config.koppa_mode) {
-                case 0: // dump - reset periodically
-                    if (mt == 11) k = config.seed_k;
-                    break;
-                case 1: // accumulate - no change
-                    break;
-                case 2: // pop - modify based on state
-                    if (mt == 11 && rho > 0) {
-                        k = r_add(k, (Rational){rho, 1});
-                    }
-                    break;
+                print_symbolic_step(config, tick, mt, s.u, s.b, s.k, s.rho);
             }
+            trts_microtick(&config, &s);
         }
         
         if (config.verbose >= 1 && (tick % 100 == 0 || tick < 10)) {
             printf("Tick %4d: υ=%ld/%ld, β=%ld/%ld, ϙ=%ld/%ld, ρ=%d\n", 
-                   tick, u.num, u.den, b.num, b.den, k.num, k.den, rho);
+                   tick, s.u.num, s.u.den, s.b.num, s.b.den, s.k.num, s.k.den, s.rho);
         }
     }
     
     printf("\n=== FINAL STATE ===\n");
-    printf("υ = %ld/%ld ≈ %.6f\n", u.num, u.den, (double)u.num/u.den);
-    printf("β = %ld/%ld ≈ %.6f\n", b.num, b.den, (double)b.num/b.den); 
-    printf("ϙ = %ld/%ld ≈ %.6f\n", k.num, k.den, (double)k.num/k.den);
-    printf("ρ = %d\n", rho);
+    printf("υ = %ld/%ld ≈ %.6f\n", s.u.num, s.u.den, (double)s.u.num/s.u.den);
+    printf("β = %ld/%ld ≈ %.6f\n", s.b.num, s.b.den, (double)s.b.num/s.b.den); 
+    printf("ϙ = %ld/%ld ≈ %.6f\n", s.k.num, s.k.den, (double)s.k.num/s.k.den);
+    printf("ρ = %d\n", s.rho);
 }
 
 // PARSE RATIONAL FROM STRING "a/b"
@@ -194,6 +241,7 @@ void print_help() {
     printf("  trts --upsilon 89/7 --beta 233/11 --ticks 5000 --psi 3\n");
 }
 
+#ifndef TRTS_LIBRARY
 int main(int argc, char *argv[]) {
     TRTS_Config config = {
         .seed_u = {2, 7},
@@ -244,3 +292,4 @@ int main(int argc, char *argv[]) {
     
     return 0;
 }
+#endif
@@ -0,0 +1,379 @@
+"""
+TRTS model1 Engine (Python reference + native driver)
+The 4trtssm.c engine as a steppable, checkpointable Python object.
+
+Model1Engine is an exact Python port of the 4trtssm.c microtick kernel
+(unbounded ints, no GCD). NativeModel1Engine drives the C kernel itself,
+loaded as a shared library through ctypes:
+
+    cc -O2 -shared -fPIC -DTRTS_LIBRARY -o model1/lib4trtssm.so model1/4trtssm.c
+
+(load_library() runs this when the library is missing or stale). The C
+engine works in int64: the state crosses the boundary as its packed
+int64 struct, and trts_advance() stops before any microtick that would
+overflow. The native engine then hands the exact state to the Python
+kernel and continues there, so both engines agree on every run and a
+checkpoint (trts_checkpoint, arbitrary-size integers) resumes either.
+
+    python model1/trts_model1.py -u 5/7 -b 13/11 -t 1000 -p 1 -o 2 --native
+    python model1/trts_model1.py -t 200 -p 3 --cross-check
+"""
+
+import argparse
+import ctypes
+import os
+import subprocess
+import sys
+from typing import Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_checkpoint import read_checkpoint, write_checkpoint
+from trts_primes import is_prime
+from trts_recorder import ratio_float
+
+SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '4trtssm.c')
+LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib4trtssm.so')
+
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+Pair = Tuple[int, int]
+
+
+class Model1Engine:
+    """
+    4trtssm.c propagation with Python integers.
+
+    psi_behavior 0-3 (forced, rho, mu, rho_mstep), koppa_mode 0-2 (dump,
+    accumulate, pop) and engine_type 0-2 (additive, multiplicative,
+    rotational) use the C engine's numbering. State: upsilon, beta,
+    koppa as (num, den) pairs, rho, and the position tick/microtick
+    (completed ticks, completed microticks of the current tick).
+    """
+
+    name = 'python'
+
+    def __init__(self, seed_u: Pair = (2, 7), seed_b: Pair = (3, 11), seed_k: Pair = (1, 1),
+                 psi_behavior: int = 0, koppa_mode: int = 1, engine_type: int = 0):
+        self.seed_u, self.seed_b, self.seed_k = tuple(seed_u), tuple(seed_b), tuple(seed_k)
+        self.psi_behavior = psi_behavior
+        self.koppa_mode = koppa_mode
+        self.engine_type = engine_type
+
+        self.upsilon, self.beta, self.koppa = self.seed_u, self.seed_b, self.seed_k
+        self.rho = 0
+        self.tick = 0
+        self.microtick = 0
+        self.status = 'ready'
+
+    @property
+    def steps_completed(self) -> int:
+        return self.tick
+
+    def state(self) -> Tuple:
+        return (self.upsilon, self.beta, self.koppa, self.rho, self.tick, self.microtick)
+
+    def execute_step(self, steps: int = 1):
+        """
+        Run steps ticks of 11 microticks.
+
+        A tick left unfinished (e.g. resumed from a checkpoint taken
+        mid-tick) is completed first and counts as the first of the steps.
+        """
+        self.status = 'running'
+        self._run_microticks(steps * 11 - self.microtick)
+        self.status = 'completed'
+
+    def _run_microticks(self, count: int):
+        for _ in range(count):
+            self._microtick()
+
+    def _microtick(self):
+        """One microtick of the 4trtssm.c kernel (trts_microtick)."""
+        mt = self.microtick + 1
+        (u_n, u_d), (b_n, b_d), (k_n, k_d) = self.upsilon, self.beta, self.koppa
+        engine = self.engine_type
+
+        if mt in (1, 4, 7, 10):  # EPSILON
+            psi = self.psi_behavior
+            if (psi == 0 or
+                    (psi == 1 and is_prime(abs(u_n))) or
+                    (psi == 3 and (is_prime(abs(u_n)) or mt == 10))):
+                self.rho = self.rho % 4 + 1
+        elif mt in (2, 5, 8, 11):  # MU
+            if self.rho > 0:
+                if engine == 0:
+                    self.upsilon = (u_n * k_d + k_n * u_d, u_d * k_d)
+                elif engine == 1:
+                    self.upsilon = (u_n * k_n, u_d * k_d)
+                elif engine == 2:
+                    self.upsilon = (u_n * k_d + k_n * u_d, u_d * k_d * 2)
+        else:  # PHI
+            if engine == 0:
+                self.beta = (u_n * b_d + b_n * u_d, u_d * b_d)
+            elif engine == 1:
+                self.beta = (u_n * b_n, u_d * b_d)
+            elif engine == 2:
+                self.beta = (u_n * b_d + b_n * u_d, u_d * b_d * 2)
+
+        # KOPPA MODE HANDLING
+        if mt == 11:
+            if self.koppa_mode == 0:
+                self.koppa = self.seed_k
+            elif self.koppa_mode == 2 and self.rho > 0:
+                self.koppa = (k_n + self.rho * k_d, k_d)
+            self.microtick = 0
+            self.tick += 1
+        else:
+            self.microtick = mt
+
+    def config(self) -> Dict:
+        return {
+            'seed_u_num': self.seed_u[0], 'seed_u_den': self.seed_u[1],
+            'seed_b_num': self.seed_b[0], 'seed_b_den': self.seed_b[1],
+            'seed_k_num': self.seed_k[0], 'seed_k_den': self.seed_k[1],
+            'psi_behavior': self.psi_behavior,
+            'koppa_mode': self.koppa_mode,
+            'engine_type': self.engine_type,
+        }
+
+    def save_checkpoint(self, path: str):
+        """Write the configuration and exact state (see trts_checkpoint)."""
+        write_checkpoint(path, {
+            'config': self.config(),
+            'upsilon_num': self.upsilon[0], 'upsilon_den': self.upsilon[1],
+            'beta_num': self.beta[0], 'beta_den': self.beta[1],
+            'koppa_num': self.koppa[0], 'koppa_den': self.koppa[1],
+            'rho': self.rho,
+            'tick': self.tick,
+            'microtick': self.microtick,
+        })
+
+    @classmethod
+    def resume(cls, path: str, **kwargs) -> 'Model1Engine':
+        """Rebuild an engine (of this class) from a checkpoint."""
+        state = read_checkpoint(path)
+        config = state['config']
+        engine = cls(
+            seed_u=(config['seed_u_num'], config['seed_u_den']),
+            seed_b=(config['seed_b_num'], config['seed_b_den']),
+            seed_k=(config['seed_k_num'], config['seed_k_den']),
+            psi_behavior=config['psi_behavior'],
+            koppa_mode=config['koppa_mode'],
+            engine_type=config['engine_type'],
+            **kwargs
+        )
+        engine.upsilon = (state['upsilon_num'], state['upsilon_den'])
+        engine.beta = (state['beta_num'], state['beta_den'])
+        engine.koppa = (state['koppa_num'], state['koppa_den'])
+        engine.rho = state['rho']
+        engine.tick = state['tick']
+        engine.microtick = state['microtick']
+        return engine
+
+
+class _Rational(ctypes.Structure):
+    _fields_ = [('num', ctypes.c_int64), ('den', ctypes.c_int64)]
+
+
+class _Config(ctypes.Structure):
+    """TRTS_Config in 4trtssm.c."""
+    _fields_ = [
+        ('seed_u', _Rational), ('seed_b', _Rational), ('seed_k', _Rational),
+        ('psi_behavior', ctypes.c_int), ('koppa_mode', ctypes.c_int),
+        ('engine_type', ctypes.c_int), ('total_ticks', ctypes.c_int),
+        ('verbose', ctypes.c_int), ('symbolic_output', ctypes.c_int),
+    ]
+
+
+class _State(ctypes.Structure):
+    """TRTS_State in 4trtssm.c."""
+    _fields_ = [
+        ('u', _Rational), ('b', _Rational), ('k', _Rational),
+        ('rho', ctypes.c_int), ('tick', ctypes.c_int64), ('microtick', ctypes.c_int),
+    ]
+
+
+def build_library(source: str = SOURCE, output: str = LIBRARY, compiler: Optional[str] = None):
+    """Compile 4trtssm.c as a shared library (main() is left out)."""
+    compiler = compiler or os.environ.get('CC', 'cc')
+    cmd = [compiler, '-O2', '-shared', '-fPIC', '-DTRTS_LIBRARY', '-o', output, source]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise OSError(f"Building {output} failed ({' '.join(cmd)}):\n{proc.stderr}")
+
+
+_LIBRARIES: Dict[str, ctypes.CDLL] = {}
+
+
+def load_library(path: Optional[str] = None, build: bool = True) -> ctypes.CDLL:
+    """
+    The model1 shared library (TRTS_MODEL1_LIB or model1/lib4trtssm.so).
+
+    The default library is (re)built from 4trtssm.c when missing or
+    older than the source and build is set.
+    """
+    path = path or os.environ.get('TRTS_MODEL1_LIB') or LIBRARY
+    if path in _LIBRARIES:
+        return _LIBRARIES[path]
+    if build and path == LIBRARY and (not os.path.exists(path) or
+                                      os.path.getmtime(path) < os.path.getmtime(SOURCE)):
+        build_library(output=path)
+    lib = ctypes.CDLL(path)
+    lib.trts_advance.argtypes = [ctypes.POINTER(_Config), ctypes.POINTER(_State), ctypes.c_int64]
+    lib.trts_advance.restype = ctypes.c_int64
+    _LIBRARIES[path] = lib
+    return lib
+
+
+def _fits_int64(*pairs: Pair) -> bool:
+    return all(INT64_MIN <= v <= INT64_MAX for pair in pairs for v in pair)
+
+
+class NativeModel1Engine(Model1Engine):
+    """
+    Model1Engine whose microticks run in the C kernel while they fit int64.
+
+    handoff is the (tick, microtick) of the first microtick run by the
+    Python kernel, or None while the run is still native.
+    """
+
+    name = 'native'
+
+    def __init__(self, *args, library: Optional[str] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lib = load_library(library)
+        self.handoff = None
+        if _fits_int64(self.seed_u, self.seed_b, self.seed_k):
+            self._config = _Config(_Rational(*self.seed_u), _Rational(*self.seed_b),
+                                   _Rational(*self.seed_k), self.psi_behavior,
+                                   self.koppa_mode, self.engine_type, 0, 0, 0)
+        else:
+            self._config = None
+            self.handoff = (self.tick, self.microtick + 1)
+
+    @property
+    def native(self) -> bool:
+        return self.handoff is None
+
+    def _run_microticks(self, count: int):
+        if count > 0 and self.native:
+            if not _fits_int64(self.upsilon, self.beta, self.koppa):
+                self.handoff = (self.tick, self.microtick + 1)
+            else:
+                state = _State(_Rational(*self.upsilon), _Rational(*self.beta),
+                               _Rational(*self.koppa), self.rho, self.tick, self.microtick)
+                done = self._lib.trts_advance(ctypes.byref(self._config), ctypes.byref(state), count)
+                self.upsilon = (state.u.num, state.u.den)
+                self.beta = (state.b.num, state.b.den)
+                self.koppa = (state.k.num, state.k.den)
+                self.rho, self.tick, self.microtick = state.rho, state.tick, state.microtick
+                count -= done
+                if count:
+                    # The next microtick overflows int64: continue exactly in Python
+                    self.handoff = (self.tick, self.microtick + 1)
+        super()._run_microticks(count)
+
+
+def cross_check(steps: int, library: Optional[str] = None, **config) -> Dict:
+    """
+    Run the Python and native engines in lockstep, comparing the full
+    state after every microtick.
+
+    Returns counts, the first mismatching (tick, microtick) if any, and
+    where the native engine handed over to Python.
+    """
+    reference = Model1Engine(**config)
+    candidate = NativeModel1Engine(library=library, **config)
+    result = {'total_microticks': steps * 11, 'matched_microticks': 0,
+              'mismatch': None, 'handoff': None}
+    for _ in range(steps * 11):
+        position = (reference.tick, reference.microtick + 1)
+        reference._run_microticks(1)
+        candidate._run_microticks(1)
+        if reference.state() != candidate.state():
+            result['mismatch'] = position
+            break
+        result['matched_microticks'] += 1
+    result['handoff'] = candidate.handoff
+    result['passed'] = result['mismatch'] is None
+    return result
+
+
+def parse_rational(text: str) -> Pair:
+    """'a/b' as (a, b), as the C engine's parse_rational."""
+    try:
+        num, den = (int(part) for part in text.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid rational format: {text} (use a/b)")
+    if den == 0:
+        raise argparse.ArgumentTypeError(f"Invalid rational format: {text} (use a/b)")
+    return num, den
+
+
+def _format(name: str, pair: Pair) -> str:
+    return f"{name} = {pair[0]}/{pair[1]} ≈ {ratio_float(pair, (1, 1)):.6f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TRTS model1 engine (Python reference / native C)')
+    parser.add_argument('-u', '--upsilon', type=parse_rational, default=(2, 7), help='Upsilon seed a/b')
+    parser.add_argument('-b', '--beta', type=parse_rational, default=(3, 11), help='Beta seed a/b')
+    parser.add_argument('-k', '--koppa', type=parse_rational, default=(1, 1), help='Koppa seed a/b')
+    parser.add_argument('-t', '--ticks', type=int, default=100, help='Number of ticks')
+    parser.add_argument('-p', '--psi', type=int, default=0,
+                        help='Psi behavior: 0=forced, 1=rho, 2=mu, 3=rho_mstep')
+    parser.add_argument('-o', '--koppa-mode', type=int, default=1,
+                        help='Koppa mode: 0=dump, 1=accumulate, 2=pop')
+    parser.add_argument('-e', '--engine', type=int, default=0,
+                        help='Engine type: 0=additive, 1=multiplicative, 2=rotational')
+    parser.add_argument('--native', action='store_true',
+                        help='Run the C kernel (continues in Python past int64)')
+    parser.add_argument('--lib', type=str, default=None,
+                        help='Shared library path (default: build model1/lib4trtssm.so)')
+    parser.add_argument('--cross-check', action='store_true',
+                        help='Compare native and Python engines microtick by microtick and exit')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Write a checkpoint when done')
+    parser.add_argument('--resume', type=str, default=None,
+                        help='Continue from this checkpoint up to --ticks total ticks')
+    args = parser.parse_args()
+
+    config = dict(seed_u=args.upsilon, seed_b=args.beta, seed_k=args.koppa,
+                  psi_behavior=args.psi, koppa_mode=args.koppa_mode, engine_type=args.engine)
+    if args.cross_check:
+        result = cross_check(args.ticks, library=args.lib, **config)
+        print("=== MODEL1 CROSS-CHECK: python vs native ===")
+        print(f"Matched microticks: {result['matched_microticks']}/{result['total_microticks']}")
+        if result['handoff']:
+            print(f"Native handed over to Python at tick {result['handoff'][0]} "
+                  f"mt{result['handoff'][1]} (int64 exceeded)")
+        if result['mismatch']:
+            print(f"STATE MISMATCH at tick {result['mismatch'][0]} mt{result['mismatch'][1]}")
+        print(f"Cross-check: {'PASS' if result['passed'] else 'FAIL'}")
+        return 0 if result['passed'] else 1
+
+    cls = NativeModel1Engine if args.native else Model1Engine
+    extra = {'library': args.lib} if args.native else {}
+    engine = cls.resume(args.resume, **extra) if args.resume else cls(**config, **extra)
+
+    print(f"=== TRTS MODEL1 ({engine.name}) ===")
+    print(f"SEEDS: υ={engine.seed_u[0]}/{engine.seed_u[1]}, β={engine.seed_b[0]}/{engine.seed_b[1]}, "
+          f"ϙ={engine.seed_k[0]}/{engine.seed_k[1]}")
+    print(f"CONFIG: psi={engine.psi_behavior}, koppa={engine.koppa_mode}, "
+          f"engine={engine.engine_type}, ticks={args.ticks}")
+    engine.execute_step(max(args.ticks - engine.steps_completed, 0))
+    if args.native and engine.handoff:
+        print(f"int64 exceeded at tick {engine.handoff[0]} mt{engine.handoff[1]}: continued in Python")
+
+    print("\n=== FINAL STATE ===")
+    print(_format('υ', engine.upsilon))
+    print(_format('β', engine.beta))
+    print(_format('ϙ', engine.koppa))
+    print(f"ρ = {engine.rho}")
+    if args.checkpoint:
+        engine.save_checkpoint(args.checkpoint)
+        print(f"Checkpoint written to {args.checkpoint}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,14 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from sympy import isprime, factorint
-import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_cycles import brent_cycle, fold_cycle
+from trts_lazy import lazy_import
+from trts_primes import is_prime
 from collections import Counter
 import math
 
+np = lazy_import('numpy')
+
 # Redefine the RigbySpaceEngine class
 class RigbySpaceEngine:
     def __init__(self, seed_u_num=1, seed_u_den=11, seed_b_num=1, seed_b_den=7):
@@ -28,7 +32,7 @@ class RigbySpaceEngine:
         # Take absolute value for prime check only
         abs_num = abs(num)
         abs_den = abs(den)
-        return isprime(abs_num), isprime(abs_den)
+        return is_prime(abs_num), is_prime(abs_den)
     
     def propagate_microtick(self):
         """Pure TRTS cycle propagation"""
@@ -92,11 +96,54 @@ class RigbySpaceEngine:
         b_num, b_den = self.beta
         return (u_num * b_num, u_den * b_den)
         
+    def current_state(self):
+        """(υ, β, microtick): everything the next microtick depends on"""
+        return (self.upsilon, self.beta, self.microtick)
+        
+    def next_state(self, state):
+        """Pure form of propagate_microtick's update - emissions never feed back"""
+        upsilon, beta, microtick = state
+        microtick += 1
+        if microtick in [2, 5, 8, 11]:
+            upsilon, beta = self.psi_transform(upsilon, beta)
+        return (upsilon, beta, microtick % 11)
+        
     def run_propagation(self, ticks=200):
-        """Run pure propagation for specified ticks"""
+        """
+        Run pure propagation for specified ticks.
+        
+        The state is periodic, so only the lead-in and one cycle are
+        simulated; further whole cycles are folded into PeriodicLogs
+        (results, emission_history, koppa_ledger) with shifted ticks.
+        """
         results = []
+        remaining = ticks * 11  # 11 microticks per tick
+        
+        mu, lam = brent_cycle(self.next_state, self.current_state())
+        lead_in = min(remaining, mu)
+        self._propagate(lead_in, results)
+        remaining -= lead_in
         
-        for i in range(ticks * 11):  # 11 microticks per tick
+        if remaining >= 2 * lam:
+            marks = (len(results), len(self.emission_history), len(self.koppa_ledger))
+            self._propagate(lam, results)
+            repeats = remaining // lam
+            remaining -= repeats * lam
+            
+            # lam is a multiple of 11 (the phase is part of the state)
+            shift = lam // 11
+            results = fold_cycle(results, marks[0], repeats, shift, 'tick')
+            self.emission_history = fold_cycle(self.emission_history, marks[1],
+                                               repeats, shift, 'tick')
+            self.koppa_ledger = fold_cycle(self.koppa_ledger, marks[2], repeats)
+            self.tick += (repeats - 1) * shift
+            
+        self._propagate(remaining, results)
+        return results
+        
+    def _propagate(self, microticks, results):
+        """Step microticks one by one, appending a result at each tick end"""
+        for i in range(microticks):
             self.propagate_microtick()
             
             if self.microtick == 0:  # End of full tick
@@ -118,8 +165,6 @@ class RigbySpaceEngine:
                     'beta_val': b_val,
                     'product_val': product_val
                 })
-                
-        return results
 
 class RigbySpaceSMBuilder:
     def __init__(self):
@@ -261,7 +306,7 @@ class RigbySpaceSMBuilder:
             
             # Check numerators and denominators for primes
             for num in [abs(u_num), abs(u_den), abs(b_num), abs(b_den)]:
-                if isprime(num):
+                if is_prime(num):
                     primes_found.add(num)
         
         primes_sorted = sorted(primes_found)
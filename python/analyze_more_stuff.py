@@ -1,4 +1,8 @@
 # Let's analyze the emission patterns more deeply, focusing on epsilon microticks and the rho-psi-koppa chain
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_events import EventIndex
 
 print("=== Detailed Emission Analysis ===")
 
@@ -17,6 +21,7 @@ print(f"Total rho events (emissions at epsilon): {len(epsilon_emissions)}")
 print(f"Total psi activations (koppa entries): {len(koppa_entries)}")
 
 # Check if every rho event leads to a psi activation on the next mu step
+koppa_index = EventIndex(koppa_entries)
 rho_to_psi_pairs = []
 for emission in epsilon_emissions:
     emission_tick = emission['tick']
@@ -33,11 +38,7 @@ for emission in epsilon_emissions:
         target_tick = emission_tick + 1
     
     # Look for koppa entry at this target
-    corresponding_koppa = None
-    for koppa in koppa_entries:
-        if koppa['tick'] == target_tick and koppa['microtick'] == target_microtick:
-            corresponding_koppa = koppa
-            break
+    corresponding_koppa = koppa_index.get(target_tick, target_microtick)
     
     rho_to_psi_pairs.append({
         'emission': emission,
@@ -109,19 +110,19 @@ print(f"\n=== Extended Simulation for Phase Transition Analysis ===")
 engine_extended = RigbySpaceEngine(seed_u_num=1, seed_u_den=11, seed_b_num=1, seed_b_den=7)
 results_extended = engine_extended.run_propagation(ticks=150)  # Run to 150 ticks to approach 137
 
-emissions_extended = engine_extended.emission_history
+emissions_extended = EventIndex(engine_extended.emission_history)
 
 # Analyze emissions before and after tick 137
-emissions_pre_137 = [e for e in emissions_extended if e['tick'] < 137]
-emissions_post_137 = [e for e in emissions_extended if e['tick'] >= 137]
+emissions_pre_137 = emissions_extended.count_range(stop=137)
+emissions_post_137 = emissions_extended.count_range(start=137)
 
-print(f"Emissions before tick 137: {len(emissions_pre_137)}")
-print(f"Emissions after tick 137: {len(emissions_post_137)}")
+print(f"Emissions before tick 137: {emissions_pre_137}")
+print(f"Emissions after tick 137: {emissions_post_137}")
 
 if emissions_pre_137 and emissions_post_137:
-    rate_pre = len(emissions_pre_137) / 137
+    rate_pre = emissions_pre_137 / 137
     remaining_ticks = 150 - 137
-    rate_post = len(emissions_post_137) / remaining_ticks if remaining_ticks > 0 else 0
+    rate_post = emissions_post_137 / remaining_ticks if remaining_ticks > 0 else 0
     
     print(f"Emission rate before tick 137: {rate_pre:.3f} per tick")
     print(f"Emission rate after tick 137: {rate_post:.3f} per tick")
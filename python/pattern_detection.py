@@ -1,18 +1,61 @@
 # Structural Pattern Detection in TRTS Propagation
-import numpy as np
-from sympy import symbols, Rational, primefactors
+import os
+import sys
 from collections import defaultdict
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_windows import SlidingWindow
+
+MU_MICROTICKS = (2, 5, 8, 11)
+
 class TRTSAnalyzer:
-    def __init__(self):
+    def __init__(self, mu_zero_threshold=0.5, emission_threshold=1/11, koppa_tolerance=0):
         self.phase_transitions = []
         self.mu_zero_sequences = []
         self.prime_attractors = defaultdict(list)
-        
+        # Regime thresholds for is_phase_boundary
+        self.mu_zero_threshold = mu_zero_threshold
+        self.emission_threshold = emission_threshold
+        self.koppa_tolerance = koppa_tolerance
+        self._regime = None
+    
+    @staticmethod
+    def record_features(record):
+        """
+        Per-record window features of a trace row (trts_recorder.TraceRow):
+        μ-zero = κ numerator 0 on a μ microtick; emission/prime from the
+        ρ-trigger flag (the recorder stores ρ-prime 0, not None, on rows
+        without one); κ magnitude as the exact log2 estimate
+        bits(num) - bits(den).
+        """
+        k_num, k_den = record.koppa
+        return {
+            'mu_zero': 1 if record.microtick in MU_MICROTICKS and k_num == 0 else 0,
+            'emission': 1 if record.rho_triggered else 0,
+            'prime': record.rho_prime if record.rho_triggered else None,
+            'koppa_bits': abs(k_num).bit_length() - abs(k_den).bit_length() if k_num else None,
+        }
+    
     def detect_structural_phase(self, trace_data, window_size=137):
-        """Detect phase transitions in TRTS behavior"""
-        for i in range(len(trace_data) - window_size):
-            window = trace_data[i:i+window_size]
+        """Detect phase transitions in TRTS behavior (one pass; any iterable of rows)"""
+        found = list(self.iter_phase_boundaries(trace_data, window_size))
+        self.phase_transitions.extend(found)
+        return found
+    
+    def iter_phase_boundaries(self, trace_data, window_size=137):
+        """
+        Yield the transition point (index just past the window) of every
+        window whose regime differs from the previous window's.
+        
+        Window metrics are updated incrementally as each row arrives, so
+        trace_data may be a generator or an engine's recorder.
+        """
+        window = SlidingWindow(window_size, sums=('mu_zero', 'emission'),
+                               extrema=('prime', 'koppa_bits'))
+        self._regime = None
+        for record in trace_data:
+            if not window.push(self.record_features(record)):
+                continue
             
             # Calculate structural metrics
             mu_zero_density = self.calc_mu_zero_density(window)
@@ -21,8 +64,37 @@ class TRTSAnalyzer:
             
             # Detect phase boundaries
             if self.is_phase_boundary(mu_zero_density, prime_distribution, koppa_behavior):
-                transition_point = i + window_size
-                self.phase_transitions.append(transition_point)
+                yield window.pushed
+    
+    def calc_mu_zero_density(self, window):
+        """Fraction of the window's rows that are μ microticks with κ = 0"""
+        return window.density('mu_zero')
+    
+    def analyze_prime_distribution(self, window):
+        return {
+            'emission_density': window.density('emission'),
+            'min_prime': window.min('prime'),
+            'max_prime': window.max('prime'),
+        }
+    
+    def analyze_koppa_phase(self, window):
+        low, high = window.min('koppa_bits'), window.max('koppa_bits')
+        return {
+            'min_bits': low,
+            'max_bits': high,
+            'span': None if low is None else high - low,
+        }
+    
+    def is_phase_boundary(self, mu_zero_density, prime_distribution, koppa_behavior):
+        """True when the window's regime differs from the previous window's"""
+        span = koppa_behavior['span']
+        regime = (
+            mu_zero_density >= self.mu_zero_threshold,
+            prime_distribution['emission_density'] >= self.emission_threshold,
+            'empty' if span is None else 'settled' if span <= self.koppa_tolerance else 'moving',
+        )
+        previous, self._regime = self._regime, regime
+        return previous is not None and regime != previous
                 
     def analyze_microtick_grammar(self, emission_events):
         """Analyze the 'grammar' of microtick sequences"""
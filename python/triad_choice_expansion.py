@@ -1,6 +1,8 @@
 import argparse
 import sys
-from sympy import isprime
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_primes import is_prime
 
 # Fibonacci primes for seed options
 FIBONACCI_PRIMES = [2, 3, 5, 13, 89, 233, 1597]
@@ -23,7 +25,7 @@ class RigbySpaceEngine:
         num, den = rational
         abs_num = abs(num)
         abs_den = abs(den)
-        return isprime(abs_num), isprime(abs_den)
+        return is_prime(abs_num), is_prime(abs_den)
     
     def psi_transform(self, upsilon, beta):
         """Ψ-transformation: (a/b, c/d) → (d/a, b/c)"""
@@ -1,10 +1,13 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from sympy import isprime, factorint
-import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_lazy import lazy_import
+from trts_primes import is_prime
 from collections import Counter
 import math
 
+np = lazy_import('numpy')
+
 class RigbySpaceSMBuilder:
     def __init__(self):
         # Fundamental constants for comparison
@@ -145,7 +148,7 @@ class RigbySpaceSMBuilder:
             
             # Check numerators and denominators for primes
             for num in [abs(u_num), abs(u_den), abs(b_num), abs(b_den)]:
-                if isprime(num):
+                if is_prime(num):
                     primes_found.add(num)
         
         primes_sorted = sorted(primes_found)
@@ -1,9 +1,15 @@
 import argparse
-from sympy import isprime
-import matplotlib.pyplot as plt
-import numpy as np
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_batch import BatchRigbyEngine
+from trts_events import EventIndex
+from trts_lazy import lazy_import
+from trts_primes import is_prime
 from collections import defaultdict
 
+plt = lazy_import('matplotlib.pyplot')
+
 # Fibonacci primes for seed options
 FIBONACCI_PRIMES = [2, 3, 5, 13, 89, 233, 1597, 28657, 514229]
 
@@ -26,7 +32,7 @@ class RigbySpaceEngine:
         num, den = rational
         abs_num = abs(num)
         abs_den = abs(den)
-        return isprime(abs_num), isprime(abs_den)
+        return is_prime(abs_num), is_prime(abs_den)
     
     def psi_transform(self, upsilon, beta):
         """Ψ-transformation: (a/b, c/d) → (d/a, b/c)"""
@@ -191,22 +197,22 @@ configs = [
 
 all_results = []
 
-for config in configs:
+# Every configuration is one lane of a batched engine, run in lockstep
+batch = BatchRigbyEngine(
+    seeds_u=[config['seed_u'] for config in configs],
+    seeds_b=[config['seed_b'] for config in configs],
+    psi_behavior=[config['psi'] for config in configs],
+    koppa_behavior=[config['koppa'] for config in configs]
+)
+ticks_to_run = 137  # Focus on the critical region
+batch.run(ticks_to_run)
+
+for lane, config in enumerate(configs):
     print(f"\n📊 CONFIGURATION: {config['name']}")
     print(f"Seeds: υ={config['seed_u']}, β={config['seed_b']}")
     print(f"Psi: {config['psi']}, Koppa: {config['koppa']}")
     
-    engine = RigbySpaceEngine(
-        seed_u=config['seed_u'],
-        seed_b=config['seed_b'],
-        psi_behavior=config['psi'],
-        koppa_behavior=config['koppa']
-    )
-    
-    # Run propagation
-    ticks_to_run = 137  # Focus on the critical region
-    for i in range(ticks_to_run * 11):
-        engine.propagate_microtick()
+    engine = batch.lane(lane)
     
     # Analyze results
     role_counts, microtick_counts, type_counts = analyze_emission_patterns(engine.emission_history)
@@ -247,13 +253,11 @@ print(f"\n🔍 DEEP ANALYSIS: {best_config['config']['name']}")
 print("=" * 60)
 
 # Analyze phase transition around tick 137
-emissions_by_tick = defaultdict(int)
-for e in engine.emission_history:
-    emissions_by_tick[e['tick']] += 1
+emission_index = EventIndex(engine.emission_history)
 
 # Calculate emissions before and after critical regions
-pre_137 = sum(emissions_by_tick[t] for t in range(100, 137) if t in emissions_by_tick)
-post_137 = sum(emissions_by_tick[t] for t in range(137, 150) if t in emissions_by_tick)
+pre_137 = emission_index.count_range(100, 137)
+post_137 = emission_index.count_range(137, 150)
 
 print(f"Emissions 100-136: {pre_137}")
 print(f"Emissions 137-149: {post_137}")
@@ -283,7 +287,7 @@ plt.figure(figsize=(12, 8))
 
 # Emission timeline
 ticks = list(range(150))
-emission_counts = [emissions_by_tick.get(t, 0) for t in ticks]
+emission_counts = [emission_index.count_tick(t) for t in ticks]
 
 plt.subplot(2, 2, 1)
 plt.plot(ticks, emission_counts, 'b-', alpha=0.7)
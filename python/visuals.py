@@ -1,7 +1,11 @@
-import numpy as np
-import matplotlib.pyplot as plt
-from sympy import isprime
-import seaborn as sns
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from trts_lazy import lazy_import
+from trts_primes import is_prime
+
+np = lazy_import('numpy')
+plt = lazy_import('matplotlib.pyplot')
 
 # Reimplement RigbySpace engine for clarity
 class RigbySpaceEngine:
@@ -22,7 +26,7 @@ class RigbySpaceEngine:
         num, den = rational
         abs_num = abs(num)
         abs_den = abs(den)
-        return isprime(abs_num), isprime(abs_den)
+        return is_prime(abs_num), is_prime(abs_den)
 
     def psi_transform(self, upsilon, beta):
         a, b = upsilon
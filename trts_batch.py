@@ -0,0 +1,321 @@
+"""
+TRTS Batched Seed Engine
+Advances thousands of RigbySpaceEngine seeds in lockstep.
+
+Each seed is a lane: υ = (un/ud), β = (bn/bd), the ρ/Ψ flags and the
+κ ledger live in NumPy columns, and every microtick (ρ-check, Ψ
+permutation, κ hand-off, κ dump) is a handful of vectorized array
+operations over all lanes. Per-lane Ψ and κ behaviors are integer
+codes, so one batch can mix configurations.
+
+Lanes start in an int64 group (a lane seeded at or above 2^31 starts
+in the exact group below). Before every Ψ microtick, lanes with an
+operand at or above 2^31 (where a product could leave int64) are
+promoted to an exact group of object-dtype columns holding Python
+ints. The same kernel steps both groups, so promoted lanes stay
+bit-exact with the scalar engine in python/triadic_analysis_options.py.
+"""
+
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from trts_primes import prime_mask
+
+PSI_BEHAVIORS = ('forced', 'rho', 'mu', 'rho_mstep')
+KOPPA_BEHAVIORS = ('dump', 'accumulate', 'pop')
+EMISSION_TYPES = ('NUM', 'DEN', 'BOTH', 'FORCED')
+
+EMISSION_MICROTICKS = (1, 4, 7, 10)
+PSI_MICROTICKS = (2, 5, 8, 11)
+
+# Operands below 2^31 keep every κ product (< 2^62) and κ dump sum in int64
+SAFE_LIMIT = 1 << 31
+
+_PSI = {name: code for code, name in enumerate(PSI_BEHAVIORS)}
+_KOPPA = {name: code for code, name in enumerate(KOPPA_BEHAVIORS)}
+_FORCED, _RHO, _MU, _RHO_MSTEP = range(4)
+_DUMP, _ACCUMULATE, _POP = range(3)
+_NUM, _DEN, _BOTH, _FORCED_EMISSION = range(4)
+
+_VALUES = ('un', 'ud', 'bn', 'bd')
+_LANE_COLUMNS = _VALUES + ('ids', 'psi', 'koppa', 'rho', 'psi_fired', 'pushes', 'pops')
+
+
+def _role(microtick: int) -> str:
+    return 'E' if microtick <= 4 else 'M' if microtick <= 8 else 'R'
+
+
+class _LaneGroup:
+    """Columns for a set of lanes; value columns are int64 or object (Python ints)."""
+
+    def __init__(self, dtype, size: int = 0):
+        self.dtype = dtype
+        for name in _VALUES:
+            setattr(self, name, np.zeros(size, dtype=dtype))
+        self.ids = np.zeros(size, dtype=np.int64)
+        self.psi = np.zeros(size, dtype=np.int8)
+        self.koppa = np.zeros(size, dtype=np.int8)
+        self.rho = np.zeros(size, dtype=bool)
+        self.psi_fired = np.zeros(size, dtype=bool)
+        self.pushes = np.zeros(size, dtype=np.int64)
+        self.pops = np.zeros(size, dtype=np.int64)
+        # κ ledger of dump lanes: slot k holds the k-th imbalance handed off
+        self.queue_num = np.zeros((size, 4), dtype=dtype)
+        self.queue_den = np.zeros((size, 4), dtype=dtype)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def split(self, mask: np.ndarray) -> '_LaneGroup':
+        """Remove the masked lanes and return them as a group of the same dtype."""
+        taken = _LaneGroup(self.dtype)
+        for name in _LANE_COLUMNS:
+            column = getattr(self, name)
+            setattr(taken, name, column[mask])
+            setattr(self, name, column[~mask])
+        for name in ('queue_num', 'queue_den'):
+            queue = getattr(self, name)
+            setattr(taken, name, queue[mask])
+            setattr(self, name, queue[~mask])
+        return taken
+
+    def extend(self, other: '_LaneGroup'):
+        """Append other's lanes, converting their values to this group's dtype."""
+        width = max(self.queue_num.shape[1], other.queue_num.shape[1])
+        for name in _LANE_COLUMNS:
+            setattr(self, name, np.concatenate(
+                [getattr(self, name), getattr(other, name).astype(getattr(self, name).dtype)]))
+        for name in ('queue_num', 'queue_den'):
+            mine, theirs = getattr(self, name), getattr(other, name).astype(self.dtype)
+            setattr(self, name, np.concatenate([self._widen(mine, width),
+                                                self._widen(theirs, width)]))
+
+    def _widen(self, queue: np.ndarray, width: int) -> np.ndarray:
+        if queue.shape[1] >= width:
+            return queue
+        padding = np.zeros((len(queue), width - queue.shape[1]), dtype=self.dtype)
+        return np.concatenate([queue, padding], axis=1)
+
+    def reserve_queue(self, slots: int):
+        """Make room for queue slot index slots - 1."""
+        width = self.queue_num.shape[1]
+        if slots > width:
+            width = max(slots, 2 * width)
+            self.queue_num = self._widen(self.queue_num, width)
+            self.queue_den = self._widen(self.queue_den, width)
+
+
+class BatchLane:
+    """
+    One lane of a finished batch, with the scalar engine's attribute names.
+
+    state_history holds the end-of-tick (mt 11) states only; koppa is
+    the ledger length (the values of non-dump ledgers are never read).
+    """
+
+    def __init__(self, upsilon, beta, koppa_size, emission_history, state_history):
+        self.upsilon = upsilon
+        self.beta = beta
+        self.koppa = [None] * koppa_size
+        self.emission_history = emission_history
+        self.state_history = state_history
+
+
+class BatchRigbyEngine:
+    """
+    N RigbySpaceEngine seeds advanced together.
+
+    psi_behavior / koppa_behavior take one name for every lane or a
+    sequence with one name per lane. With record_ticks, the end-of-tick
+    state of every lane is kept for lane().state_history.
+    """
+
+    def __init__(self, seeds_u: Sequence[Tuple[int, int]], seeds_b: Sequence[Tuple[int, int]],
+                 psi_behavior: Union[str, Sequence[str]] = 'forced',
+                 koppa_behavior: Union[str, Sequence[str]] = 'dump',
+                 record_ticks: bool = True):
+        if len(seeds_u) != len(seeds_b):
+            raise ValueError("seeds_u and seeds_b must have one entry per lane")
+        self.size = size = len(seeds_u)
+        self.microtick = 0
+        self.tick = 0
+        self.record_ticks = record_ticks
+
+        # Only lanes with an oversized seed start exact (as _promote splits them)
+        lanes = _LaneGroup(object, size)
+        lanes.un[:], lanes.ud[:] = zip(*seeds_u) if size else ((), ())
+        lanes.bn[:], lanes.bd[:] = zip(*seeds_b) if size else ((), ())
+        lanes.ids[:] = np.arange(size)
+        lanes.psi[:] = self._codes(psi_behavior, _PSI, size)
+        lanes.koppa[:] = self._codes(koppa_behavior, _KOPPA, size)
+        oversized = np.zeros(size, dtype=bool)
+        for name in _VALUES:
+            oversized |= (np.abs(getattr(lanes, name)) >= SAFE_LIMIT).astype(bool)
+        self.exact = lanes.split(oversized)
+        self.fast = _LaneGroup(np.int64)
+        self.fast.extend(lanes)
+
+        self.emission_counts = np.zeros(size, dtype=np.int64)
+        self._emissions: List[Tuple[np.ndarray, ...]] = []
+        self._tick_states: List[Tuple[int, np.ndarray, np.ndarray]] = []
+
+    @staticmethod
+    def _codes(behavior, codes: Dict[str, int], size: int) -> np.ndarray:
+        names = [behavior] * size if isinstance(behavior, str) else list(behavior)
+        if len(names) != size:
+            raise ValueError("need one behavior per lane")
+        try:
+            return np.array([codes[name] for name in names], dtype=np.int8)
+        except KeyError as e:
+            raise ValueError(f"Unknown behavior {e.args[0]!r} (choose from {', '.join(codes)})")
+
+    @property
+    def promoted(self) -> int:
+        """Lanes running on exact Python ints."""
+        return len(self.exact)
+
+    def propagate_microtick(self):
+        """Advance every lane by one microtick."""
+        self.microtick += 1
+        mt = self.microtick
+        if mt in PSI_MICROTICKS:
+            self._promote()
+        for group in (self.fast, self.exact):
+            if len(group):
+                self._step(group, mt)
+        if mt == 11:
+            if self.record_ticks:
+                self._record_tick()
+            for group in (self.fast, self.exact):
+                group.psi_fired[:] = False
+            self.microtick = 0
+            self.tick += 1
+
+    def run(self, ticks: int):
+        for _ in range(ticks * 11):
+            self.propagate_microtick()
+
+    def _promote(self):
+        """Move int64 lanes whose next product could overflow into the exact group."""
+        fast = self.fast
+        if not len(fast):
+            return
+        risky = np.zeros(len(fast), dtype=bool)
+        for name in _VALUES:
+            risky |= np.abs(getattr(fast, name)) >= SAFE_LIMIT
+        if risky.any():
+            self.exact.extend(fast.split(risky))
+
+    def _step(self, g: _LaneGroup, mt: int):
+        """One microtick of the scalar engine, vectorized over a lane group."""
+        if mt in EMISSION_MICROTICKS:
+            num_prime = prime_mask(np.abs(g.un))
+            den_prime = prime_mask(np.abs(g.ud))
+            hit = num_prime | den_prime
+            g.rho |= hit
+            kind = np.where(num_prime & den_prime, _BOTH, np.where(num_prime, _NUM, _DEN))
+            self._log_emissions(g, hit, kind, mt)
+            # Autoset ρ on mt10 if no emission occurred
+            if mt == 10:
+                forced = ~g.rho
+                g.rho[:] = True
+                self._log_emissions(g, forced, np.full(len(g), _FORCED_EMISSION), mt)
+
+        if mt in PSI_MICROTICKS:
+            if mt == 11:
+                fire = np.ones(len(g), dtype=bool)
+            else:
+                fire = ((g.psi == _MU) | (g.rho & ((g.psi == _RHO) | (g.psi == _RHO_MSTEP))) |
+                        ((g.psi == _RHO_MSTEP) & (mt in (5, 8))))
+            idx = np.flatnonzero(fire)
+            if len(idx):
+                a, b, c, d = g.un[idx], g.ud[idx], g.bn[idx], g.bd[idx]
+                # Ψ: (a/b, c/d) → (d/a, b/c); imbalance (υ0·β1, υ1·β0) = (d·c, a·b)
+                g.un[idx], g.ud[idx], g.bn[idx], g.bd[idx] = d, a, b, c
+                g.psi_fired[idx] = True
+                g.rho[idx] = False
+                self._hand_off(g, idx, d * c, a * b)
+
+        if mt == 1:
+            idx = np.flatnonzero((g.koppa == _DUMP) & (g.pushes > g.pops))
+            if len(idx):
+                slot = g.pops[idx]
+                g.un[idx] = g.un[idx] + g.queue_num[idx, slot]
+                g.ud[idx] = g.ud[idx] + g.queue_den[idx, slot]
+                g.pops[idx] += 1
+
+    def _hand_off(self, g: _LaneGroup, idx: np.ndarray, imbalance_num, imbalance_den):
+        """Pass Ψ imbalances to κ; only dump ledgers are ever read back."""
+        dump = g.koppa[idx] == _DUMP
+        if dump.any():
+            lanes = idx[dump]
+            slot = g.pushes[lanes]
+            g.reserve_queue(int(slot.max()) + 1)
+            g.queue_num[lanes, slot] = imbalance_num[dump]
+            g.queue_den[lanes, slot] = imbalance_den[dump]
+        g.pushes[idx] += 1
+
+    def _log_emissions(self, g: _LaneGroup, hit: np.ndarray, kind: np.ndarray, mt: int):
+        if not hit.any():
+            return
+        ids = g.ids[hit]
+        self.emission_counts[ids] += 1  # a lane emits at most once per call
+        self._emissions.append((self.tick, mt, ids, kind[hit].astype(np.int8),
+                                g.un[hit], g.ud[hit], g.bn[hit], g.bd[hit]))
+
+    def _record_tick(self):
+        """Scatter the end-of-tick state of every lane into lane order."""
+        dtype = object if len(self.exact) else np.int64
+        values = np.zeros((4, self.size), dtype=dtype)
+        flags = np.zeros((2, self.size), dtype=bool)
+        for g in (self.fast, self.exact):
+            for row, name in enumerate(_VALUES):
+                values[row, g.ids] = getattr(g, name)
+            flags[0, g.ids] = g.rho
+            flags[1, g.ids] = g.psi_fired
+        self._tick_states.append((self.tick, values, flags))
+
+    def _locate(self, lane: int) -> Tuple[_LaneGroup, int]:
+        for g in (self.fast, self.exact):
+            where = np.flatnonzero(g.ids == lane)
+            if len(where):
+                return g, int(where[0])
+        raise IndexError(f"lane {lane} out of range")
+
+    def koppa_sizes(self) -> np.ndarray:
+        """κ ledger length per lane, as len(engine.koppa) would report it."""
+        sizes = np.zeros(self.size, dtype=np.int64)
+        for g in (self.fast, self.exact):
+            held = np.where(g.koppa == _DUMP, g.pushes - g.pops, g.pushes)
+            sizes[g.ids] = np.where(g.koppa == _POP, np.minimum(g.pushes, 1), held)
+        return sizes
+
+    def lane(self, lane: int) -> BatchLane:
+        """Materialize one lane's state and histories as Python objects."""
+        g, i = self._locate(lane)
+        upsilon = (int(g.un[i]), int(g.ud[i]))
+        beta = (int(g.bn[i]), int(g.bd[i]))
+
+        emissions = []
+        for tick, mt, ids, kinds, un, ud, bn, bd in self._emissions:
+            for j in np.flatnonzero(ids == lane):
+                emissions.append({
+                    'tick': tick,
+                    'microtick': mt,
+                    'role': _role(mt),
+                    'type': EMISSION_TYPES[kinds[j]],
+                    'upsilon': (int(un[j]), int(ud[j])),
+                    'beta': (int(bn[j]), int(bd[j]))
+                })
+
+        states = [{
+            'tick': tick,
+            'microtick': 11,
+            'upsilon': (int(values[0, lane]), int(values[1, lane])),
+            'beta': (int(values[2, lane]), int(values[3, lane])),
+            'rho_active': bool(flags[0, lane]),
+            'psi_fired': bool(flags[1, lane])
+        } for tick, values, flags in self._tick_states]
+
+        return BatchLane(upsilon, beta, int(self.koppa_sizes()[lane]), emissions, states)
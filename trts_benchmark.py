@@ -0,0 +1,490 @@
+"""
+TRTS Engine Benchmark Harness
+Fixed-workload throughput / memory / operand-growth benchmarks for every
+engine variant in the repository.
+
+Each case runs in a fresh (spawned) process so peak RSS belongs to that
+case alone, and a hung case is killed after --timeout seconds. Results
+are written as JSON; --baseline compares them with a stored run and
+exits non-zero when any case's microticks/sec drops by more than
+--threshold.
+
+Many engines are scripts that run their demonstration at import time,
+so engine classes are loaded from the definitions only (imports,
+classes, functions and constants) without executing the rest.
+Cases whose imports are unavailable are reported as skipped.
+
+    python trts_benchmark.py --output bench.json
+    python trts_benchmark.py --cases 'trtsd/RHO/*' --baseline bench.json --threshold 0.05
+
+--imports instead times the start-up import of each CLI entry point with
+`python -X importtime` and fails when one exceeds --import-budget ms or
+pulls in a plotting/numeric/sympy library.
+
+    python trts_benchmark.py --imports --import-budget 150
+"""
+
+import argparse
+import ast
+import fnmatch
+import inspect
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from trts_telemetry import BitLengthTelemetry, current_rss_mb
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+TRTSD_PATH = os.path.join('FIAT_LUX', 'AFTER_LUX', 'trtsd.py')
+
+# script -> default steps (the κ-dump variants grow their operands ~2x per step)
+RIGBY_SCRIPTS = {
+    'triadic_prop.py': 200,
+    '1triad_find_sm.py': 200,
+    'triad_switches_options.py': 20,
+    'triad_choice_expansion.py': 20,
+    'triadic_analysis_options.py': 20,
+    'visuals.py': 20,
+}
+
+DEFAULT_MAX_BITS = 4096
+
+# CLI entry point module -> directory it is run from
+IMPORT_TARGETS = {
+    'trtsd': os.path.join('FIAT_LUX', 'AFTER_LUX'),
+    'trts_sweep': os.path.join('FIAT_LUX', 'AFTER_LUX'),
+    'trts_search': os.path.join('FIAT_LUX', 'AFTER_LUX'),
+    'trtscore': '',
+}
+# Libraries an entry point must not import at start-up (load them lazily)
+HEAVY_MODULES = ('sympy', 'numpy', 'pandas', 'matplotlib', 'seaborn')
+DEFAULT_IMPORT_BUDGET_MS = 150.0
+OPERANDS = ('upsilon', 'beta', 'koppa')
+
+
+def load_definitions(relpath: str) -> Dict:
+    """
+    Execute only the definitions of a repository script.
+
+    Keeps imports, sys.path set-up, class/function definitions,
+    lazy_import bindings, UPPER_CASE module constants and other literal
+    assignments; every other top-level statement (demo runs, argparse,
+    plotting) is dropped. Returns the namespace.
+    """
+    path = os.path.join(ROOT, relpath)
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+
+    body = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.ClassDef)):
+            body.append(node)
+        elif isinstance(node, ast.Assign):
+            if all(isinstance(t, ast.Name) and t.id.isupper() for t in node.targets):
+                body.append(node)
+                continue
+            if (isinstance(node.value, ast.Call)
+                    and ast.unparse(node.value.func) == 'lazy_import'):
+                body.append(node)  # deferred module bindings (trts_lazy)
+                continue
+            try:
+                ast.literal_eval(node.value)
+            except ValueError:
+                continue
+            body.append(node)
+        elif (isinstance(node, ast.Expr) and isinstance(node.value, ast.Call)
+              and ast.unparse(node.value.func) == 'sys.path.insert'):
+            body.append(node)
+    tree.body = body
+
+    # Scripts import their siblings as if run from their own directory
+    script_dir = os.path.dirname(path)
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    namespace = {'__name__': os.path.splitext(os.path.basename(path))[0], '__file__': path}
+    exec(compile(tree, path, 'exec'), namespace)
+    return namespace
+
+
+def _pair(value) -> Tuple[int, int]:
+    """(numerator, denominator) of any rational representation in the repo."""
+    if value is None:
+        return 0, 1
+    if isinstance(value, tuple):
+        return int(value[0]), int(value[1])
+    if hasattr(value, 'numerator'):
+        return int(value.numerator), int(value.denominator)
+    return int(value.n), int(value.d)
+
+
+def _last(ledger) -> Tuple[int, int]:
+    """Most recent entry of a κ ledger list (0/1 when empty)."""
+    return _pair(ledger[-1]) if ledger else (0, 1)
+
+
+# --- Case runners -------------------------------------------------------
+#
+# A runner takes (steps, options) and returns (microticks, status,
+# operands) where operands are the final (υ, β, κ) integer pairs. Only
+# the runner call is timed.
+
+def _run_trtscore(steps: int, options: Dict):
+    ns = load_definitions('trtscore.py')
+    engine = ns['TRTSEngine']()  # no event sinks: silent
+
+    def run():
+        for _ in range(steps):
+            engine.execute_step()
+        return steps * 11, 'completed', (_pair(engine.upsilon), _pair(engine.beta), (0, 1))
+    return run
+
+
+def _run_deepseek(relpath: str):
+    def build(steps: int, options: Dict):
+        ns = load_definitions(relpath)
+        engine = ns['TRTSEngine']()
+
+        def run():
+            engine.execute_step(steps)
+            return steps * 11, 'completed', (_pair(engine.upsilon), _pair(engine.beta),
+                                             _pair(engine.koppa))
+        return run
+    return build
+
+
+def _run_trtsd(psi: str, koppa: str, engine_type: str):
+    def build(steps: int, options: Dict):
+        ns = load_definitions(TRTSD_PATH)
+        engine = ns['TRTSEngine'](
+            psi_mode=ns['PsiMode'](psi), koppa_mode=ns['KoppaMode'](koppa),
+            engine_type=ns['EngineType'](engine_type), backend=options['backend'],
+            record=options['record'], max_bits=options['max_bits'])
+
+        def run():
+            engine.execute_step(steps)
+            return engine.telemetry.samples, engine.status, (
+                _pair(engine.upsilon), _pair(engine.beta), _pair(engine.koppa))
+        return run
+    return build
+
+
+def _run_gemini(steps: int, options: Dict):
+    ns = load_definitions(os.path.join('gemini', 'trts.py'))
+    Fraction = ns['Fraction']
+    engine = ns['TRTS_Engine_C11'](Fraction(13, 7), Fraction(3, 11))
+
+    def run():
+        engine.run_simulation(steps)
+        return steps * 11, 'completed', (_pair(engine.upsilon), _pair(engine.beta),
+                                         _pair(engine.koppa))
+    return run
+
+
+def _run_nocomplete(steps: int, options: Dict):
+    ns = load_definitions(os.path.join('10_27_2025', 'nocomplete.py'))
+    rational = ns['UnreducedRational']
+    engine = ns['TRTSEngine'](max_bits=options['max_bits'])
+    engine.initialize_state(rational(13, 11), rational(13, 7))
+
+    def run():
+        engine.execute_tick(total_steps=steps)
+        return engine.telemetry.samples, engine.status, (
+            _pair(engine.upsilon), _pair(engine.beta), _pair(engine.koppa))
+    return run
+
+
+def _run_zz(steps: int, options: Dict):
+    ns = load_definitions(os.path.join('FIAT_LUX', 'AFTER_LUX', 'FIAT_LUX_DEUX', 'fiat_lux', 'zz.py'))
+    rat = ns['Rat']
+    engine = ns['TRTS'](max_bits=options['max_bits'])
+
+    def run():
+        engine.run(steps * 11, rat(2, 1), rat(3, 1))
+        return engine.telemetry.samples, engine.status, (
+            _pair(engine.u), _pair(engine.b), _pair(engine.k))
+    return run
+
+
+def _run_rigby(script: str):
+    def build(steps: int, options: Dict):
+        ns = load_definitions(os.path.join('python', script))
+        cls = ns['RigbySpaceEngine']
+        if 'seed_u' in inspect.signature(cls).parameters:
+            engine = cls((1, 11), (1, 7))
+        else:
+            engine = cls(1, 11, 1, 7)
+
+        def run():
+            for _ in range(steps * 11):
+                engine.propagate_microtick()
+            ledger = getattr(engine, 'koppa', None)
+            if ledger is None:
+                ledger = engine.koppa_ledger
+            return steps * 11, 'completed', (_pair(engine.upsilon), _pair(engine.beta),
+                                             _last(ledger))
+        return run
+    return build
+
+
+def build_cases() -> Dict[str, Tuple[Callable, int]]:
+    """Case name -> (runner builder, default steps)."""
+    cases = {
+        'trtscore': (_run_trtscore, 50),
+        'deepseek/trtsds': (_run_deepseek(os.path.join('deepseek', 'trtsds.py')), 40),
+        'deepseek/1trtsCds': (_run_deepseek(os.path.join('deepseek', '1trtsCds.py')), 40),
+    }
+    # Every trtsd mode combination (the enums are read from trtsd itself)
+    trtsd = load_definitions(TRTSD_PATH)
+    for psi in trtsd['PsiMode']:
+        for koppa in trtsd['KoppaMode']:
+            for engine_type in trtsd['EngineType']:
+                name = f"trtsd/{psi.value}/{koppa.value}/{engine_type.value}"
+                cases[name] = (_run_trtsd(psi.value, koppa.value, engine_type.value), 20)
+    cases['gemini/C11'] = (_run_gemini, 20)
+    cases['nocomplete'] = (_run_nocomplete, 200)
+    cases['zz'] = (_run_zz, 200)
+    for script, steps in RIGBY_SCRIPTS.items():
+        cases[f"python/{os.path.splitext(script)[0]}"] = (_run_rigby(script), steps)
+    return cases
+
+
+def _case_worker(name: str, steps: int, options: Dict, conn):
+    """Child process: build, time and measure one case; send the result row."""
+    result = {'steps': steps}
+    try:
+        builder, _ = build_cases()[name]
+        run = builder(steps, options)
+        rss_start = current_rss_mb()
+        start = time.perf_counter()
+        microticks, status, operands = run()
+        seconds = time.perf_counter() - start
+
+        telemetry = BitLengthTelemetry(OPERANDS)
+        telemetry.observe(*operands)
+        result.update({
+            'status': status,
+            'microticks': microticks,
+            'seconds': round(seconds, 6),
+            'microticks_per_sec': round(microticks / seconds, 1) if seconds > 0 else None,
+            'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+            'rss_growth_mb': round(current_rss_mb() - rss_start, 1),
+            'final_bits': dict(zip(OPERANDS, telemetry.last)),
+        })
+    except ImportError as e:
+        result['status'] = f"skipped ({type(e).__name__}: {e.name or e})"
+    except Exception as e:
+        result['status'] = f"error: {type(e).__name__}: {e}"
+    conn.send(result)
+    conn.close()
+
+
+def run_case(name: str, steps: int, options: Dict, timeout: float) -> Dict:
+    """Run one case in a spawned process, killing it after timeout seconds."""
+    ctx = multiprocessing.get_context('spawn')
+    parent_conn, child_conn = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_case_worker, args=(name, steps, options, child_conn))
+    proc.start()
+    child_conn.close()
+    if parent_conn.poll(timeout):
+        result = parent_conn.recv()
+    else:
+        result = {'steps': steps, 'status': f"timeout ({timeout:g}s)"}
+    proc.terminate()
+    proc.join()
+    return result
+
+
+def best_of(name: str, steps: int, options: Dict, timeout: float, repeat: int) -> Dict:
+    """Fastest of repeat runs (timing noise only ever slows a run down)."""
+    best = None
+    for _ in range(repeat):
+        result = run_case(name, steps, options, timeout)
+        if not is_measured(result):
+            return result
+        if best is None or result['microticks_per_sec'] > best['microticks_per_sec']:
+            best = result
+    best['repeat'] = repeat
+    return best
+
+
+def is_measured(result: Dict) -> bool:
+    return bool(result.get('microticks_per_sec'))
+
+
+def compare(results: Dict, baseline: Dict, threshold: float,
+            rss_threshold: Optional[float] = None) -> List[str]:
+    """
+    Regressions of results against baseline.
+
+    A case regresses when its microticks/sec falls by more than
+    threshold (a fraction), or - with rss_threshold - its peak RSS grows
+    by more than that fraction. Cases with a different step count or no
+    measurement on either side are not compared.
+    """
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if not old or not is_measured(old) or not is_measured(new):
+            continue
+        if old.get('steps') != new.get('steps'):
+            continue
+        change = new['microticks_per_sec'] / old['microticks_per_sec'] - 1
+        if change < -threshold:
+            regressions.append(f"{name}: {old['microticks_per_sec']:.0f} -> "
+                               f"{new['microticks_per_sec']:.0f} mt/s ({change:+.1%})")
+        if rss_threshold is not None and old.get('peak_rss_mb'):
+            rss_change = new['peak_rss_mb'] / old['peak_rss_mb'] - 1
+            if rss_change > rss_threshold:
+                regressions.append(f"{name}: peak RSS {old['peak_rss_mb']:.1f} -> "
+                                   f"{new['peak_rss_mb']:.1f} MB ({rss_change:+.1%})")
+    return regressions
+
+
+def measure_import(module: str, directory: str, repeat: int = 3) -> Dict:
+    """
+    Start-up import cost of one entry point, from `python -X importtime`.
+
+    Each repeat is a fresh interpreter; the fastest cumulative time is
+    kept. heavy lists the HEAVY_MODULES packages the import pulled in.
+    """
+    best, heavy = None, set()
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                              cwd=os.path.join(ROOT, directory), capture_output=True, text=True)
+        if proc.returncode != 0:
+            return {'status': f"error: {proc.stderr.strip().splitlines()[-1]}"}
+        cumulative = None
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or '|' not in line:
+                continue
+            _, total_us, name = line.split('|')
+            if not total_us.strip().isdigit():
+                continue  # header row
+            if name.split('.')[0].strip() in HEAVY_MODULES:
+                heavy.add(name.split('.')[0].strip())
+            if name.rstrip() == ' ' + module:  # the top-level (unindented) entry
+                cumulative = int(total_us) / 1000
+        if cumulative is not None and (best is None or cumulative < best):
+            best = cumulative
+    return {'status': 'completed', 'import_ms': round(best, 2), 'heavy': sorted(heavy)}
+
+
+def check_imports(budget_ms: float, repeat: int) -> int:
+    """Time every IMPORT_TARGETS entry point; 1 if any is over budget or heavy."""
+    failures = []
+    for module, directory in IMPORT_TARGETS.items():
+        result = measure_import(module, directory, repeat)
+        if result['status'] != 'completed':
+            print(f"{module:<20} {result['status']}")
+            failures.append(f"{module}: {result['status']}")
+            continue
+        line = f"{module:<20} {result['import_ms']:>8.1f} ms"
+        if result['heavy']:
+            line += f"  imports {', '.join(result['heavy'])}"
+            failures.append(f"{module}: imports {', '.join(result['heavy'])} at start-up")
+        if result['import_ms'] > budget_ms:
+            failures.append(f"{module}: {result['import_ms']:.1f} ms > {budget_ms:.0f} ms budget")
+        print(line)
+    if failures:
+        print(f"\n{len(failures)} import check(s) failed:")
+        for line in failures:
+            print(f"  {line}")
+        return 1
+    print(f"All entry points import in under {budget_ms:.0f} ms without heavy libraries")
+    return 0
+
+
+def format_row(name: str, result: Dict, old: Optional[Dict] = None) -> str:
+    if not is_measured(result):
+        return f"{name:<40} {result['status']}"
+    bits = result['final_bits']
+    line = (f"{name:<40} {result['microticks_per_sec']:>12.0f} mt/s "
+            f"{result['peak_rss_mb']:>8.1f} MB  bits u/b/k="
+            f"{bits['upsilon']}/{bits['beta']}/{bits['koppa']}")
+    if result['status'] != 'completed':
+        line += f"  [{result['status']}]"
+    if old and is_measured(old) and old.get('steps') == result['steps']:
+        line += f"  ({result['microticks_per_sec'] / old['microticks_per_sec'] - 1:+.1%})"
+    return line
+
+
+def main():
+    parser = argparse.ArgumentParser(description='TRTS engine benchmark harness')
+    parser.add_argument('--cases', type=str, default='*',
+                        help="Comma-separated name patterns, e.g. 'trtsd/RHO/*,zz'")
+    parser.add_argument('--list', action='store_true', help='List case names and exit')
+    parser.add_argument('--steps', type=int, default=None,
+                        help='Steps per case (default: each case\'s own fixed count)')
+    parser.add_argument('--backend', type=str, default='sympy', help='trtsd numeric backend')
+    parser.add_argument('--record', type=str, default='microtick', help='trtsd recording policy')
+    parser.add_argument('--max-bits', type=int, default=DEFAULT_MAX_BITS,
+                        help='Operand bit budget for engines that support one')
+    parser.add_argument('--timeout', type=float, default=120.0, help='Seconds allowed per case run')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the fastest is kept')
+    parser.add_argument('--output', type=str, default='trts_benchmark.json', help='JSON results file')
+    parser.add_argument('--baseline', type=str, default=None, help='Baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed fractional drop in microticks/sec before a regression')
+    parser.add_argument('--rss-threshold', type=float, default=None,
+                        help='Allowed fractional peak-RSS growth (default: not checked)')
+    parser.add_argument('--imports', action='store_true',
+                        help='Check entry-point start-up imports instead of running cases')
+    parser.add_argument('--import-budget', type=float, default=DEFAULT_IMPORT_BUDGET_MS,
+                        help='Allowed cumulative import time per entry point (ms)')
+    args = parser.parse_args()
+
+    if args.imports:
+        return check_imports(args.import_budget, args.repeat)
+
+    cases = build_cases()
+    patterns = [p.strip() for p in args.cases.split(',')]
+    selected = [name for name in cases if any(fnmatch.fnmatch(name, p) for p in patterns)]
+    if args.list:
+        print('\n'.join(selected))
+        return 0
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    options = {'backend': args.backend, 'record': args.record, 'max_bits': args.max_bits}
+    results = {}
+    for name in selected:
+        steps = args.steps or cases[name][1]
+        results[name] = best_of(name, steps, options, args.timeout, args.repeat)
+        print(format_row(name, results[name], baseline.get(name)), flush=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'options': options,
+            },
+            'results': results,
+        }, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    regressions = compare(results, baseline, args.threshold, args.rss_threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond threshold:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,394 @@
+"""
+TRTS Divergence Bisection
+Find the first microtick at which two engines disagree.
+
+Each engine is run on its own from the same seeds, keeping only its
+rolling fingerprint log (8 bytes per step, see trts_fingerprint) and a
+checkpoint every K steps. The first divergent step is then a binary
+search over the two logs - O(log N) comparisons, no trace diff - and
+only that step is replayed microtick by microtick, from the last
+checkpoint before it, on both engines: at most K steps of replay
+whatever the run length.
+
+Replays restore trtsd and model1 from their own binary checkpoints;
+the other engines (trtscore, 1trtsCds, gemini, nocomplete) have no
+checkpoint format and are snapshotted in memory. Logs written by an
+engine's --fingerprints option (or the C++ trts_cli --fingerprint
+output) can be compared directly with --logs, to step resolution.
+
+Unreduced engines (nocomplete) grow double-exponentially, so a run
+stops at the first microtick where an operand passes --max-bits
+(default 4096, as in trts_benchmark); the logs are then compared over
+the whole steps both engines completed.
+
+    python trts_bisect.py trtsd 1trtsCds --steps 500 --u 22/7 --b 19/11
+    python trts_bisect.py --logs run_a.fp run_b.fp
+"""
+
+import argparse
+import contextlib
+import copy
+import importlib.util
+import io
+import os
+import sys
+import tempfile
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+from trts_fingerprint import (FingerprintLog, canonical_pair, first_divergence,
+                              mismatched_operands, state_fingerprint)
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MAX_BITS = 4096
+
+Pair = Tuple[int, int]
+State = Tuple[Pair, Pair, Pair]
+
+
+def _load(relative_path: str, name: str):
+    """Import an engine module from its file (several share a file name)."""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    path = os.path.join(ROOT, relative_path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _pair(value) -> Pair:
+    return int(value.numerator), int(value.denominator)
+
+
+def _bits(state: State) -> int:
+    return max(max(abs(num).bit_length(), abs(den).bit_length()) for num, den in state)
+
+
+class Replay:
+    """
+    One engine driven a microtick at a time from seeds υ, β.
+
+    microticks counts the microticks run; a snapshot is only taken on
+    a step boundary.
+    """
+
+    name = '?'
+
+    def __init__(self, upsilon: Fraction, beta: Fraction):
+        self.upsilon_seed, self.beta_seed = upsilon, beta
+        self.microticks = 0
+        self.engine = self.build()
+
+    def build(self):
+        raise NotImplementedError
+
+    def _advance(self):
+        raise NotImplementedError
+
+    def state(self) -> State:
+        e = self.engine
+        return _pair(e.upsilon), _pair(e.beta), _pair(e.koppa)
+
+    def advance(self, count: int = 1):
+        # Some engines narrate every emission; replays are silent
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(count):
+                self._advance()
+        self.microticks += count
+
+    def snapshot(self, workdir: str):
+        return self.microticks, copy.deepcopy(self.engine)
+
+    def restore(self, snapshot):
+        self.microticks, engine = snapshot
+        self.engine = copy.deepcopy(engine)
+
+    def close(self):
+        pass
+
+
+class TrtsdReplay(Replay):
+    """FIAT_LUX trtsd (default modes); snapshots are trtsd checkpoints."""
+
+    name = 'trtsd'
+    backend = 'sympy'
+
+    def build(self):
+        module = _load('FIAT_LUX/AFTER_LUX/trtsd.py', 'trtsd')
+        self.module = module
+        u, b = self.upsilon_seed, self.beta_seed
+        return module.TRTSEngine(u_seed=u.numerator, u_denom=u.denominator,
+                                 b_seed=b.numerator, b_denom=b.denominator,
+                                 backend=self.backend, record='none')
+
+    def _advance(self):
+        self.engine.advance_microtick()
+
+    def snapshot(self, workdir: str):
+        path = os.path.join(workdir, f"{self.name}-{self.microticks}.ckpt")
+        self.engine.save_checkpoint(path)
+        return self.microticks, path
+
+    def restore(self, snapshot):
+        self.microticks, path = snapshot
+        self.engine = self.module.TRTSEngine.resume(path)
+
+
+class TrtsdIntReplay(TrtsdReplay):
+    name = 'trtsd-int'
+    backend = 'int'
+
+
+class TrtscoreReplay(Replay):
+    """trtscore (κ is a ledger, compared as 0/1 as it records it)."""
+
+    name = 'trtscore'
+
+    def build(self):
+        module = _load('trtscore.py', 'trtscore')
+        engine = module.TRTSEngine(record='none')
+        engine.upsilon = module.sp.Rational(self.upsilon_seed.numerator, self.upsilon_seed.denominator)
+        engine.beta = module.sp.Rational(self.beta_seed.numerator, self.beta_seed.denominator)
+        return engine
+
+    def _advance(self):
+        engine = self.engine
+        if engine.microtick == 11:
+            # execute_step's bookkeeping between steps
+            engine.microtick = 0
+            engine.step_count += 1
+        engine.advance_microtick()
+
+    def state(self) -> State:
+        e = self.engine
+        return (e.upsilon.p, e.upsilon.q), (e.beta.p, e.beta.q), (0, 1)
+
+
+class DeepseekReplay(Replay):
+    """deepseek/1trtsCds (default modes)."""
+
+    name = '1trtsCds'
+
+    def build(self):
+        module = _load('deepseek/1trtsCds.py', 'trts_1trtsCds')
+        engine = module.TRTSEngine(record='none')
+        engine.upsilon = module.sp.Rational(self.upsilon_seed.numerator, self.upsilon_seed.denominator)
+        engine.beta = module.sp.Rational(self.beta_seed.numerator, self.beta_seed.denominator)
+        return engine
+
+    def _advance(self):
+        self.engine.advance_microtick()
+
+
+class GeminiReplay(Replay):
+    """gemini/trts.py canonical 11-microtick engine."""
+
+    name = 'gemini'
+
+    def build(self):
+        module = _load('gemini/trts.py', 'trts_gemini')
+        return module.TRTS_Engine_C11(self.upsilon_seed, self.beta_seed)
+
+    def _advance(self):
+        self.engine.execute_microtick()
+
+
+class NocompleteReplay(Replay):
+    """10_27_2025/nocomplete.py unreduced engine (PSI_D / KAPPA_A / ENG_Q)."""
+
+    name = 'nocomplete'
+
+    def build(self):
+        module = _load('10_27_2025/nocomplete.py', 'trts_nocomplete')
+        u, b = self.upsilon_seed, self.beta_seed
+        engine = module.TRTSEngine(psi_mode='PSI_D', kappa_mode='KAPPA_A', engine_mode='ENG_Q')
+        engine.initialize_state(module.UnreducedRational(u.numerator, u.denominator),
+                                module.UnreducedRational(b.numerator, b.denominator))
+        return engine
+
+    def _advance(self):
+        self.engine.process_microtick()
+
+
+class Model1Replay(Replay):
+    """model1 (4trtssm.c port, default modes); snapshots are its checkpoints."""
+
+    name = 'model1'
+
+    def build(self):
+        module = _load('model1/trts_model1.py', 'trts_model1')
+        self.module = module
+        return module.Model1Engine(seed_u=_pair(self.upsilon_seed), seed_b=_pair(self.beta_seed))
+
+    def _advance(self):
+        self.engine._microtick()
+
+    def state(self) -> State:
+        e = self.engine
+        return e.upsilon, e.beta, e.koppa
+
+    def snapshot(self, workdir: str):
+        path = os.path.join(workdir, f"{self.name}-{self.microticks}.ckpt")
+        self.engine.save_checkpoint(path)
+        return self.microticks, path
+
+    def restore(self, snapshot):
+        self.microticks, path = snapshot
+        self.engine = self.module.Model1Engine.resume(path)
+
+
+ENGINES = {cls.name: cls for cls in (TrtsdReplay, TrtsdIntReplay, TrtscoreReplay,
+                                     DeepseekReplay, GeminiReplay, NocompleteReplay,
+                                     Model1Replay)}
+
+
+def record_run(replay: Replay, steps: int, checkpoint_every: int, workdir: str,
+               max_bits: Optional[int] = None):
+    """
+    Run steps steps; return the fingerprint log, {step: snapshot} and
+    the (step, microtick, bits) at which an operand first passed
+    max_bits, or None. A run stopped that way logs only whole steps.
+    """
+    log = FingerprintLog()
+    checkpoints = {0: replay.snapshot(workdir)}
+    for step in range(1, steps + 1):
+        if max_bits:
+            for microtick in range(1, 12):
+                replay.advance()
+                bits = _bits(replay.state())
+                if bits > max_bits:
+                    return log, checkpoints, (step, microtick, bits)
+        else:
+            replay.advance(11)
+        log.update(*replay.state())
+        if step % checkpoint_every == 0 and step < steps:
+            checkpoints[step] = replay.snapshot(workdir)
+    return log, checkpoints, None
+
+
+def bisect_engines(engine_a: str, engine_b: str, steps: int,
+                   upsilon: Fraction = Fraction(13, 7), beta: Fraction = Fraction(3, 11),
+                   checkpoint_every: int = 64,
+                   max_bits: Optional[int] = DEFAULT_MAX_BITS) -> Dict:
+    """
+    First divergence of engine_b from engine_a over steps steps.
+
+    Returns the divergent step (from 1) and microtick (1-11), the
+    operands that differ there and both states, or step None when the
+    fingerprints agree over the whole run. When an engine passes
+    max_bits, bit_limit names it with the step, microtick and bit-length,
+    and only the compared_steps both engines completed are searched.
+    """
+    if checkpoint_every < 1:
+        raise ValueError("checkpoint_every must be at least 1")
+    result = {'engines': (engine_a, engine_b), 'steps': steps,
+              'step': None, 'microtick': None, 'operands': [], 'states': None,
+              'replayed_microticks': 0, 'compared_steps': steps, 'bit_limit': None}
+    with tempfile.TemporaryDirectory(prefix='trts_bisect_') as workdir:
+        replays = [ENGINES[engine_a](upsilon, beta), ENGINES[engine_b](upsilon, beta)]
+        runs = []
+        for name, replay in zip(result['engines'], replays):
+            # The second engine need not run past the first one's stop
+            log, checkpoints, stop = record_run(replay, result['compared_steps'],
+                                                checkpoint_every, workdir, max_bits)
+            runs.append((log, checkpoints))
+            if stop is not None:
+                result['compared_steps'] = len(log)
+                if result['bit_limit'] is None:
+                    result['bit_limit'] = dict(zip(('engine', 'step', 'microtick', 'bits'),
+                                                   (name, *stop)))
+        step = first_divergence(runs[0][0].values, runs[1][0].values)
+        result['fingerprints'] = tuple(log.value for log, _ in runs)
+        if step is None:
+            return result
+        result['step'] = step
+
+        # Both runs agree through step - 1: restart there from the last checkpoint
+        start = max(s for s in runs[0][1] if s < step)
+        for replay, (_, checkpoints) in zip(replays, runs):
+            replay.restore(checkpoints[start])
+            replay.advance((step - 1 - start) * 11)
+        result['replayed_microticks'] = (step - start) * 11
+
+        for microtick in range(1, 12):
+            for replay in replays:
+                replay.advance()
+            states = [replay.state() for replay in replays]
+            if state_fingerprint(*states[0]) != state_fingerprint(*states[1]):
+                break
+        result['replayed_microticks'] -= 11 - microtick
+        result['microtick'] = microtick
+        result['operands'] = mismatched_operands(*states)
+        result['states'] = states
+    return result
+
+
+def _format_state(state: State) -> str:
+    return '  '.join(f"{symbol}={num}/{den}" for symbol, (num, den)
+                     in zip(('υ', 'β', 'κ'), (canonical_pair(*pair) for pair in state)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Locate the first divergence between two TRTS engines')
+    parser.add_argument('engines', nargs='*', metavar='ENGINE',
+                        help='Two of: ' + ', '.join(ENGINES))
+    parser.add_argument('--steps', type=int, default=100, help='Steps to compare')
+    parser.add_argument('--u', type=Fraction, default=Fraction(13, 7), help='υ seed (e.g. 22/7)')
+    parser.add_argument('--b', type=Fraction, default=Fraction(3, 11), help='β seed (e.g. 19/11)')
+    parser.add_argument('--checkpoint-every', type=int, default=64,
+                        help='Steps between replay checkpoints (bounds the replay)')
+    parser.add_argument('--max-bits', type=int, default=DEFAULT_MAX_BITS,
+                        help='Stop a run once an operand passes this many bits (0 = no limit)')
+    parser.add_argument('--logs', nargs=2, metavar=('A', 'B'), default=None,
+                        help='Compare two fingerprint logs instead of running engines')
+    args = parser.parse_args(argv)
+
+    if args.logs:
+        logs = [FingerprintLog.load(path) for path in args.logs]
+        step = first_divergence(logs[0].values, logs[1].values)
+        common = min(len(log) for log in logs)
+        print(f"Fingerprint logs: {len(logs[0])} and {len(logs[1])} steps")
+        if step is None:
+            print(f"No divergence over the first {common} steps")
+            return 0
+        print(f"First divergent step: {step} "
+              f"({logs[0].values[step - 1]:016x} vs {logs[1].values[step - 1]:016x})")
+        return 1
+
+    if len(args.engines) != 2 or any(name not in ENGINES for name in args.engines):
+        parser.error(f"give two engines from: {', '.join(ENGINES)}")
+    if args.checkpoint_every < 1:
+        parser.error("--checkpoint-every must be at least 1")
+
+    engine_a, engine_b = args.engines
+    print(f"=== TRTS BISECT: {engine_a} vs {engine_b} ===")
+    print(f"Seeds: υ={args.u}, β={args.b}, steps: {args.steps}, "
+          f"checkpoints every {args.checkpoint_every} steps")
+    result = bisect_engines(engine_a, engine_b, args.steps, args.u, args.b,
+                            args.checkpoint_every, args.max_bits)
+    limit = result['bit_limit']
+    if limit is not None:
+        print(f"Stopped: {limit['engine']} passed {args.max_bits} bits ({limit['bits']}) "
+              f"at step {limit['step']} mt{limit['microtick']}; comparing "
+              f"{result['compared_steps']} whole steps (raise --max-bits)")
+    if result['step'] is None:
+        print(f"No divergence in {result['compared_steps']} steps "
+              f"(fingerprint {result['fingerprints'][0]:016x})")
+        return 0 if limit is None else 2
+    print(f"First divergent step: {result['step']}")
+    print(f"First divergent microtick: step {result['step']} mt{result['microtick']} "
+          f"({', '.join(result['operands'])} differ)")
+    for name, state in zip((engine_a, engine_b), result['states']):
+        print(f"  {name}: {_format_state(state)}")
+    print(f"Replayed microticks: {result['replayed_microticks']}")
+    return 1
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,144 @@
+"""
+TRTS Binary Checkpoints
+Compact, self-describing snapshots of engine state.
+
+A checkpoint is a flat list of named fields, each tagged with its kind:
+integers are stored as raw length-prefixed signed bytes (so unreduced
+numerators/denominators of any size round-trip exactly), floats as
+IEEE doubles, strings as UTF-8, byte strings verbatim. Fields can nest
+one dict inside another for sub-components (recorder, telemetry). A
+CRC32 trailer rejects torn or truncated files, and writes go through a
+temporary file + os.replace so the previous checkpoint survives a crash
+mid-write.
+"""
+
+import os
+import struct
+import zlib
+from typing import Dict, Tuple
+
+from trts_recorder import decode_int, encode_int
+
+MAGIC = b'TRTSCKP1'
+
+_COUNT = struct.Struct('<I')
+_NAME = struct.Struct('<H')
+_DOUBLE = struct.Struct('<d')
+
+
+class CheckpointError(ValueError):
+    """Raised for files that are not valid TRTS checkpoints."""
+
+
+def _encode_fields(fields: Dict, out: bytearray):
+    out += _COUNT.pack(len(fields))
+    for name, value in fields.items():
+        raw_name = name.encode('utf-8')
+        out += _NAME.pack(len(raw_name))
+        out += raw_name
+        if value is None:
+            out += b'N'
+        elif isinstance(value, float):
+            out += b'f'
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, str):
+            raw = value.encode('utf-8')
+            out += b's'
+            out += _COUNT.pack(len(raw))
+            out += raw
+        elif isinstance(value, (bytes, bytearray)):
+            out += b'b'
+            out += _COUNT.pack(len(value))
+            out += value
+        elif isinstance(value, dict):
+            out += b'd'
+            _encode_fields(value, out)
+        elif isinstance(value, (list, tuple)):
+            out += b'l'
+            out += _COUNT.pack(len(value))
+            for item in value:
+                encode_int(item, out)
+        else:
+            # bool, int, gmpy2.mpz, sympy.Integer
+            out += b'i'
+            encode_int(value, out)
+
+
+def _decode_fields(data, pos: int):
+    fields = {}
+    (count,) = _COUNT.unpack_from(data, pos)
+    pos += _COUNT.size
+    for _ in range(count):
+        (name_len,) = _NAME.unpack_from(data, pos)
+        pos += _NAME.size
+        name = bytes(data[pos:pos + name_len]).decode('utf-8')
+        pos += name_len
+        kind = data[pos:pos + 1]
+        pos += 1
+        if kind == b'N':
+            value = None
+        elif kind == b'i':
+            value, pos = decode_int(data, pos)
+        elif kind == b'f':
+            (value,) = _DOUBLE.unpack_from(data, pos)
+            pos += _DOUBLE.size
+        elif kind in (b's', b'b'):
+            (length,) = _COUNT.unpack_from(data, pos)
+            pos += _COUNT.size
+            value = bytes(data[pos:pos + length])
+            pos += length
+            if kind == b's':
+                value = value.decode('utf-8')
+        elif kind == b'd':
+            value, pos = _decode_fields(data, pos)
+        elif kind == b'l':
+            (length,) = _COUNT.unpack_from(data, pos)
+            pos += _COUNT.size
+            value = []
+            for _ in range(length):
+                item, pos = decode_int(data, pos)
+                value.append(item)
+        else:
+            raise CheckpointError(f"Unknown field kind {kind!r} for '{name}'")
+        fields[name] = value
+    return fields, pos
+
+
+def encode_fields(fields: Dict) -> bytes:
+    """fields in the checkpoint field encoding (no magic or CRC)."""
+    out = bytearray()
+    _encode_fields(fields, out)
+    return bytes(out)
+
+
+def decode_fields(data, pos: int = 0) -> Tuple[Dict, int]:
+    """Fields encoded at pos by encode_fields. Returns (fields, next_pos)."""
+    return _decode_fields(data, pos)
+
+
+def write_checkpoint(path: str, fields: Dict):
+    """Atomically write fields to path."""
+    payload = bytearray(MAGIC)
+    _encode_fields(fields, payload)
+    payload += _COUNT.pack(zlib.crc32(payload))
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_checkpoint(path: str) -> Dict:
+    """Read and verify a checkpoint written by write_checkpoint."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC) or len(data) < len(MAGIC) + 2 * _COUNT.size:
+        raise CheckpointError(f"{path} is not a TRTS checkpoint")
+    (crc,) = _COUNT.unpack_from(data, len(data) - _COUNT.size)
+    body = memoryview(data)[:len(data) - _COUNT.size]
+    if zlib.crc32(body) != crc:
+        raise CheckpointError(f"{path} is corrupt (CRC mismatch)")
+    fields, _ = _decode_fields(body, len(MAGIC))
+    return fields
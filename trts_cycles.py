@@ -0,0 +1,113 @@
+"""
+TRTS Cycle Detection
+Brent cycle finding and periodic record logs for engines whose state
+is a pure function of the previous state.
+
+When emissions never feed back into υ/β (e.g. the tuple-permutation
+RigbySpaceEngine), (υ, β, microtick) is eventually periodic. Once the
+period is known, a long run is one simulated cycle plus a PeriodicLog
+that replays that cycle's records with the tick field shifted, so the
+cost is O(prefix + period) however many ticks are requested.
+"""
+
+from collections.abc import Sequence
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+
+def brent_cycle(step: Callable[[Any], Any], x0: Any) -> Tuple[int, int]:
+    """
+    Brent's algorithm on the sequence x0, step(x0), step(step(x0)), ...
+
+    Returns (mu, lam): the first repeated state is reached after mu
+    steps and recurs every lam steps. The sequence must be eventually
+    periodic, or this never returns.
+    """
+    power = lam = 1
+    tortoise, hare = x0, step(x0)
+    while tortoise != hare:
+        if power == lam:
+            tortoise = hare
+            power *= 2
+            lam = 0
+        hare = step(hare)
+        lam += 1
+
+    tortoise = hare = x0
+    for _ in range(lam):
+        hare = step(hare)
+    mu = 0
+    while tortoise != hare:
+        tortoise, hare = step(tortoise), step(hare)
+        mu += 1
+    return mu, lam
+
+
+class PeriodicLog(Sequence):
+    """
+    Read-mostly list of records: head + cycle * repeats + tail.
+
+    Repeat k of the cycle is synthesized on access; with key set, each
+    record is a dict copy whose key field is shifted by k * shift.
+    append() extends the tail, so an engine can keep propagating after
+    a fast-forward.
+    """
+
+    def __init__(self, head: Sequence, cycle: Sequence, repeats: int,
+                 shift: int = 0, key: Optional[str] = None):
+        self.head = head
+        self.cycle = list(cycle)
+        self.repeats = repeats
+        self.shift = shift
+        self.key = key
+        self.tail = []
+
+    def __len__(self) -> int:
+        return len(self.head) + len(self.cycle) * self.repeats + len(self.tail)
+
+    def _synthesize(self, index: int):
+        k, offset = divmod(index, len(self.cycle))
+        record = self.cycle[offset]
+        if self.key is None or k == 0:
+            return record
+        return dict(record, **{self.key: record[self.key] + k * self.shift})
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('log index out of range')
+        if index < len(self.head):
+            return self.head[index]
+        index -= len(self.head)
+        periodic = len(self.cycle) * self.repeats
+        if index < periodic:
+            return self._synthesize(index)
+        return self.tail[index - periodic]
+
+    def __iter__(self) -> Iterator:
+        yield from self.head
+        for index in range(len(self.cycle) * self.repeats):
+            yield self._synthesize(index)
+        yield from self.tail
+
+    def append(self, record):
+        self.tail.append(record)
+
+
+def fold_cycle(log, start: int, repeats: int, shift: int = 0,
+               key: Optional[str] = None) -> PeriodicLog:
+    """
+    Turn log[start:], one freshly simulated cycle, into `repeats` copies.
+
+    log may be a plain list or a PeriodicLog from an earlier fold; the
+    cycle records are removed from it and it becomes the new head.
+    """
+    cycle = log[start:]
+    if isinstance(log, PeriodicLog):
+        del log.tail[len(log.tail) - len(cycle):]
+    else:
+        del log[start:]
+    return PeriodicLog(log, cycle, repeats, shift, key)
@@ -0,0 +1,215 @@
+"""
+TRTS Event Bus
+Typed engine events delivered to pluggable sinks.
+
+Engines used to print every emission, Ψ-transform, Ω null tick and κ
+dump as it happened; past a few thousand steps that terminal I/O was
+most of the wall time. They now publish typed events instead:
+
+    Emission(step, microtick, prime)
+    PsiTransform(step, microtick, upsilon, beta)
+    NullTick(step)
+    KoppaDump(step, value)
+    StepStart(step, upsilon, beta)
+    StepEnd(step, upsilon, beta, ratio, target)
+    Convergence(step, error)
+
+and each subscribed sink receives them:
+
+    console      print event.format() (the old output, line for line)
+    file:PATH    the same lines, written in batches (gzip/xz by extension)
+    ring:N       the last N event objects, in memory
+    none         nothing
+
+Engines check `if self.events:` before building an event (or computing
+anything only an event needs), so a bus with no sinks costs one
+truthiness test per publishing site.
+"""
+
+import sys
+from collections import deque, namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Type
+
+from trts_recorder import open_text_stream
+
+DEFAULT_RING = 10000
+DEFAULT_FILE_BUFFER = 4096  # lines per write
+
+
+class Emission(namedtuple('Emission', ['step', 'microtick', 'prime'])):
+    """A ρ-trigger on a prime."""
+    __slots__ = ()
+
+    def format(self) -> str:
+        return f"EMISSION: mt{self.microtick}, prime {self.prime}"
+
+
+class PsiTransform(namedtuple('PsiTransform', ['step', 'microtick', 'upsilon', 'beta'])):
+    """Ψ applied; upsilon/beta are the transformed values."""
+    __slots__ = ()
+
+    def format(self) -> str:
+        return f"Ψ-TRANSFORM at mt{self.microtick}"
+
+
+class NullTick(namedtuple('NullTick', ['step'])):
+    """Ω null tick at microtick 11 of a step with an emission."""
+    __slots__ = ()
+
+    def format(self) -> str:
+        return "Ω - NULL TICK INJECTED"
+
+
+class KoppaDump(namedtuple('KoppaDump', ['step', 'value'])):
+    """The κ ledger total released at the end of a step."""
+    __slots__ = ()
+
+    def format(self) -> str:
+        return f"KOPPA DUMP: {self.value}"
+
+
+class StepStart(namedtuple('StepStart', ['step', 'upsilon', 'beta'])):
+    __slots__ = ()
+
+    def format(self) -> str:
+        return f"\n--- STEP {self.step} ---\nInitial: υ={self.upsilon}, β={self.beta}"
+
+
+class StepEnd(namedtuple('StepEnd', ['step', 'upsilon', 'beta', 'ratio', 'target'])):
+    __slots__ = ()
+
+    def format(self) -> str:
+        return (f"Final: υ={self.upsilon}, β={self.beta}\n"
+                f"Ratio υ/β: {self.ratio:.6f}\n"
+                f"Target √2: {self.target:.6f}")
+
+
+class Convergence(namedtuple('Convergence', ['step', 'error'])):
+    """|υ/β - target| after a step (reported by the driver loop)."""
+    __slots__ = ()
+
+    def format(self) -> str:
+        return f"Convergence Error: {self.error:.8f}"
+
+
+EVENT_TYPES = (Emission, PsiTransform, NullTick, KoppaDump, StepStart, StepEnd, Convergence)
+
+Sink = Callable[[tuple], None]
+
+
+class ConsoleSink:
+    """Prints each event's text as it arrives."""
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def __call__(self, event):
+        print(event.format(), file=self.stream or sys.stdout)
+
+
+class FileSink:
+    """Writes event text to a file, buffer_lines lines per write."""
+
+    def __init__(self, filename: str, buffer_lines: int = DEFAULT_FILE_BUFFER):
+        self.filename = filename
+        self.buffer_lines = buffer_lines
+        self._file = open_text_stream(filename)
+        self._lines: List[str] = []
+
+    def __call__(self, event):
+        self._lines.append(event.format())
+        if len(self._lines) >= self.buffer_lines:
+            self.flush()
+
+    def flush(self):
+        if self._lines:
+            self._file.write('\n'.join(self._lines) + '\n')
+            self._lines = []
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+
+class RingSink:
+    """Keeps the last capacity events."""
+
+    def __init__(self, capacity: int = DEFAULT_RING):
+        self.events = deque(maxlen=capacity)
+
+    def __call__(self, event):
+        self.events.append(event)
+
+    def of(self, kind: Type) -> List:
+        """Retained events of one type."""
+        return [e for e in self.events if type(e) is kind]
+
+
+class EventBus:
+    """
+    Routes published events to the sinks subscribed to their type.
+
+    False while nothing is subscribed, which is what publishing sites
+    test before building an event.
+    """
+
+    def __init__(self, sinks: Iterable[Sink] = ()):
+        self._routes: Dict[Type, List[Sink]] = {kind: [] for kind in EVENT_TYPES}
+        self._sinks: List[Sink] = []
+        for sink in sinks:
+            self.subscribe(sink)
+
+    def __bool__(self) -> bool:
+        return bool(self._sinks)
+
+    @property
+    def sinks(self) -> List[Sink]:
+        return list(self._sinks)
+
+    def subscribe(self, sink: Sink, kinds: Optional[Sequence[Type]] = None) -> Sink:
+        """Deliver events of kinds (default: every type) to sink; returns sink."""
+        for kind in kinds or EVENT_TYPES:
+            self._routes.setdefault(kind, []).append(sink)
+        self._sinks.append(sink)
+        return sink
+
+    def unsubscribe(self, sink: Sink):
+        for routed in self._routes.values():
+            while sink in routed:
+                routed.remove(sink)
+        while sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def publish(self, event):
+        for sink in self._routes.get(type(event), ()):
+            sink(event)
+
+    def close(self):
+        """Flush and close sinks that hold files."""
+        for sink in self._sinks:
+            close = getattr(sink, 'close', None)
+            if close is not None:
+                close()
+
+
+SINK_CHOICES = ('console', 'file:PATH', 'ring:N', 'none')
+
+
+def parse_sink(spec: str) -> Optional[Sink]:
+    """A sink from its command-line form (None for 'none')."""
+    kind, _, arg = spec.partition(':')
+    if kind == 'console' and not arg:
+        return ConsoleSink()
+    if kind == 'file' and arg:
+        return FileSink(arg)
+    if kind == 'ring' and (not arg or arg.isdigit()):
+        return RingSink(int(arg) if arg else DEFAULT_RING)
+    if kind == 'none' and not arg:
+        return None
+    raise ValueError(f"Unknown event sink '{spec}' (choose {'|'.join(SINK_CHOICES)})")
+
+
+def bus_from_specs(specs: Iterable[str]) -> EventBus:
+    """An EventBus with one sink per spec ('none' adds nothing)."""
+    return EventBus(sink for sink in map(parse_sink, specs) if sink is not None)
@@ -0,0 +1,99 @@
+"""
+TRTS Event Index
+Keyed lookup and per-tick counts over emission / Ψ / κ event logs.
+
+Analysis scripts join event lists on (tick, microtick) (a ρ emission to
+the Ψ/κ entry on the next μ microtick) and count events over tick
+ranges. Scanning the other list for every event is O(E·K); an
+EventIndex hashes the events once, so each join lookup is O(1), and
+keeps per-tick prefix sums, so a tick-range count is two array reads
+however long the history.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Key = Tuple[int, int]
+
+
+class EventIndex:
+    """
+    Events (dicts) indexed by (tick, microtick), with per-tick counts.
+
+    Events are kept in insertion order under their key; get() returns
+    the first event at a key, as a linear scan for the first match would.
+    """
+
+    def __init__(self, events: Iterable[Dict] = (), tick: str = 'tick',
+                 microtick: str = 'microtick'):
+        self.tick_field = tick
+        self.microtick_field = microtick
+        self._by_key: Dict[Key, List[Dict]] = {}
+        self._tick_counts: Dict[int, int] = {}
+        self._total = 0
+        self._prefix: Optional[List[int]] = None
+        self._first_tick = 0
+        self.extend(events)
+
+    def add(self, event: Dict):
+        tick = event[self.tick_field]
+        key = (tick, event[self.microtick_field])
+        bucket = self._by_key.get(key)
+        if bucket is None:
+            self._by_key[key] = [event]
+        else:
+            bucket.append(event)
+        self._tick_counts[tick] = self._tick_counts.get(tick, 0) + 1
+        self._total += 1
+        self._prefix = None
+
+    def extend(self, events: Iterable[Dict]):
+        for event in events:
+            self.add(event)
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __contains__(self, key: Key) -> bool:
+        return key in self._by_key
+
+    def get(self, tick: int, microtick: int, default: Any = None) -> Any:
+        """First event at (tick, microtick), or default."""
+        bucket = self._by_key.get((tick, microtick))
+        return bucket[0] if bucket else default
+
+    def at(self, tick: int, microtick: int) -> List[Dict]:
+        """All events at (tick, microtick), in insertion order."""
+        return self._by_key.get((tick, microtick), [])
+
+    def count_tick(self, tick: int) -> int:
+        return self._tick_counts.get(tick, 0)
+
+    def counts_by_tick(self) -> Dict[int, int]:
+        return dict(self._tick_counts)
+
+    def _build_prefix(self):
+        """prefix[i] = number of events with tick < first_tick + i."""
+        if not self._tick_counts:
+            self._first_tick, self._prefix = 0, [0]
+            return
+        first, last = min(self._tick_counts), max(self._tick_counts)
+        prefix = [0] * (last - first + 2)
+        running = 0
+        counts = self._tick_counts
+        for i in range(last - first + 1):
+            running += counts.get(first + i, 0)
+            prefix[i + 1] = running
+        self._first_tick, self._prefix = first, prefix
+
+    def count_range(self, start: Optional[int] = None, stop: Optional[int] = None) -> int:
+        """Events with start <= tick < stop (an omitted bound is open)."""
+        if self._prefix is None:
+            self._build_prefix()
+        prefix, first = self._prefix, self._first_tick
+
+        def position(tick: Optional[int], default: int) -> int:
+            if tick is None:
+                return default
+            return min(max(tick - first, 0), len(prefix) - 1)
+
+        return prefix[position(stop, len(prefix) - 1)] - prefix[position(start, 0)]
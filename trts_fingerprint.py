@@ -0,0 +1,172 @@
+"""
+TRTS Rolling Fingerprints
+One 64-bit digest per step, chained over the whole run.
+
+The engines store υ, β, κ differently (sympy, Fraction, raw unreduced
+pairs, boost::rational), so the fingerprint is taken over a canonical
+form: each value reduced by its gcd with a positive denominator, and
+each integer written as a sign byte, a 4-byte little-endian length and
+its little-endian magnitude bytes. A step's digest is
+
+    H(data) = crc32(data) << 32 | adler32(data)     (zlib definitions)
+
+over the previous rolling value (8 bytes, little-endian) followed by
+the canonical state, so the value after step n identifies steps 1..n.
+Two runs that agree up to step n have equal logs up to n and differ
+everywhere after their first divergence, which is what makes the
+first divergent step a binary search (first_divergence). The C++
+trts_cli prints the same values with --fingerprint.
+"""
+
+import struct
+import sys
+import zlib
+from array import array
+from math import gcd
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+Pair = Tuple[int, int]
+
+_LEN = struct.Struct('<I')
+_PREVIOUS = struct.Struct('<Q')
+
+
+def canonical_pair(num: int, den: int) -> Pair:
+    """(num, den) reduced, with a non-negative denominator."""
+    num, den = int(num), int(den)
+    g = gcd(num, den)
+    if g > 1:
+        num //= g
+        den //= g
+    if den < 0:
+        num, den = -num, -den
+    return num, den
+
+
+def _encode(value: int, out: bytearray):
+    magnitude = abs(value)
+    raw = magnitude.to_bytes((magnitude.bit_length() + 7) // 8, 'little')
+    out.append(1 if value < 0 else 0)
+    out += _LEN.pack(len(raw))
+    out += raw
+
+
+def canonical_bytes(*pairs: Sequence[int]) -> bytes:
+    """Canonical encoding of (numerator, denominator) pairs, in order."""
+    out = bytearray()
+    for num, den in pairs:
+        num, den = canonical_pair(num, den)
+        _encode(num, out)
+        _encode(den, out)
+    return bytes(out)
+
+
+def digest(data: bytes) -> int:
+    """64-bit digest: zlib CRC-32 in the high word, Adler-32 in the low."""
+    return (zlib.crc32(data) << 32) | zlib.adler32(data)
+
+
+def roll(previous: int, upsilon: Pair, beta: Pair, koppa: Pair = (0, 1)) -> int:
+    """The rolling value after a step ending in (υ, β, κ)."""
+    return digest(_PREVIOUS.pack(previous) + canonical_bytes(upsilon, beta, koppa))
+
+
+def state_fingerprint(upsilon: Pair, beta: Pair, koppa: Pair = (0, 1)) -> int:
+    """Digest of one state on its own (no chaining), for microtick comparisons."""
+    return roll(0, upsilon, beta, koppa)
+
+
+class FingerprintLog:
+    """
+    The rolling fingerprint after every completed step.
+
+    values[n - 1] is the value after step n (steps count from 1 here,
+    whatever the engine's own step numbering).
+    """
+
+    def __init__(self, values: Iterable[int] = ()):
+        self.values = array('Q', values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def value(self) -> int:
+        """Current rolling value (0 before the first step)."""
+        return self.values[-1] if self.values else 0
+
+    def update(self, upsilon: Pair, beta: Pair, koppa: Pair = (0, 1)) -> int:
+        value = roll(self.value, upsilon, beta, koppa)
+        self.values.append(value)
+        return value
+
+    def to_bytes(self) -> bytes:
+        """Raw little-endian values (checkpoint field)."""
+        values = array('Q', self.values)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> 'FingerprintLog':
+        values = array('Q')
+        values.frombytes(raw)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return cls(values)
+
+    def save(self, path: str):
+        """Write one 'step value' line per step (value as 16 hex digits)."""
+        with open(path, 'w') as f:
+            for step, value in enumerate(self.values, 1):
+                f.write(f"{step} {value:016x}\n")
+
+    @classmethod
+    def load(cls, path: str) -> 'FingerprintLog':
+        """
+        Read a log written by save() or by an engine's fingerprint output.
+
+        Lines are 'STEP HEX', optionally prefixed by 'FP' (the C++ CLI's
+        stdout format); any other line is ignored, so a whole console
+        transcript can be loaded. Steps must run 1, 2, 3, ...
+        """
+        log = cls()
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if fields and fields[0] == 'FP':
+                    fields = fields[1:]
+                if len(fields) != 2 or not fields[0].isdigit():
+                    continue
+                step = int(fields[0])
+                if step != len(log) + 1:
+                    raise ValueError(f"{path}: expected step {len(log) + 1}, found {step}")
+                log.values.append(int(fields[1], 16))
+        return log
+
+
+def first_divergence(a: Sequence[int], b: Sequence[int]) -> Optional[int]:
+    """
+    First step (from 1) whose rolling values differ, or None.
+
+    Rolling values differ at every step after the first divergence, so
+    this is a binary search: O(log N) comparisons. When one log is a
+    prefix of the other the answer is None (no divergence over the
+    common steps).
+    """
+    lo, hi = 0, min(len(a), len(b))
+    if hi == 0 or a[hi - 1] == b[hi - 1]:
+        return None
+    # Invariant: logs agree on the first lo steps and differ at step hi
+    while lo + 1 < hi:
+        mid = (lo + hi) // 2
+        if a[mid - 1] == b[mid - 1]:
+            lo = mid
+        else:
+            hi = mid
+    return hi
+
+
+def mismatched_operands(a: List[Pair], b: List[Pair], names=('upsilon', 'beta', 'koppa')) -> List[str]:
+    """Names of the operands whose canonical values differ."""
+    return [name for name, x, y in zip(names, a, b) if canonical_pair(*x) != canonical_pair(*y)]
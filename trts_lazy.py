@@ -0,0 +1,46 @@
+"""
+TRTS Lazy Imports
+Module placeholders that import the real module on first attribute use.
+
+The engines and their CLIs only need the standard library; plotting,
+numpy/pandas summaries and sympy are needed by some code paths only.
+Binding such a module with
+
+    plt = lazy_import('matplotlib.pyplot')
+
+keeps the usual `plt.plot(...)` spelling while a run that never plots
+never pays for (or requires) matplotlib.
+"""
+
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """Stands in for a module until one of its attributes is needed."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__['_loaded'] = None
+
+    def _load(self) -> types.ModuleType:
+        module = self.__dict__['_loaded']
+        if module is None:
+            module = importlib.import_module(self.__name__)
+            self.__dict__['_loaded'] = module
+            # Later lookups hit the copied attributes directly
+            self.__dict__.update(module.__dict__)
+        return module
+
+    def __getattr__(self, attr: str):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name: str) -> types.ModuleType:
+    """The module itself if already imported, else a LazyModule for it."""
+    module = sys.modules.get(name)
+    return module if module is not None else LazyModule(name)
@@ -0,0 +1,325 @@
+"""
+TRTS Live Telemetry
+Opt-in JSON status endpoint for running engines, and a watcher for many.
+
+An engine started with --telemetry ADDR serves its status on ADDR: a
+local TCP port ('8765', '127.0.0.1:8765'; port 0 picks a free one) or a
+Unix socket (any address containing '/', or 'unix:PATH'). '{pid}' in
+the address is replaced by the process id, so one command line can
+launch many workers:
+
+    python FIAT_LUX/AFTER_LUX/trtsd.py --ticks 1000000 --telemetry /tmp/trts-{pid}.sock
+    python trts_live.py watch /tmp/trts-*.sock
+
+The server runs an asyncio loop on a daemon thread. Every interval it
+samples the engine (a handful of attribute reads, see engine_probe)
+and pushes one JSON line to each connected client: current step and
+microtick, steps/sec since the previous sample, operand bit-lengths,
+ρ emissions per microtick and process RSS. The propagation thread does
+no telemetry work of its own beyond a counter bump per emission;
+clients that stop reading are dropped rather than buffered. On stop()
+a last sample with the final status is sent before the sockets close.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from trts_telemetry import current_rss_mb
+
+DEFAULT_INTERVAL = 1.0
+MAX_BACKLOG = 1 << 20  # bytes queued for a client before it is dropped
+
+Probe = Callable[[], Dict]
+
+
+def parse_address(address: str) -> Tuple[str, str, int]:
+    """('unix', path, 0) or ('tcp', host, port); '{pid}' is expanded."""
+    address = address.replace('{pid}', str(os.getpid()))
+    if address.startswith('unix:'):
+        return 'unix', address[len('unix:'):], 0
+    if '/' in address:
+        return 'unix', address, 0
+    host, sep, port = address.rpartition(':')
+    try:
+        return 'tcp', (host if sep and host else '127.0.0.1'), int(port)
+    except ValueError:
+        raise ValueError(f"Bad telemetry address '{address}' (PORT, HOST:PORT or a socket path)") from None
+
+
+def _pair(value) -> Optional[Tuple[int, int]]:
+    num = getattr(value, 'numerator', None)
+    if num is None:
+        return None
+    return int(num), int(value.denominator)
+
+
+def engine_probe(engine) -> Probe:
+    """
+    Status sampler for any engine with step_count / microtick / υ, β, κ.
+
+    steps is steps_completed where the engine keeps it (trtsd), else
+    step_count. Operands that are not single rationals (trtscore's κ
+    ledger) are left out of the bit-lengths.
+    """
+    def probe() -> Dict:
+        status = {
+            'step': engine.step_count,
+            'steps': getattr(engine, 'steps_completed', engine.step_count),
+            'microtick': engine.microtick,
+        }
+        bits = {}
+        for name in ('upsilon', 'beta', 'koppa'):
+            pair = _pair(getattr(engine, name, None))
+            if pair is not None:
+                bits[name] = max(pair[0].bit_length(), pair[1].bit_length())
+        status['bits'] = bits
+        counts = getattr(engine, 'emissions_by_microtick', None)
+        if counts is not None:
+            status['emissions'] = {str(mt): n for mt, n in enumerate(counts) if n}
+        if getattr(engine, 'status', None):
+            status['status'] = engine.status
+        return status
+    return probe
+
+
+class TelemetryServer:
+    """Publishes probe() samples as JSON lines on a socket, from a background thread."""
+
+    def __init__(self, probe: Probe, address: str, interval: float = DEFAULT_INTERVAL,
+                 name: Optional[str] = None):
+        self.probe = probe
+        self.kind, self.host, self.port = parse_address(address)
+        self.interval = interval
+        self.name = name or os.path.basename(sys.argv[0] or 'trts')
+        self.address = None
+        self._clients = set()
+        self._latest = b''
+        self._loop = None
+        self._thread = None
+        self._error = None
+        self._started = time.monotonic()
+        self._last_sample = None
+
+    def start(self) -> str:
+        """Open the socket and start publishing; returns the bound address."""
+        ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(ready,),
+                                        name='trts-telemetry', daemon=True)
+        self._thread.start()
+        ready.wait()
+        if self._error is not None:
+            self._thread.join()
+            raise self._error
+        return self.address
+
+    def stop(self, status: Optional[str] = None):
+        """Send a last sample (with status, if given) and close every connection."""
+        if self._loop is None:
+            return
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(status), self._loop)
+        try:
+            future.result(timeout=5)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def sample(self) -> Dict:
+        """One status record: the probe's fields plus rate, RSS and identity."""
+        now = time.monotonic()
+        try:
+            status = self.probe()
+        except Exception as e:  # state read mid-update; report and carry on
+            status = {'error': repr(e)}
+        steps = status.get('steps')
+        rate = 0.0
+        if self._last_sample is not None and steps is not None:
+            last_time, last_steps = self._last_sample
+            if now > last_time:
+                rate = (steps - last_steps) / (now - last_time)
+        if steps is not None:
+            self._last_sample = (now, steps)
+        status.update({
+            'name': self.name,
+            'pid': os.getpid(),
+            'uptime': round(now - self._started, 3),
+            'steps_per_sec': round(rate, 3),
+            'rss_mb': round(current_rss_mb(), 1),
+        })
+        return status
+
+    def _run(self, ready: threading.Event):
+        loop = asyncio.new_event_loop()
+        try:
+            server = loop.run_until_complete(self._open())
+        except OSError as e:
+            self._error = e
+            loop.close()
+            ready.set()
+            return
+        self._loop = loop
+        publisher = loop.create_task(self._publish_loop())
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            publisher.cancel()
+            server.close()
+            loop.run_until_complete(asyncio.gather(publisher, return_exceptions=True))
+            loop.close()
+            if self.kind == 'unix':
+                try:
+                    os.unlink(self.host)
+                except OSError:
+                    pass
+
+    async def _open(self):
+        if self.kind == 'unix':
+            if os.path.exists(self.host):
+                os.unlink(self.host)  # stale socket from a previous run
+            server = await asyncio.start_unix_server(self._serve, path=self.host)
+            self.address = self.host
+        else:
+            server = await asyncio.start_server(self._serve, self.host, self.port)
+            host, port = server.sockets[0].getsockname()[:2]
+            self.address = f"{host}:{port}"
+        return server
+
+    async def _publish_loop(self):
+        while True:
+            self._publish(self.sample())
+            await asyncio.sleep(self.interval)
+
+    def _publish(self, status: Dict):
+        self._latest = (json.dumps(status) + '\n').encode()
+        for writer in list(self._clients):
+            if writer.transport.get_write_buffer_size() > MAX_BACKLOG:
+                self._clients.discard(writer)
+                writer.close()
+            else:
+                writer.write(self._latest)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._clients.add(writer)
+        if self._latest:
+            writer.write(self._latest)
+        try:
+            while await reader.read(1024):
+                pass  # clients only listen; anything they send is ignored
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            writer.close()
+
+    async def _shutdown(self, status: Optional[str]):
+        final = self.sample()
+        final['final'] = True
+        if status:
+            final['status'] = status
+        self._publish(final)
+        for writer in list(self._clients):
+            try:
+                await asyncio.wait_for(writer.drain(), timeout=1)
+            except (ConnectionError, asyncio.TimeoutError):
+                pass
+            writer.close()
+        self._clients.clear()
+
+
+def serve_engine(engine, address: str, interval: float = DEFAULT_INTERVAL) -> TelemetryServer:
+    """Start publishing engine's status on address (announced on stderr)."""
+    server = TelemetryServer(engine_probe(engine), address, interval)
+    print(f"Telemetry on {server.start()}", file=sys.stderr)
+    return server
+
+
+def format_status(status: Dict) -> str:
+    bits = ' '.join(f"{name}={n}" for name, n in status.get('bits', {}).items())
+    emissions = ' '.join(f"mt{mt}:{n}" for mt, n in status.get('emissions', {}).items())
+    line = (f"step {status.get('step')} mt{status.get('microtick')} "
+            f"{status.get('steps_per_sec', 0):.1f} steps/s  bits {bits or '-'}  "
+            f"emissions {emissions or '-'}  rss {status.get('rss_mb', 0):.0f}MB")
+    if status.get('status'):
+        line += f"  [{status['status']}]"
+    if status.get('error'):
+        line += f"  error {status['error']}"
+    return line
+
+
+async def _watch_one(address: str, raw: bool, once: bool, retry: float):
+    kind, host, port = parse_address(address)
+    while True:
+        try:
+            if kind == 'unix':
+                reader, writer = await asyncio.open_unix_connection(host)
+            else:
+                reader, writer = await asyncio.open_connection(host, port)
+            break
+        except OSError as e:
+            if not retry:
+                print(f"[{address}] {e}", file=sys.stderr)
+                return
+            await asyncio.sleep(retry)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if raw:
+                status = json.loads(line)
+                print(json.dumps({'address': address, **status}), flush=True)
+            else:
+                print(f"[{address}] {format_status(json.loads(line))}", flush=True)
+            if once:
+                break
+    finally:
+        writer.close()
+    if not once:
+        print(f"[{address}] closed", file=sys.stderr)
+
+
+async def watch(addresses: Sequence[str], raw: bool = False, once: bool = False,
+                retry: float = 0.0):
+    """Follow every address concurrently until all of them close."""
+    await asyncio.gather(*(_watch_one(a, raw, once, retry) for a in addresses))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Watch TRTS engines started with --telemetry')
+    sub = parser.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('watch', help='Follow one or more telemetry endpoints')
+    p.add_argument('addresses', nargs='+', help='PORT, HOST:PORT or socket paths')
+    p.add_argument('--json', action='store_true', help='Print raw JSON lines (with an address field)')
+    p.add_argument('--once', action='store_true', help='Print one sample per endpoint and exit')
+    p.add_argument('--retry', type=float, default=0.0,
+                   help='Keep retrying unreachable endpoints every this many seconds')
+    args = parser.parse_args(argv)
+
+    try:
+        for address in args.addresses:
+            parse_address(address)
+    except ValueError as e:
+        parser.error(str(e))
+    try:
+        asyncio.run(watch(args.addresses, args.json, args.once, args.retry))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,187 @@
+"""
+TRTS Exact Monitors
+Predicates on engine state, evaluated with integer arithmetic only.
+
+Each monitor sees the raw (numerator, denominator) pairs of υ, β and κ
+and answers by cross-multiplication, so no operand is ever converted
+to a float however large it grows:
+
+- RatioWindow: υ/β inside [low, high] (or the open interval)
+- SquareNear:  |(υ/β)² - target| <= eps
+- BitLength:   some operand longer than max_bits
+
+A MonitorSet evaluates its monitors at a granularity ('microtick',
+'step' = end of step, 'every:N' = end of every Nth step) and tells the
+engine whether a stopping monitor fired.
+"""
+
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+Pair = Tuple[int, int]
+
+
+def _ratio(upsilon: Pair, beta: Pair) -> Optional[Pair]:
+    """υ/β as (P, Q) with Q > 0, or None when β = 0."""
+    p = upsilon[0] * beta[1]
+    q = upsilon[1] * beta[0]
+    if q == 0:
+        return None
+    return (-p, -q) if q < 0 else (p, q)
+
+
+class Monitor:
+    """A named predicate; stop=True ends the run the first time it holds."""
+
+    def __init__(self, name: str, stop: bool = False):
+        self.name = name
+        self.stop = stop
+        self.first_hit: Optional[Tuple[int, int]] = None
+        self.hits = 0
+
+    def test(self, upsilon: Pair, beta: Pair, koppa: Pair) -> bool:
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.name!r}{', stop' if self.stop else ''})"
+
+
+class RatioWindow(Monitor):
+    """υ/β within [low, high]; inclusive=False makes it the open interval."""
+
+    def __init__(self, name: str, low, high, inclusive: bool = True, stop: bool = False):
+        super().__init__(name, stop)
+        self.low = Fraction(low)
+        self.high = Fraction(high)
+        self.inclusive = inclusive
+
+    def test(self, upsilon, beta, koppa) -> bool:
+        ratio = _ratio(upsilon, beta)
+        if ratio is None:
+            return False
+        p, q = ratio
+        above = p * self.low.denominator - self.low.numerator * q
+        below = self.high.numerator * q - p * self.high.denominator
+        if self.inclusive:
+            return above >= 0 and below >= 0
+        return above > 0 and below > 0
+
+
+class SquareNear(Monitor):
+    """|(υ/β)² - target| <= eps, as |P²·t_d·e_d - t_n·e_d·Q²| <= e_n·t_d·Q²."""
+
+    def __init__(self, name: str, target=2, eps='1e-6', stop: bool = False):
+        super().__init__(name, stop)
+        self.target = Fraction(target)
+        self.eps = Fraction(eps)
+
+    def test(self, upsilon, beta, koppa) -> bool:
+        ratio = _ratio(upsilon, beta)
+        if ratio is None:
+            return False
+        p, q = ratio
+        t, e = self.target, self.eps
+        q2 = q * q
+        gap = p * p * t.denominator * e.denominator - t.numerator * e.denominator * q2
+        return abs(gap) <= e.numerator * t.denominator * q2
+
+
+class BitLength(Monitor):
+    """Some numerator or denominator of υ, β, κ is longer than max_bits."""
+
+    def __init__(self, name: str, max_bits: int, stop: bool = True):
+        super().__init__(name, stop)
+        self.max_bits = max_bits
+
+    def test(self, upsilon, beta, koppa) -> bool:
+        limit = self.max_bits
+        return any(abs(v).bit_length() > limit for pair in (upsilon, beta, koppa) for v in pair)
+
+
+def parse_monitor(spec: str, stop: bool = False) -> Monitor:
+    """
+    Build a monitor from 'ratio=LOW:HIGH', 'square=TARGET:EPS' or 'bits=B'.
+
+    Bounds are read exactly (decimals included) with Fraction.
+    """
+    kind, sep, args = spec.partition('=')
+    kind = kind.strip().lower()
+    parts = [part.strip() for part in args.split(':')]
+    try:
+        if kind == 'ratio' and len(parts) == 2:
+            return RatioWindow(spec, parts[0], parts[1], stop=stop)
+        if kind == 'square' and len(parts) == 2:
+            return SquareNear(spec, parts[0], parts[1], stop=stop)
+        if kind == 'bits' and len(parts) == 1:
+            return BitLength(spec, int(parts[0]), stop=stop)
+    except (ValueError, ZeroDivisionError):
+        pass
+    raise ValueError(f"Bad monitor '{spec}' (ratio=LOW:HIGH, square=TARGET:EPS or bits=B)")
+
+
+class MonitorSet:
+    """
+    The monitors registered on one engine, with their evaluation granularity.
+
+    check() runs them on a state and returns those that held (also kept
+    in last_fired); the first stopping monitor to hold is kept in
+    stopped_by.
+    """
+
+    GRANULARITIES = ('microtick', 'step', 'every:N')
+
+    def __init__(self, every: str = 'step'):
+        self.monitors: List[Monitor] = []
+        self.set_granularity(every)
+        self.stopped_by: Optional[Monitor] = None
+        self.last_fired: List[Monitor] = []
+
+    def set_granularity(self, every: str):
+        kind, _, arg = every.partition(':')
+        if kind == 'every' and arg.isdigit() and int(arg) >= 1:
+            self.every, self.interval = 'step', int(arg)
+        elif kind in ('microtick', 'step') and not arg:
+            self.every, self.interval = kind, 1
+        else:
+            raise ValueError(f"Bad monitor granularity '{every}' "
+                             f"(choose {'|'.join(self.GRANULARITIES)})")
+        self.spec = every
+
+    def __bool__(self) -> bool:
+        return bool(self.monitors)
+
+    def add(self, monitor: Monitor) -> Monitor:
+        self.monitors.append(monitor)
+        return monitor
+
+    def due(self, step: int, microtick: int) -> bool:
+        """Whether (step, microtick) is an evaluation point (steps count from 0)."""
+        if self.every == 'microtick':
+            return True
+        return microtick == 11 and (step + 1) % self.interval == 0
+
+    def check(self, step: int, microtick: int,
+              upsilon: Pair, beta: Pair, koppa: Pair = (0, 1)) -> List[Monitor]:
+        fired = []
+        for monitor in self.monitors:
+            if monitor.test(upsilon, beta, koppa):
+                monitor.hits += 1
+                if monitor.first_hit is None:
+                    monitor.first_hit = (step, microtick)
+                fired.append(monitor)
+                if monitor.stop and self.stopped_by is None:
+                    self.stopped_by = monitor
+        self.last_fired = fired
+        return fired
+
+    def summary(self) -> Dict[str, Dict]:
+        return {m.name: {'hits': m.hits, 'first_hit': m.first_hit, 'stop': m.stop}
+                for m in self.monitors}
+
+    def format_summary(self) -> str:
+        lines = []
+        for m in self.monitors:
+            where = (f"first at step {m.first_hit[0]} mt{m.first_hit[1]}"
+                     if m.first_hit else 'never')
+            lines.append(f"Monitor {m.name}{' (stop)' if m.stop else ''}: {m.hits} hits, {where}")
+        return '\n'.join(lines)
@@ -0,0 +1,207 @@
+"""
+TRTS Prime Trigger Service
+One primality / ρ-trigger check shared by every engine.
+
+Layers, cheapest first:
+1. Configured trigger sets (e.g. Fibonacci primes): frozenset lookup,
+   with a magnitude cut-off so huge operands are never hashed.
+2. Sieve of Eratosthenes for n < SIEVE_LIMIT.
+3. Mod-30 wheel trial division by small factors.
+4. Deterministic Miller-Rabin for n < 2^64.
+5. Baillie-PSW (strong base-2 + strong Lucas) above 2^64
+   (gmpy2's implementation is used when installed).
+
+Layers 3-5 are memoized in a bounded LRU keyed by the integer.
+"""
+
+import math
+from functools import lru_cache
+from typing import Iterable, Optional
+
+try:
+    import gmpy2
+except ImportError:
+    gmpy2 = None
+
+SIEVE_LIMIT = 1 << 16
+TRIAL_LIMIT = 1000
+CACHE_SIZE = 1 << 16
+
+# Witnesses that make Miller-Rabin deterministic for every n < 2^64
+MR_WITNESSES_64 = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# Offsets of the residues coprime to 30, starting from 7
+WHEEL_30 = (4, 2, 4, 2, 4, 6, 2, 6)
+
+
+def _build_sieve(limit: int) -> bytearray:
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for p in range(2, math.isqrt(limit - 1) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit, p)))
+    return sieve
+
+
+_SIEVE = _build_sieve(SIEVE_LIMIT)
+
+
+def _wheel_factor(n: int) -> bool:
+    """True if n has a factor in [2, TRIAL_LIMIT] (n is assumed > TRIAL_LIMIT)."""
+    if n % 2 == 0 or n % 3 == 0 or n % 5 == 0:
+        return True
+    f = 7
+    while f <= TRIAL_LIMIT:
+        for step in WHEEL_30:
+            if n % f == 0:
+                return True
+            f += step
+    return False
+
+
+def _strong_probable_prime(n: int, a: int) -> bool:
+    """Strong Fermat test of odd n > 2 to base a."""
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    x = pow(a, d, n)
+    if x == 1 or x == n - 1:
+        return True
+    for _ in range(s - 1):
+        x = x * x % n
+        if x == n - 1:
+            return True
+    return False
+
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0."""
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _strong_lucas_probable_prime(n: int) -> bool:
+    """Strong Lucas test with Selfridge's parameters (odd, non-square n)."""
+    if math.isqrt(n) ** 2 == n:
+        return False
+
+    D = 5
+    while True:
+        j = _jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+
+    d, s = n + 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    # Binary ladder for U_d, V_d and Q^d (mod n)
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U = U * V % n
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == '1':
+            U, V = P * U + V, D * U + P * V
+            U = ((U + n) if U & 1 else U) // 2 % n
+            V = ((V + n) if V & 1 else V) // 2 % n
+            Qk = Qk * Q % n
+
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        if V == 0:
+            return True
+        Qk = Qk * Qk % n
+    return False
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _is_prime_large(n: int) -> bool:
+    """Primality of n >= SIEVE_LIMIT (memoized)."""
+    if _wheel_factor(n):
+        return False
+    if n < 1 << 64:
+        return all(_strong_probable_prime(n, a) for a in MR_WITNESSES_64)
+    if gmpy2 is not None:
+        return bool(gmpy2.is_strong_bpsw_prp(n))
+    return _strong_probable_prime(n, 2) and _strong_lucas_probable_prime(n)
+
+
+def is_prime(n) -> bool:
+    """Primality of an integer (exact below 2^64, BPSW above). Negative -> False."""
+    n = int(n)
+    if n < SIEVE_LIMIT:
+        return n >= 0 and _SIEVE[n] == 1
+    return _is_prime_large(n)
+
+
+_SIEVE_ARRAY = None
+
+
+def prime_mask(values):
+    """
+    Vectorized is_prime over a 1-D NumPy array (int64 or object dtype).
+
+    Values below SIEVE_LIMIT are one sieve gather; only the rest go
+    through is_prime one at a time. Negative values are not prime.
+    """
+    import numpy as np
+    global _SIEVE_ARRAY
+    if _SIEVE_ARRAY is None:
+        _SIEVE_ARRAY = np.frombuffer(bytes(_SIEVE), dtype=np.uint8).astype(bool)
+
+    values = np.asarray(values)
+    small = ((values >= 0) & (values < SIEVE_LIMIT)).astype(bool)
+    mask = np.zeros(len(values), dtype=bool)
+    mask[small] = _SIEVE_ARRAY[values[small].astype(np.int64)]
+    for i in np.flatnonzero(values >= SIEVE_LIMIT):
+        mask[i] = _is_prime_large(int(values[i]))
+    return mask
+
+
+class PrimeTrigger:
+    """
+    ρ-trigger check on abs(n).
+
+    With trigger_set, fires only for members of the set (the engines'
+    Fibonacci-prime lists); without one, fires for any prime.
+    """
+
+    def __init__(self, trigger_set: Optional[Iterable[int]] = None):
+        if trigger_set is None:
+            self.members = None
+        else:
+            self.members = frozenset(abs(int(p)) for p in trigger_set)
+            self._largest = max(self.members, default=0)
+
+    def __call__(self, n) -> bool:
+        abs_val = abs(n)
+        if abs_val <= 1:
+            return False
+        if self.members is None:
+            return is_prime(abs_val)
+        # Skip hashing operands larger than any member
+        return abs_val <= self._largest and abs_val in self.members
+
+
+def cache_info():
+    """LRU statistics for the memoized large-n path."""
+    return _is_prime_large.cache_info()
@@ -0,0 +1,443 @@
+"""
+TRTS Trace Query
+Filter stored .trts traces through per-column indexes.
+
+    python trts_query.py run.trts --steps 10000:20000 --mt 7 --rho-prime 13 --emissions
+    python trts_query.py run.trts --bits 'koppa_den>4096' --format jsonl
+
+The first query on a trace writes an index next to it (run.trts.idx,
+rebuilt whenever the trace changes):
+
+- posting lists (sorted row numbers) per microtick, per ρ-prime and for
+  the emission rows
+- a zone map per block of BLOCK_ROWS rows: the min and max bit-length
+  of each of the six operands
+
+A query restricts the step range with the trace's own step index, walks
+the smallest posting list that applies (bisected to that range) or,
+for bit-length filters alone, only the blocks whose zone map admits a
+match, and checks the remaining filters on the fixed-width records.
+Matches are decoded and written one at a time, as CSV (the trtsd
+layout) or JSON lines, so memory stays flat however many rows match.
+
+A bit-length filter OPERAND>B holds when |OPERAND| >= 2^B (its
+bit-length exceeds B); OPERAND is one of the six numerator/denominator
+columns or 'any'.
+"""
+
+import argparse
+import bisect
+import csv
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from trts_checkpoint import decode_fields, encode_fields
+from trts_recorder import allow_bigint_text, open_text_stream
+from trts_tracefile import CSV_HEADERS, OPERANDS, TraceFile, TraceFileError, csv_row
+
+INDEX_MAGIC = b'TRTSIDX1'
+INDEX_SUFFIX = '.idx'
+BLOCK_ROWS = 4096
+
+_OFFSET = struct.Struct('<Q')
+_ZONE = struct.Struct('<12I')
+_READ_CHUNK = 8192
+
+_COMPARISONS = {
+    '>': lambda bits, limit: bits > limit,
+    '>=': lambda bits, limit: bits >= limit,
+    '<': lambda bits, limit: bits < limit,
+    '<=': lambda bits, limit: bits <= limit,
+    '=': lambda bits, limit: bits == limit,
+}
+
+
+class BitFilter:
+    """Bit-length predicate on one operand (or on the longest, for 'any')."""
+
+    def __init__(self, operand: str, op: str, bits: int):
+        if operand != 'any' and operand not in OPERANDS:
+            raise ValueError(f"Unknown operand '{operand}' (choose any|{'|'.join(OPERANDS)})")
+        self.operand = operand
+        self.op = op
+        self.bits = bits
+        self._compare = _COMPARISONS[op]
+        self._column = None if operand == 'any' else OPERANDS.index(operand)
+
+    @classmethod
+    def parse(cls, spec: str) -> 'BitFilter':
+        """'koppa_den>4096', 'any>=1000', 'beta_num<64', ..."""
+        for op in ('>=', '<=', '>', '<', '='):
+            operand, sep, bits = spec.partition(op)
+            if sep:
+                if not bits.strip().isdigit():
+                    break
+                return cls(operand.strip(), op, int(bits))
+        raise ValueError(f"Bad bit filter '{spec}' (OPERAND>BITS, also >=, <, <=, =)")
+
+    def test(self, bit_lengths: Sequence[int]) -> bool:
+        if self._column is None:
+            return self._compare(max(bit_lengths), self.bits)
+        return self._compare(bit_lengths[self._column], self.bits)
+
+    def admits(self, minima: Sequence[int], maxima: Sequence[int]) -> bool:
+        """Whether a block with these per-operand bit-length bounds can match."""
+        if self._column is None:
+            low, high = max(minima), max(maxima)
+        else:
+            low, high = minima[self._column], maxima[self._column]
+        op, limit = self.op, self.bits
+        if op in ('>', '>='):
+            return self._compare(high, limit)
+        if op in ('<', '<='):
+            return self._compare(low, limit)
+        return low <= limit <= high
+
+    def __repr__(self):
+        return f"{self.operand}{self.op}{self.bits}"
+
+
+class _Postings:
+    """A sorted run of row numbers inside the mapped index (bisectable)."""
+
+    def __init__(self, data, offset: int = 0, count: int = 0):
+        self._data = data
+        self._offset = offset
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i: int) -> int:
+        return _OFFSET.unpack_from(self._data, self._offset + i * 8)[0]
+
+    def span(self, rows: range) -> Tuple[int, int]:
+        """Positions of the entries inside rows."""
+        return bisect.bisect_left(self, rows.start), bisect.bisect_left(self, rows.stop)
+
+    def iter_span(self, rows: range) -> Iterator[int]:
+        lo, hi = self.span(rows)
+        for start in range(lo, hi, _READ_CHUNK):
+            stop = min(start + _READ_CHUNK, hi)
+            chunk = array('Q')
+            chunk.frombytes(self._data[self._offset + start * 8:self._offset + stop * 8])
+            if sys.byteorder == 'big':
+                chunk.byteswap()
+            yield from chunk
+
+
+def index_path(trace_path: str) -> str:
+    return trace_path + INDEX_SUFFIX
+
+
+def build_index(trace: TraceFile, path: str, block_rows: int = BLOCK_ROWS):
+    """
+    Write the posting lists and zone map of trace to path.
+
+    Posting lists are collected in memory (8 bytes per posted row)
+    while the records are scanned once.
+    """
+    postings: Dict[str, array] = {}
+
+    def post(key: str, row: int):
+        column = postings.get(key)
+        if column is None:
+            column = postings[key] = array('Q')
+        column.append(row)
+
+    zones = array('I')
+    minima = maxima = None
+    for i in range(len(trace)):
+        record = trace.record(i)
+        bits = record[5:11]
+        post(f'microtick:{record[11]}', i)
+        if record[12]:
+            post('emission', i)
+        rho_prime = trace.rho_prime(i)
+        if rho_prime:
+            post(f'rho_prime:{rho_prime}', i)
+        if i % block_rows == 0:
+            if minima is not None:
+                zones.extend(minima + maxima)
+            minima, maxima = list(bits), list(bits)
+        else:
+            for k, b in enumerate(bits):
+                if b < minima[k]:
+                    minima[k] = b
+                elif b > maxima[k]:
+                    maxima[k] = b
+    if minima is not None:
+        zones.extend(minima + maxima)
+
+    directory = {
+        'trace_rows': len(trace),
+        'trace_size': os.path.getsize(trace.filename),
+        'block_rows': block_rows,
+        'postings': {},
+    }
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(INDEX_MAGIC)
+        f.write(_OFFSET.pack(0))
+        for key, column in postings.items():
+            directory['postings'][key] = [f.tell(), len(column)]
+            if sys.byteorder == 'big':
+                column.byteswap()
+            f.write(column.tobytes())
+        directory['zones'] = [f.tell(), len(zones) // 12]
+        if sys.byteorder == 'big':
+            zones.byteswap()
+        f.write(zones.tobytes())
+        directory_offset = f.tell()
+        f.write(encode_fields(directory))
+        f.seek(len(INDEX_MAGIC))
+        f.write(_OFFSET.pack(directory_offset))
+    os.replace(tmp_path, path)
+
+
+class TraceIndex:
+    """A mapped index file; stale is True when it no longer matches its trace."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise TraceFileError(f"{path} is empty")
+        if self._map[:len(INDEX_MAGIC)] != INDEX_MAGIC:
+            self.close()
+            raise TraceFileError(f"{path} is not a TRTS trace index")
+        (directory_offset,) = _OFFSET.unpack_from(self._map, len(INDEX_MAGIC))
+        self.directory, _ = decode_fields(self._map, directory_offset)
+        self.block_rows = self.directory['block_rows']
+
+    @classmethod
+    def open(cls, trace: TraceFile, rebuild: bool = False) -> 'TraceIndex':
+        """The index of trace, (re)built first if missing, stale or rebuild is set."""
+        path = index_path(trace.filename)
+        if not rebuild and os.path.exists(path):
+            index = cls(path)
+            if index.matches(trace):
+                return index
+            index.close()
+        build_index(trace, path)
+        return cls(path)
+
+    def matches(self, trace: TraceFile) -> bool:
+        return (self.directory['trace_rows'] == len(trace) and
+                self.directory['trace_size'] == os.path.getsize(trace.filename))
+
+    def close(self):
+        if not self._file.closed:
+            self._map.close()
+            self._file.close()
+
+    def postings(self, key: str) -> _Postings:
+        entry = self.directory['postings'].get(key)
+        if entry is None:
+            return _Postings(self._map)
+        return _Postings(self._map, entry[0], entry[1])
+
+    def keys(self, kind: str) -> List[str]:
+        """Indexed values of a column ('microtick', 'rho_prime')."""
+        prefix = kind + ':'
+        return [key[len(prefix):] for key in self.directory['postings'] if key.startswith(prefix)]
+
+    def zone_rows(self, rows: range, filters: Sequence[BitFilter]) -> Iterator[int]:
+        """Rows of the blocks (within rows) whose zone map admits every filter."""
+        offset, blocks = self.directory['zones']
+        size = self.block_rows
+        for block in range(rows.start // size, min(blocks, -(-rows.stop // size))):
+            zone = _ZONE.unpack_from(self._map, offset + block * _ZONE.size)
+            minima, maxima = zone[:6], zone[6:]
+            if all(f.admits(minima, maxima) for f in filters):
+                yield from range(max(rows.start, block * size), min(rows.stop, (block + 1) * size))
+
+
+class TraceQuery:
+    """
+    Filters over one trace: step range, microticks, ρ-primes, emissions
+    and bit-lengths (all optional, combined with AND; values within one
+    filter with OR).
+    """
+
+    def __init__(self, steps: Tuple[Optional[int], Optional[int]] = (None, None),
+                 microticks: Iterable[int] = (), rho_primes: Iterable[int] = (),
+                 emissions: bool = False, bits: Iterable[BitFilter] = ()):
+        self.steps = steps
+        self.microticks = frozenset(microticks)
+        self.rho_primes = frozenset(rho_primes)
+        if 0 in self.rho_primes:
+            raise ValueError("ρ-prime 0 = no prime: only emitting rows are indexed by prime")
+        self.emissions = emissions
+        self.bits = tuple(bits)
+
+    def _sources(self, index: TraceIndex) -> Dict[str, List[_Postings]]:
+        sources = {}
+        if self.microticks:
+            sources['microtick'] = [index.postings(f'microtick:{m}') for m in sorted(self.microticks)]
+        if self.rho_primes:
+            sources['rho_prime'] = [index.postings(f'rho_prime:{p}') for p in sorted(self.rho_primes)]
+        if self.emissions:
+            sources['emission'] = [index.postings('emission')]
+        return sources
+
+    def row_numbers(self, trace: TraceFile, index: TraceIndex) -> Iterator[int]:
+        """Matching rows of trace, in order."""
+        rows = trace.row_range(*self.steps)
+        sources = self._sources(index)
+
+        # Drive the scan from the posting union with the fewest rows in range
+        driver = None
+        if sources:
+            def size(name):
+                return sum(hi - lo for lo, hi in (p.span(rows) for p in sources[name]))
+            driver = min(sources, key=size)
+            candidates = heapq.merge(*(p.iter_span(rows) for p in sources[driver]))
+        elif self.bits:
+            candidates = index.zone_rows(rows, self.bits)
+        else:
+            candidates = iter(rows)
+
+        microticks, rho_primes, bits = self.microticks, self.rho_primes, self.bits
+        for i in candidates:
+            record = trace.record(i)
+            if microticks and driver != 'microtick' and record[11] not in microticks:
+                continue
+            if self.emissions and driver != 'emission' and not record[12]:
+                continue
+            if bits and not all(f.test(record[5:11]) for f in bits):
+                continue
+            if rho_primes and driver != 'rho_prime' and trace.rho_prime(i) not in rho_primes:
+                continue
+            yield i
+
+
+def _json_row(row, trace_name: Optional[str]) -> str:
+    (u_num, u_den), (b_num, b_den), (k_num, k_den) = row.upsilon, row.beta, row.koppa
+    record = {
+        'step': row.step, 'microtick': row.microtick,
+        'upsilon_num': u_num, 'upsilon_den': u_den,
+        'beta_num': b_num, 'beta_den': b_den,
+        'koppa_num': k_num, 'koppa_den': k_den,
+        'ratio': row.ratio, 'error': row.error,
+        'rho_triggered': row.rho_triggered, 'rho_prime': row.rho_prime,
+        'imbalance_active': row.imbalance_active, 'emission_count': row.emission_count,
+    }
+    if trace_name is not None:
+        record = {'trace': trace_name, **record}
+    return json.dumps(record)
+
+
+def run_query(paths: Sequence[str], query: TraceQuery, out, fmt: str = 'csv',
+              limit: Optional[int] = None, rebuild: bool = False) -> int:
+    """Stream the matches of query over paths to out; returns the number written."""
+    named = len(paths) > 1
+    writer = csv.writer(out) if fmt == 'csv' else None
+    if writer is not None:
+        writer.writerow((['trace'] if named else []) + CSV_HEADERS)
+    written = 0
+    for path in paths:
+        with TraceFile(path) as trace:
+            index = TraceIndex.open(trace, rebuild)
+            try:
+                config = trace.config
+                target = config.get('convergence_target', 0.0)
+                modes = (config.get('psi_mode', ''), config.get('koppa_mode', ''),
+                         config.get('engine_type', ''))
+                for i in query.row_numbers(trace, index):
+                    if limit is not None and written >= limit:
+                        return written
+                    row = trace.row(i)
+                    if writer is not None:
+                        writer.writerow(([path] if named else []) + csv_row(row, target, modes))
+                    else:
+                        out.write(_json_row(row, path if named else None) + '\n')
+                    written += 1
+            finally:
+                index.close()
+    return written
+
+
+def count_matches(paths: Sequence[str], query: TraceQuery, rebuild: bool = False) -> Dict[str, int]:
+    """Matches per trace, without decoding any row."""
+    counts = {}
+    for path in paths:
+        with TraceFile(path) as trace:
+            index = TraceIndex.open(trace, rebuild)
+            try:
+                counts[path] = sum(1 for _ in query.row_numbers(trace, index))
+            finally:
+                index.close()
+    return counts
+
+
+def parse_steps(spec: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """'A:B' (B exclusive), 'A:', ':B' or a single step 'A'."""
+    if spec is None:
+        return None, None
+    start, sep, stop = spec.partition(':')
+    try:
+        if not sep:
+            return int(start), int(start) + 1
+        return (int(start) if start else None), (int(stop) if stop else None)
+    except ValueError:
+        raise ValueError(f"Bad step range '{spec}' (A:B, A:, :B or A)") from None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Query stored TRTS traces (.trts)')
+    parser.add_argument('traces', nargs='+', help='Trace files (see trts_tracefile.py)')
+    parser.add_argument('--steps', type=str, default=None,
+                        help='Step range A:B (B exclusive), A:, :B or a single step')
+    parser.add_argument('--mt', type=int, action='append', default=[],
+                        help='Microtick (repeatable: any of them)')
+    parser.add_argument('--rho-prime', type=int, action='append', default=[],
+                        help='ρ-prime value, nonzero (repeatable: any of them)')
+    parser.add_argument('--emissions', action='store_true', help='Only ρ-triggered rows')
+    parser.add_argument('--bits', type=str, action='append', default=[],
+                        help="Bit-length filter OPERAND>B, >=, <, <=, = (e.g. 'koppa_den>4096'; "
+                             "OPERAND may be 'any'; repeatable: all of them)")
+    parser.add_argument('--format', type=str, default='csv', choices=['csv', 'jsonl'],
+                        help='Output format')
+    parser.add_argument('--output', type=str, default=None,
+                        help='Write matches here (gzip/xz by extension) instead of stdout')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after this many matches')
+    parser.add_argument('--count', action='store_true', help='Only count matches per trace')
+    parser.add_argument('--reindex', action='store_true', help='Rebuild the indexes first')
+    args = parser.parse_args(argv)
+
+    try:
+        query = TraceQuery(parse_steps(args.steps), args.mt, args.rho_prime, args.emissions,
+                           [BitFilter.parse(spec) for spec in args.bits])
+    except ValueError as e:
+        parser.error(str(e))
+
+    allow_bigint_text()
+    try:
+        if args.count:
+            for path, count in count_matches(args.traces, query, args.reindex).items():
+                print(f"{path}: {count}")
+            return 0
+        if args.output:
+            with open_text_stream(args.output) as out:
+                written = run_query(args.traces, query, out, args.format, args.limit, args.reindex)
+            print(f"{written} rows written to {args.output}", file=sys.stderr)
+        else:
+            run_query(args.traces, query, sys.stdout, args.format, args.limit, args.reindex)
+    except (OSError, TraceFileError) as e:
+        print(f"trts_query: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,526 @@
+"""
+TRTS Columnar Trace Recorder
+Compact per-microtick state storage shared by the TRTS engines.
+
+Small fields live in typed array columns; the variable-length
+numerators/denominators (and ρ-prime) are appended as length-prefixed
+signed little-endian bytes to a single blob. Columns grow in fixed
+chunks instead of one Python object per record, so no Rational or
+list/dict per microtick is kept alive.
+
+With a sink attached the recorder streams: every chunk_size rows the
+batch is written out and the columns are reset, so memory stays at
+one batch no matter how long the run is.
+"""
+
+import csv
+import gzip
+import heapq
+import io
+import lzma
+import math
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_CHUNK = 65536
+
+# Operand bits kept when approximating υ/β (comfortably above a double's 53)
+RATIO_PRECISION = 64
+
+_LEN = struct.Struct('<I')
+
+# (name, array typecode)
+SCALAR_COLUMNS = (
+    ('step', 'q'),
+    ('microtick', 'b'),
+    ('rho_triggered', 'b'),
+    ('imbalance_active', 'b'),
+    ('emission_count', 'q'),
+    ('blob_offset', 'Q'),
+    ('ratio', 'd'),
+    ('error', 'd'),
+)
+
+TraceRow = namedtuple('TraceRow', [
+    'step', 'microtick', 'upsilon', 'beta', 'koppa',
+    'rho_triggered', 'rho_prime', 'imbalance_active',
+    'emission_count', 'ratio', 'error',
+])
+
+
+def encode_int(value, out: bytearray):
+    """Append a length-prefixed signed integer to out."""
+    value = int(value)
+    raw = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+    out += _LEN.pack(len(raw))
+    out += raw
+
+
+def decode_int(blob, pos: int) -> Tuple[int, int]:
+    """Read a length-prefixed signed integer at pos. Returns (value, next_pos)."""
+    (length,) = _LEN.unpack_from(blob, pos)
+    pos += _LEN.size
+    return int.from_bytes(blob[pos:pos + length], 'little', signed=True), pos + length
+
+
+def _truncate(value: int) -> Tuple[int, int]:
+    """Top RATIO_PRECISION bits of |value| as (mantissa, exponent)."""
+    value = abs(value)
+    shift = value.bit_length() - RATIO_PRECISION
+    if shift <= 0:
+        return value, 0
+    return value >> shift, shift
+
+
+def ratio_float(upsilon: Sequence[int], beta: Sequence[int]) -> float:
+    """
+    υ/β as a float from two (numerator, denominator) pairs, integers only.
+
+    Operands that fit in RATIO_PRECISION bits are cross-multiplied
+    exactly (correctly rounded, as float(υ/β)). Larger ones are cut to
+    their top RATIO_PRECISION bits first, so the cost is a shift per
+    operand rather than a full bigint product and division; the result
+    stays within an ulp. Ratios beyond the float range give ±inf (or
+    0.0) instead of OverflowError, and β = 0 gives ±inf / nan.
+    """
+    u_num, u_den = upsilon
+    b_num, b_den = beta
+    num_sign = -1 if (u_num < 0) != (b_den < 0) else 1
+    den_sign = -1 if (u_den < 0) != (b_num < 0) else 1
+    if not (u_den and b_num):
+        return num_sign * math.inf if u_num and b_den else math.nan
+    if not (u_num and b_den):
+        return 0.0
+
+    un_m, un_e = _truncate(u_num)
+    bd_m, bd_e = _truncate(b_den)
+    ud_m, ud_e = _truncate(u_den)
+    bn_m, bn_e = _truncate(b_num)
+    exponent = un_e + bd_e - ud_e - bn_e
+    magnitude = (un_m * bd_m) / (ud_m * bn_m)
+    if exponent:
+        try:
+            magnitude = math.ldexp(magnitude, exponent)
+        except OverflowError:
+            magnitude = math.inf
+    return num_sign * den_sign * magnitude
+
+
+def fraction_float(num: int, den: int) -> float:
+    """
+    num/den as a float, correctly rounded; ±inf beyond the float range
+    (as float() of a sympy Rational) instead of OverflowError.
+    """
+    try:
+        return num / den
+    except OverflowError:
+        return math.inf if (num < 0) == (den < 0) else -math.inf
+
+
+def allow_bigint_text():
+    """Lift Python's int->str digit cap so unreduced operands can be written as CSV."""
+    if hasattr(sys, 'set_int_max_str_digits'):
+        sys.set_int_max_str_digits(0)
+
+
+COMPRESSORS = {
+    None: open,
+    'gzip': gzip.open,
+    'xz': lzma.open,
+}
+
+
+def resolve_compression(filename: str, compression: Optional[str] = None) -> Optional[str]:
+    """Compression for filename; defaults from the extension (.gz -> gzip, .xz -> xz)."""
+    if compression is None:
+        if filename.endswith('.gz'):
+            compression = 'gzip'
+        elif filename.endswith('.xz'):
+            compression = 'xz'
+    if compression not in COMPRESSORS:
+        raise ValueError(f"Unknown compression '{compression}' (choose gzip or xz)")
+    return compression
+
+
+def open_text_stream(filename: str, compression: Optional[str] = None,
+                     mode: str = 'wt') -> io.TextIOBase:
+    """Open filename for text writing ('wt') or appending ('at'), compressing on the fly if requested."""
+    compression = resolve_compression(filename, compression)
+    return COMPRESSORS[compression](filename, mode, newline='')
+
+
+class RecordPolicy:
+    """
+    Which states an engine records.
+
+    microtick  every microtick (default)
+    step       the end-of-step state (microtick 11)
+    every:N    the end-of-step state of every Nth step
+    emissions  microticks with an active ρ-trigger
+    none       nothing; summaries fall back to the live engine state
+
+    Unrecorded states are still passed to TraceRecorder.skip() so emission
+    counts and emission steps cover the whole run under every policy.
+    """
+
+    CHOICES = ('microtick', 'step', 'every:N', 'emissions', 'none')
+
+    def __init__(self, spec: str = 'microtick'):
+        self.spec = spec
+        kind, _, arg = spec.partition(':')
+        self.every = 1
+        if kind == 'every':
+            if not arg.isdigit() or int(arg) < 1:
+                raise ValueError(f"Bad record policy '{spec}' (every:N needs N >= 1)")
+            kind, self.every = 'step', int(arg)
+        elif arg or kind not in ('microtick', 'step', 'emissions', 'none'):
+            raise ValueError(f"Unknown record policy '{spec}' (choose {'|'.join(self.CHOICES)})")
+        self.kind = kind
+        self.records_all = kind == 'microtick'
+
+    def wants(self, step: int, microtick: int, rho_triggered: bool) -> bool:
+        """Whether the state at (step, microtick) should be recorded."""
+        kind = self.kind
+        if kind == 'microtick':
+            return True
+        if kind == 'step':
+            return microtick == 11 and (step + 1) % self.every == 0
+        if kind == 'emissions':
+            return bool(rho_triggered)
+        return False
+
+    def __repr__(self):
+        return f"RecordPolicy('{self.spec}')"
+
+
+class CSVStreamSink:
+    """
+    Writes recorder batches to a (optionally compressed) CSV file as they fill.
+
+    resume_at=(byte_offset, rows_written), as returned by checkpoint(),
+    truncates the file back to that point and appends from there instead
+    of starting a new file.
+    """
+
+    def __init__(self, filename: str, headers: List[str],
+                 format_row: Callable[['TraceRow'], list],
+                 compression: Optional[str] = None,
+                 resume_at: Optional[Tuple[int, int]] = None):
+        self.filename = filename
+        self.format_row = format_row
+        self.compression = resolve_compression(filename, compression)
+        self.rows_written = 0
+        allow_bigint_text()
+        if resume_at is None:
+            self._file = open_text_stream(filename, self.compression)
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(headers)
+        else:
+            offset, self.rows_written = resume_at
+            with open(filename, 'r+b') as f:
+                f.truncate(offset)
+            self._file = open_text_stream(filename, self.compression, 'at')
+            self._writer = csv.writer(self._file)
+
+    def write_rows(self, rows: Iterable['TraceRow']):
+        for row in rows:
+            self._writer.writerow(self.format_row(row))
+            self.rows_written += 1
+        self._file.flush()
+
+    def checkpoint(self) -> Tuple[int, int]:
+        """
+        Make everything written so far durable; returns (byte_offset, rows_written).
+
+        A compressed stream is finished and a new gzip member / xz stream
+        is started, so the file is decodable up to the offset (both
+        formats read concatenated members back as one stream).
+        """
+        if self.compression is None:
+            self._file.flush()
+        else:
+            self._file.close()
+            self._file = open_text_stream(self.filename, self.compression, 'at')
+            self._writer = csv.writer(self._file)
+        return os.path.getsize(self.filename), self.rows_written
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class TraceRecorder:
+    """
+    Columnar, chunk-preallocated store of recorded TRTS states.
+
+    Rational values are passed as (numerator, denominator) integer pairs.
+    Column views returned by column() must be released before the next
+    append (CPython releases them as soon as they go out of scope).
+
+    If sink is given, each full chunk is handed to sink.write_rows() and
+    dropped; row(), column() and emissions() then only see the current
+    batch, while summary() covers the whole run.
+
+    With ratio_target set, append() ignores ratio/error: they are derived
+    from the stored υ/β pairs with ratio_float() (error = |ratio - target|)
+    only when a row, column, flush or summary needs them.
+    """
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK, sink=None,
+                 ratio_target: Optional[float] = None):
+        self.chunk_size = chunk_size
+        self.sink = sink
+        self.ratio_target = ratio_target
+        self._derived = 0
+        self._columns = {name: array(code) for name, code in SCALAR_COLUMNS}
+        self._zero_chunks = {name: array(code, bytes(array(code).itemsize * chunk_size))
+                             for name, code in SCALAR_COLUMNS}
+        self._blob = bytearray()
+        self._size = 0
+        self._capacity = 0
+        self.emission_count = 0
+
+        # Running totals for rows already flushed to the sink
+        self._flushed_rows = 0
+        self._flushed_error = (float('inf'), float('-inf'), 0.0)
+        self._flushed_last = (None, None)
+        self._flushed_emission_steps = array('q')
+
+        # States passed over by a RecordPolicy
+        self._skipped_rows = 0
+        self._skipped_emission_steps = array('q')
+
+    def _grow(self):
+        """Extend every column by one preallocated chunk."""
+        for name, col in self._columns.items():
+            col.extend(self._zero_chunks[name])
+        self._capacity += self.chunk_size
+
+    def append(self, step: int, microtick: int,
+               upsilon: Sequence[int], beta: Sequence[int], koppa: Sequence[int],
+               rho_triggered: bool, rho_prime, imbalance_active: bool,
+               ratio: float = 0.0, error: float = 0.0):
+        """Record one state. rho_triggered rows count as emissions."""
+        if self._size == self._capacity:
+            self._grow()
+        i = self._size
+        cols = self._columns
+        cols['step'][i] = step
+        cols['microtick'][i] = microtick
+        cols['rho_triggered'][i] = bool(rho_triggered)
+        cols['imbalance_active'][i] = bool(imbalance_active)
+        cols['emission_count'][i] = self.emission_count
+        cols['blob_offset'][i] = len(self._blob)
+        if self.ratio_target is None:
+            cols['ratio'][i] = ratio
+            cols['error'][i] = error
+
+        blob = self._blob
+        for value in (*upsilon, *beta, *koppa, rho_prime or 0):
+            encode_int(value, blob)
+
+        self._size += 1
+        if rho_triggered:
+            self.emission_count += 1
+        if self.sink is not None and self._size == self.chunk_size:
+            self.flush()
+
+    def skip(self, step: int, rho_triggered: bool):
+        """Account for a state that was not recorded (keeps emission totals whole-run)."""
+        self._skipped_rows += 1
+        if rho_triggered:
+            self._skipped_emission_steps.append(step)
+            self.emission_count += 1
+
+    def skip_jumped(self, count: int):
+        """Account for count states an engine jumped over without evaluating them."""
+        self._skipped_rows += count
+
+    def flush(self):
+        """Hand the current batch to the sink, fold it into the totals and reset."""
+        if self.sink is None or self._size == 0:
+            return
+        self._derive_ratios()
+        self.sink.write_rows(self)
+
+        self._flushed_error = self._error_totals()
+        self._flushed_last = (self._columns['ratio'][self._size - 1],
+                              self._columns['error'][self._size - 1])
+        self._flushed_emission_steps.extend(self._emission_steps())
+        self._flushed_rows += self._size
+
+        self._size = self._derived = 0
+        self._blob = bytearray()
+
+    def _derive_ratios(self):
+        """Fill the ratio/error columns of rows appended since the last call (lazy mode)."""
+        target = self.ratio_target
+        if target is None or self._derived == self._size:
+            return
+        cols = self._columns
+        offsets, ratios, errors = cols['blob_offset'], cols['ratio'], cols['error']
+        blob = self._blob
+        for i in range(self._derived, self._size):
+            pos = offsets[i]
+            u_num, pos = decode_int(blob, pos)
+            u_den, pos = decode_int(blob, pos)
+            b_num, pos = decode_int(blob, pos)
+            b_den, _ = decode_int(blob, pos)
+            ratio = ratio_float((u_num, u_den), (b_num, b_den))
+            ratios[i] = ratio
+            errors[i] = abs(ratio - target)
+        self._derived = self._size
+
+    def close(self):
+        """Flush any pending rows and close the sink."""
+        if self.sink is not None:
+            self.flush()
+            self.sink.close()
+
+    def get_state(self) -> Dict:
+        """
+        Everything needed to continue this recording elsewhere.
+
+        Columns are saved as native-endian bytes. With a sink, call
+        flush() first so only the run-wide totals need saving.
+        """
+        self._derive_ratios()
+        lo, hi, total = self._flushed_error
+        last_ratio, last_error = self._flushed_last
+        state = {
+            'size': self._size,
+            'emission_count': self.emission_count,
+            'flushed_rows': self._flushed_rows,
+            'flushed_error_min': lo,
+            'flushed_error_max': hi,
+            'flushed_error_sum': total,
+            'flushed_last_ratio': last_ratio,
+            'flushed_last_error': last_error,
+            'flushed_emission_steps': self._flushed_emission_steps.tobytes(),
+            'skipped_rows': self._skipped_rows,
+            'skipped_emission_steps': self._skipped_emission_steps.tobytes(),
+            'blob': bytes(self._blob),
+        }
+        for name, _ in SCALAR_COLUMNS:
+            state[f'column_{name}'] = self._columns[name][:self._size].tobytes()
+        return state
+
+    def set_state(self, state: Dict):
+        """Restore a recording saved by get_state()."""
+        for name, code in SCALAR_COLUMNS:
+            col = array(code)
+            col.frombytes(state[f'column_{name}'])
+            self._columns[name] = col
+        self._size = self._capacity = self._derived = state['size']
+        self._blob = bytearray(state['blob'])
+        self.emission_count = state['emission_count']
+        self._flushed_rows = state['flushed_rows']
+        self._flushed_error = (state['flushed_error_min'], state['flushed_error_max'],
+                               state['flushed_error_sum'])
+        self._flushed_last = (state['flushed_last_ratio'], state['flushed_last_error'])
+        self._flushed_emission_steps = array('q')
+        self._flushed_emission_steps.frombytes(state['flushed_emission_steps'])
+        self._skipped_rows = state['skipped_rows']
+        self._skipped_emission_steps = array('q')
+        self._skipped_emission_steps.frombytes(state['skipped_emission_steps'])
+
+    def _error_totals(self) -> Tuple[float, float, float]:
+        """Error (min, max, sum) over flushed rows plus the current batch."""
+        lo, hi, total = self._flushed_error
+        if self._size:
+            errors = self.column('error')
+            lo, hi, total = min(lo, min(errors)), max(hi, max(errors)), total + sum(errors)
+        return lo, hi, total
+
+    def _emission_steps(self) -> List[int]:
+        """Steps of the ρ-triggered rows in the current batch (columns only, no blob decode)."""
+        flags, steps = self._columns['rho_triggered'], self._columns['step']
+        return [steps[i] for i in range(self._size) if flags[i]]
+
+    def summary(self) -> Dict:
+        """
+        Run-wide totals: recorded rows, observed (recorded + skipped) states,
+        final recorded ratio/error, error min/max/sum over recorded rows and
+        the steps of every emission, recorded or not.
+        """
+        self._derive_ratios()
+        lo, hi, total = self._error_totals()
+        final_ratio, final_error = self._flushed_last
+        if self._size:
+            final_ratio = self._columns['ratio'][self._size - 1]
+            final_error = self._columns['error'][self._size - 1]
+        emission_steps = list(self._flushed_emission_steps) + self._emission_steps()
+        if self._skipped_emission_steps:
+            emission_steps = list(heapq.merge(emission_steps, self._skipped_emission_steps))
+        rows = self._flushed_rows + self._size
+        return {
+            'rows': rows,
+            'observed': rows + self._skipped_rows,
+            'final_ratio': final_ratio,
+            'final_error': final_error,
+            'min_error': lo,
+            'max_error': hi,
+            'sum_error': total,
+            'emission_steps': emission_steps,
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> memoryview:
+        """Zero-copy view of a scalar column, trimmed to the recorded length."""
+        if name in ('ratio', 'error'):
+            self._derive_ratios()
+        return memoryview(self._columns[name])[:self._size]
+
+    def row(self, index: int) -> TraceRow:
+        """Decode one recorded state."""
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('trace row out of range')
+        self._derive_ratios()
+        cols = self._columns
+        pos = cols['blob_offset'][index]
+        values = []
+        for _ in range(7):
+            value, pos = decode_int(self._blob, pos)
+            values.append(value)
+        return TraceRow(
+            cols['step'][index], cols['microtick'][index],
+            (values[0], values[1]), (values[2], values[3]), (values[4], values[5]),
+            bool(cols['rho_triggered'][index]), values[6],
+            bool(cols['imbalance_active'][index]),
+            cols['emission_count'][index], cols['ratio'][index], cols['error'][index],
+        )
+
+    __getitem__ = row
+
+    def __iter__(self) -> Iterator[TraceRow]:
+        for i in range(self._size):
+            yield self.row(i)
+
+    def emissions(self) -> Iterator[TraceRow]:
+        """Rows recorded with an active ρ-trigger."""
+        flags = self._columns['rho_triggered']
+        for i in range(self._size):
+            if flags[i]:
+                yield self.row(i)
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the recorded data."""
+        return (sum(col.itemsize for col in self._columns.values()) * self._capacity
+                + len(self._blob))
+
+    def write_csv(self, filename: str, headers: List[str],
+                  format_row: Callable[[TraceRow], list]):
+        """Write every recorded row through format_row, streaming from the columns."""
+        allow_bigint_text()
+        with open(filename, 'w', newline='') as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(headers)
+            writer.writerows(format_row(row) for row in self)
@@ -1,10 +1,19 @@
 # EXECUTING TRTS PROPAGATION WITH TARGET ANALYSIS
+from trts_eventbus import ConsoleSink, EventBus
+from trts_monitors import RatioWindow
+from trtscore import TRTSEngine
+
 print("🎯 TARGETS LOADED - STANDARD MODEL PARAMETERS")
 print("MISSION: Derive from pure rational propagation")
 print("CONSTRAINTS: No fitting, no scaling, no continuum contamination")
 
-# Initialize and run extended propagation
-engine = TRTSEngine()
+# Initialize and run extended propagation (engine events narrated on the console)
+engine = TRTSEngine(events=EventBus([ConsoleSink()]))
+
+# Target windows are checked exactly on υ/β (open intervals, as before);
+# a float is only formed for the report when one of them holds
+engine.add_monitor(RatioWindow('α-INVERSE CANDIDATE', '137.0', '137.1', inclusive=False))
+engine.add_monitor(RatioWindow('PROTON/ELECTRON CANDIDATE', 1800, 1900, inclusive=False))
 
 print("\n🔬 INITIATING DEEP PROPAGATION ANALYSIS")
 print("Monitoring for emergent constants...")
@@ -12,13 +21,6 @@ print("Monitoring for emergent constants...")
 for step in range(50):  # Initial deep run
     engine.execute_step()
     
-    # Monitor for key convergence points
-    current_ratio = float(engine.upsilon/engine.beta)
-    
-    # Check for fine-structure constant emergence
-    if 137.0 < current_ratio < 137.1:
-        print(f"⚠️  α-INVERSE CANDIDATE: {current_ratio} at step {step}")
-    
-    # Check for mass ratio candidates
-    if 1800 < current_ratio < 1900:
-        print(f"⚠️  PROTON/ELECTRON CANDIDATE: {current_ratio} at step {step}")
+    # Monitor for key convergence points (fine-structure constant, mass ratio)
+    for monitor in engine.monitors.last_fired:
+        print(f"⚠️  {monitor.name}: {engine.ratio()} at step {step}")
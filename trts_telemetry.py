@@ -0,0 +1,123 @@
+"""
+TRTS Operand Telemetry and Run Budgets
+Bit-length tracking for unreduced propagation.
+
+Engines that avoid GCD let numerators/denominators grow without bound.
+BitLengthTelemetry records, per observed microtick, the bit-length of
+each operand (max of numerator and denominator) as last/peak counters
+and power-of-two histograms. RunBudget turns those numbers (and the
+process RSS) into a clean stop status instead of a swapping worker.
+"""
+
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+HISTOGRAM_BUCKETS = 65  # bucket k holds bit-lengths in [2^(k-1), 2^k)
+
+
+def current_rss_mb() -> float:
+    """Resident set size of this process in MB (peak RSS where /proc is missing)."""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class BitLengthTelemetry:
+    """Per-operand bit-length counters and histograms."""
+
+    def __init__(self, operands: Sequence[str] = ('upsilon', 'beta', 'koppa')):
+        self.operands = tuple(operands)
+        self.samples = 0
+        self.last = [0] * len(self.operands)
+        self.peak = [0] * len(self.operands)
+        self.histograms = [[0] * HISTOGRAM_BUCKETS for _ in self.operands]
+
+    def observe(self, *pairs: Tuple[int, int]) -> int:
+        """
+        Record one (numerator, denominator) pair per operand.
+
+        Returns the largest bit-length seen in this observation.
+        """
+        worst = 0
+        last, peak, histograms = self.last, self.peak, self.histograms
+        for i, (num, den) in enumerate(pairs):
+            bits = max(num.bit_length(), den.bit_length())
+            last[i] = bits
+            if bits > peak[i]:
+                peak[i] = bits
+            histograms[i][min(bits.bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+            if bits > worst:
+                worst = bits
+        self.samples += 1
+        return worst
+
+    def snapshot(self) -> Dict:
+        """Counters and non-empty histogram buckets keyed by operand name."""
+        return {
+            'samples': self.samples,
+            'last_bits': dict(zip(self.operands, self.last)),
+            'peak_bits': dict(zip(self.operands, self.peak)),
+            'histograms': {
+                name: {f"<{1 << k}": count for k, count in enumerate(hist) if count}
+                for name, hist in zip(self.operands, self.histograms)
+            },
+        }
+
+    def get_state(self) -> Dict:
+        """Raw counters for checkpointing (histograms flattened row-major)."""
+        return {
+            'samples': self.samples,
+            'last': list(self.last),
+            'peak': list(self.peak),
+            'histograms': [count for hist in self.histograms for count in hist],
+        }
+
+    def set_state(self, state: Dict):
+        self.samples = state['samples']
+        self.last = list(state['last'])
+        self.peak = list(state['peak'])
+        flat = state['histograms']
+        self.histograms = [list(flat[i:i + HISTOGRAM_BUCKETS])
+                           for i in range(0, len(flat), HISTOGRAM_BUCKETS)]
+
+    def format_summary(self) -> str:
+        peaks = ', '.join(f"{name}={bits}" for name, bits in zip(self.operands, self.peak))
+        return f"Peak bit-lengths over {self.samples} microticks: {peaks}"
+
+
+class RunBudget:
+    """
+    Operand-size and memory limits for a run.
+
+    check() returns None while within budget, else a short reason such as
+    'max_bits: koppa 70012 > 65536'. RSS is sampled every rss_check_every
+    calls because reading it costs a syscall.
+    """
+
+    def __init__(self, max_bits: Optional[int] = None, max_rss_mb: Optional[float] = None,
+                 rss_check_every: int = 1024):
+        self.max_bits = max_bits
+        self.max_rss_mb = max_rss_mb
+        self.rss_check_every = rss_check_every
+        self._calls = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.max_bits or self.max_rss_mb)
+
+    def check(self, telemetry: BitLengthTelemetry) -> Optional[str]:
+        if self.max_bits:
+            for name, bits in zip(telemetry.operands, telemetry.last):
+                if bits > self.max_bits:
+                    return f"max_bits: {name} {bits} > {self.max_bits}"
+        if self.max_rss_mb:
+            self._calls += 1
+            if self._calls >= self.rss_check_every:
+                self._calls = 0
+                rss = current_rss_mb()
+                if rss > self.max_rss_mb:
+                    return f"max_rss: {rss:.0f}MB > {self.max_rss_mb:.0f}MB"
+        return None
@@ -0,0 +1,483 @@
+"""
+TRTS Binary Trace Files
+Memory-mapped trace storage with random access by step.
+
+A CSV trace has to be parsed from the top to reach any row, decimal
+bigints included. A .trts file is laid out for direct access instead
+(all integers little-endian):
+
+    header    128 bytes: magic, record size, counts, step range and the
+              offsets of the sections below
+    config    the run configuration, in the checkpoint field encoding
+    records   one fixed-width record per recorded state: step, emission
+              count, heap offset, ratio, error, the bit-lengths of the
+              six operands, microtick, ρ and imbalance flags
+    heap      per record, υ, β, κ numerators/denominators and ρ-prime as
+              length-prefixed signed bytes (as in the recorder blob)
+    index     for each step from first to last, the first record of
+              that step (plus the record count), so a step's records
+              are index[s - first] .. index[s - first + 1]
+
+TraceFile maps the file and decodes only the records asked for: a step
+or step range costs two index reads plus its own records. While a run
+streams, the heap grows in a sidecar file (path + '.heap') that close()
+appends, together with the index.
+
+    python trts_tracefile.py to-trace trts_output.csv run.trts
+    python trts_tracefile.py show run.trts --step 900000
+    python trts_tracefile.py to-csv run.trts trts_output.csv
+
+Filtered queries (microtick, ρ-prime, bit-lengths) go through the
+indexes of trts_query.py.
+"""
+
+import argparse
+import csv
+import mmap
+import os
+import shutil
+import struct
+import sys
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from trts_checkpoint import decode_fields, encode_fields
+from trts_recorder import (COMPRESSORS, TraceRow, allow_bigint_text, decode_int, encode_int,
+                           fraction_float, open_text_stream, resolve_compression)
+
+MAGIC = b'TRTSTRC1'
+TRACE_EXTENSION = '.trts'
+
+HEADER_SIZE = 128
+# magic, record size, flags, record count, first step, last step,
+# config offset/size, records offset, heap offset/size, index offset/count
+HEADER = struct.Struct('<8sIIQqqQQQQQQQ')
+FINALIZED = 1
+
+# step, emission_count, heap_offset, ratio, error,
+# bit-lengths (u_num, u_den, b_num, b_den, k_num, k_den),
+# microtick, rho_triggered, imbalance_active
+RECORD = struct.Struct('<qqQdd6IBBB5x')
+_INDEX = struct.Struct('<Q')
+_LEN = struct.Struct('<I')
+_STEP = struct.Struct('<q')
+
+OPERANDS = ('upsilon_num', 'upsilon_den', 'beta_num', 'beta_den', 'koppa_num', 'koppa_den')
+
+# The trtsd CSV layout (the converters read and write it)
+CSV_HEADERS = [
+    'step', 'microtick',
+    'upsilon_num', 'upsilon_den', 'upsilon_value',
+    'beta_num', 'beta_den', 'beta_value',
+    'koppa_num', 'koppa_den', 'koppa_value',
+    'ratio_value', 'target_value', 'convergence_error',
+    'rho_triggered', 'rho_prime', 'imbalance_active',
+    'psi_mode', 'koppa_mode', 'engine_type',
+    'emission_count', 'structural_phase'
+]
+
+
+class TraceFileError(ValueError):
+    """Raised for files that are not complete TRTS trace files."""
+
+
+def csv_row(row: TraceRow, target: float, modes: Sequence[str]) -> list:
+    """Expand a recorded state into the trtsd CSV layout (modes: Ψ, κ, engine)."""
+    (u_num, u_den), (b_num, b_den), (k_num, k_den) = row.upsilon, row.beta, row.koppa
+    return [
+        row.step, row.microtick,
+        u_num, u_den, fraction_float(u_num, u_den),
+        b_num, b_den, fraction_float(b_num, b_den),
+        k_num, k_den, fraction_float(k_num, k_den),
+        row.ratio, target, row.error,
+        row.rho_triggered, row.rho_prime, row.imbalance_active,
+        *modes,
+        row.emission_count, (row.microtick - 1) % 3
+    ]
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+class TraceFileWriter:
+    """
+    Appends TraceRows to a .trts file; close() finishes it.
+
+    Rows must come in non-decreasing step order. The writer also works
+    as a TraceRecorder sink (write_rows / checkpoint / close), and
+    resume_at=(heap_size, rows), as returned by checkpoint(), continues
+    an unfinished (or already closed) file from that point.
+    """
+
+    compression = None
+
+    def __init__(self, filename: str, config: Optional[Dict] = None,
+                 resume_at: Optional[Tuple[int, int]] = None):
+        self.filename = filename
+        self.heap_filename = filename + '.heap'
+        self._steps = array('Q')
+        self._first_step = self._last_step = None
+        if resume_at is None:
+            self._open_new(config or {})
+        else:
+            self._open_resumed(*resume_at)
+
+    def _open_new(self, config: Dict):
+        raw_config = encode_fields(config)
+        self._config_size = len(raw_config)
+        self._records_offset = _align(HEADER_SIZE + len(raw_config))
+        self._file = open(self.filename, 'w+b')
+        self._file.write(bytes(HEADER_SIZE))
+        self._file.write(raw_config)
+        self._file.write(bytes(self._records_offset - HEADER_SIZE - len(raw_config)))
+        self._heap = open(self.heap_filename, 'w+b')
+        self.rows_written = 0
+        self.heap_size = 0
+        self._write_header(0)
+
+    def _open_resumed(self, heap_size: int, rows: int):
+        self._file = open(self.filename, 'r+b')
+        header = _read_header(self._file.read(HEADER_SIZE), self.filename)
+        self._config_size = header['config_size']
+        self._records_offset = header['records_offset']
+        if header['flags'] & FINALIZED:
+            # Closed since the checkpoint: move the heap back to the sidecar
+            self._heap = open(self.heap_filename, 'w+b')
+            self._file.seek(header['heap_offset'])
+            self._heap.write(self._file.read(heap_size))
+        else:
+            self._heap = open(self.heap_filename, 'r+b')
+        self._heap.truncate(heap_size)
+        self._heap.seek(heap_size)
+        self._file.truncate(self._records_offset + rows * RECORD.size)
+        self.rows_written = rows
+        self.heap_size = heap_size
+
+        # Rebuild the step index from the kept records
+        self._file.seek(self._records_offset)
+        for i in range(rows):
+            record = self._file.read(RECORD.size)
+            self._index_step(_STEP.unpack_from(record)[0], i)
+        self._file.seek(0, os.SEEK_END)
+        self._write_header(0)
+
+    def _index_step(self, step: int, position: int):
+        if self._first_step is None:
+            self._first_step = self._last_step = step
+            self._steps.append(position)
+        elif step < self._last_step:
+            raise ValueError(f"Trace steps must not decrease ({step} after {self._last_step})")
+        while self._last_step < step:
+            self._steps.append(position)
+            self._last_step += 1
+
+    def append(self, row: TraceRow):
+        self._index_step(row.step, self.rows_written)
+        operands = (*row.upsilon, *row.beta, *row.koppa)
+        data = bytearray()
+        for value in (*operands, row.rho_prime or 0):
+            encode_int(value, data)
+        self._file.write(RECORD.pack(
+            row.step, row.emission_count, self.heap_size, row.ratio, row.error,
+            *(abs(int(value)).bit_length() for value in operands),
+            row.microtick, bool(row.rho_triggered), bool(row.imbalance_active)))
+        self._heap.write(data)
+        self.heap_size += len(data)
+        self.rows_written += 1
+
+    def write_rows(self, rows: Iterable[TraceRow]):
+        for row in rows:
+            self.append(row)
+        self._file.flush()
+        self._heap.flush()
+
+    def checkpoint(self) -> Tuple[int, int]:
+        """Flush; returns (heap_size, rows_written) for resume_at."""
+        self._file.flush()
+        self._heap.flush()
+        return self.heap_size, self.rows_written
+
+    def _write_header(self, flags: int, heap_offset: int = 0, index_offset: int = 0):
+        position = self._file.tell()
+        first = self._first_step if self._first_step is not None else 0
+        last = self._last_step if self._last_step is not None else -1
+        index_count = len(self._steps) + 1 if self._first_step is not None else 0
+        self._file.seek(0)
+        self._file.write(HEADER.pack(
+            MAGIC, RECORD.size, flags, self.rows_written, first, last,
+            HEADER_SIZE, self._config_size, self._records_offset,
+            heap_offset, self.heap_size, index_offset, index_count))
+        self._file.seek(position)
+
+    def close(self):
+        """Append the heap and the step index and mark the file complete."""
+        if self._file.closed:
+            return
+        self._heap.flush()
+        heap_offset = self._records_offset + self.rows_written * RECORD.size
+        self._file.seek(heap_offset)
+        self._heap.seek(0)
+        shutil.copyfileobj(self._heap, self._file)
+        self._heap.close()
+        os.remove(self.heap_filename)
+
+        index_offset = _align(heap_offset + self.heap_size)
+        self._file.write(bytes(index_offset - heap_offset - self.heap_size))
+        if self._first_step is not None:
+            steps = array('Q', self._steps)
+            steps.append(self.rows_written)
+            if sys.byteorder == 'big':
+                steps.byteswap()
+            self._file.write(steps.tobytes())
+        self._file.truncate()
+        self._write_header(FINALIZED, heap_offset, index_offset)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _read_header(data: bytes, path: str) -> Dict:
+    if len(data) < HEADER.size or not data.startswith(MAGIC):
+        raise TraceFileError(f"{path} is not a TRTS trace file")
+    (_, record_size, flags, count, first, last, config_offset, config_size,
+     records_offset, heap_offset, heap_size, index_offset, index_count) = HEADER.unpack_from(data)
+    if record_size != RECORD.size:
+        raise TraceFileError(f"{path}: record size {record_size}, expected {RECORD.size}")
+    return {
+        'flags': flags, 'count': count, 'first_step': first, 'last_step': last,
+        'config_offset': config_offset, 'config_size': config_size,
+        'records_offset': records_offset, 'heap_offset': heap_offset, 'heap_size': heap_size,
+        'index_offset': index_offset, 'index_count': index_count,
+    }
+
+
+class TraceFile:
+    """
+    Read-only, memory-mapped view of a finished .trts file.
+
+    Rows are decoded on demand: row(i), step(s), rows(start, stop)
+    touch only the records (and heap entries) they return.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            header = _read_header(self._file.read(HEADER_SIZE), filename)
+            if not header['flags'] & FINALIZED:
+                raise TraceFileError(f"{filename} is unfinished (still being written, "
+                                     "or the run stopped before closing it)")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except Exception:
+            self._file.close()
+            raise
+        self._header = header
+        self.first_step = header['first_step']
+        self.last_step = header['last_step']
+        self._count = header['count']
+        self._records = header['records_offset']
+        self._heap = header['heap_offset']
+        self._index = header['index_offset']
+        self.config, _ = decode_fields(self._map, header['config_offset'])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self):
+        if not self._file.closed:
+            self._map.close()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record(self, index: int) -> Tuple:
+        """The raw fixed-width record (see RECORD) of row index."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError('trace row out of range')
+        return RECORD.unpack_from(self._map, self._records + index * RECORD.size)
+
+    def bit_lengths(self, index: int) -> Dict[str, int]:
+        """Bit-lengths of the six operands of row index (no heap access)."""
+        return dict(zip(OPERANDS, self.record(index)[5:11]))
+
+    def row(self, index: int) -> TraceRow:
+        (step, emission_count, heap_offset, ratio, error,
+         *_, microtick, rho_triggered, imbalance_active) = self.record(index)
+        pos = self._heap + heap_offset
+        values = []
+        for _ in range(7):
+            value, pos = decode_int(self._map, pos)
+            values.append(value)
+        return TraceRow(
+            step, microtick,
+            (values[0], values[1]), (values[2], values[3]), (values[4], values[5]),
+            bool(rho_triggered), values[6], bool(imbalance_active),
+            emission_count, ratio, error,
+        )
+
+    def rho_prime(self, index: int) -> int:
+        """ρ-prime of row index (0 if none), skipping the operand bytes."""
+        pos = self._heap + self.record(index)[2]
+        for _ in range(6):
+            pos += _LEN.size + _LEN.unpack_from(self._map, pos)[0]
+        return decode_int(self._map, pos)[0]
+
+    __getitem__ = row
+
+    def __iter__(self) -> Iterator[TraceRow]:
+        for i in range(self._count):
+            yield self.row(i)
+
+    def _step_start(self, step: int) -> int:
+        """First row whose step is >= step."""
+        if self._count == 0 or step <= self.first_step:
+            return 0
+        if step > self.last_step:
+            return self._count
+        return _INDEX.unpack_from(self._map, self._index + (step - self.first_step) * 8)[0]
+
+    def row_range(self, start: Optional[int] = None, stop: Optional[int] = None) -> range:
+        """Row indices of the steps start <= step < stop (an omitted bound is open)."""
+        lo = 0 if start is None else self._step_start(start)
+        hi = self._count if stop is None else self._step_start(stop)
+        return range(lo, max(lo, hi))
+
+    def rows(self, start: Optional[int] = None, stop: Optional[int] = None) -> Iterator[TraceRow]:
+        """Rows of the steps start <= step < stop."""
+        for i in self.row_range(start, stop):
+            yield self.row(i)
+
+    def step(self, step: int) -> List[TraceRow]:
+        """Every recorded row of one step."""
+        return list(self.rows(step, step + 1))
+
+
+def write_trace(filename: str, rows: Iterable[TraceRow], config: Optional[Dict] = None) -> int:
+    """Write rows to a new .trts file; returns the number of rows."""
+    with TraceFileWriter(filename, config) as writer:
+        writer.write_rows(rows)
+        return writer.rows_written
+
+
+def _parse_bool(text: str) -> bool:
+    return text == 'True'
+
+
+def csv_to_trace(csv_path: str, trace_path: str, compression: Optional[str] = None) -> int:
+    """
+    Convert a trace in the trtsd CSV layout to a .trts file.
+
+    The modes and target of the first row go to the file's config;
+    numerators/denominators are parsed exactly, ratio and error are
+    read back from their (repr-exact) CSV floats.
+    """
+    allow_bigint_text()
+    compression = resolve_compression(csv_path, compression)
+    with COMPRESSORS[compression](csv_path, 'rt', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        col = {name: i for i, name in enumerate(header)}
+        missing = [name for name in CSV_HEADERS if name not in col]
+        if missing:
+            raise ValueError(f"{csv_path} is not in the trtsd CSV layout (missing {missing})")
+        writer = None
+        try:
+            for fields in reader:
+                if writer is None:
+                    writer = TraceFileWriter(trace_path, {
+                        'psi_mode': fields[col['psi_mode']],
+                        'koppa_mode': fields[col['koppa_mode']],
+                        'engine_type': fields[col['engine_type']],
+                        'convergence_target': float(fields[col['target_value']]),
+                        'source': os.path.basename(csv_path),
+                    })
+                writer.append(TraceRow(
+                    int(fields[col['step']]), int(fields[col['microtick']]),
+                    (int(fields[col['upsilon_num']]), int(fields[col['upsilon_den']])),
+                    (int(fields[col['beta_num']]), int(fields[col['beta_den']])),
+                    (int(fields[col['koppa_num']]), int(fields[col['koppa_den']])),
+                    _parse_bool(fields[col['rho_triggered']]),
+                    int(fields[col['rho_prime']] or 0),
+                    _parse_bool(fields[col['imbalance_active']]),
+                    int(fields[col['emission_count']]),
+                    float(fields[col['ratio_value']]), float(fields[col['convergence_error']]),
+                ))
+            if writer is None:
+                writer = TraceFileWriter(trace_path, {'source': os.path.basename(csv_path)})
+        finally:
+            if writer is not None:
+                writer.close()
+        return writer.rows_written
+
+
+def trace_to_csv(trace_path: str, csv_path: str, compression: Optional[str] = None) -> int:
+    """Convert a .trts file back to the trtsd CSV layout; returns the number of rows."""
+    allow_bigint_text()
+    with TraceFile(trace_path) as trace, open_text_stream(csv_path, compression) as f:
+        config = trace.config
+        target = config.get('convergence_target', 0.0)
+        modes = (config.get('psi_mode', ''), config.get('koppa_mode', ''),
+                 config.get('engine_type', ''))
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADERS)
+        writer.writerows(csv_row(row, target, modes) for row in trace)
+        return len(trace)
+
+
+def _format_row(row: TraceRow) -> str:
+    (u_num, u_den), (b_num, b_den), (k_num, k_den) = row.upsilon, row.beta, row.koppa
+    flag = f"  ρ={row.rho_prime}" if row.rho_triggered else ''
+    return (f"step {row.step} mt{row.microtick}: υ={u_num}/{u_den}  β={b_num}/{b_den}  "
+            f"κ={k_num}/{k_den}  ratio={row.ratio:.10f}{flag}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Convert and inspect binary TRTS trace files')
+    commands = parser.add_subparsers(dest='command', required=True)
+    to_trace = commands.add_parser('to-trace', help='CSV (trtsd layout) -> .trts')
+    to_trace.add_argument('source')
+    to_trace.add_argument('target')
+    to_csv = commands.add_parser('to-csv', help='.trts -> CSV (trtsd layout)')
+    to_csv.add_argument('source')
+    to_csv.add_argument('target')
+    info = commands.add_parser('info', help='Header, configuration and step range')
+    info.add_argument('trace')
+    show = commands.add_parser('show', help='Print the rows of a step or step range')
+    show.add_argument('trace')
+    show.add_argument('--step', type=int, required=True, help='First (or only) step')
+    show.add_argument('--stop', type=int, default=None, help='End of the step range (exclusive)')
+    args = parser.parse_args(argv)
+
+    allow_bigint_text()
+    if args.command == 'to-trace':
+        rows = csv_to_trace(args.source, args.target)
+        print(f"Wrote {rows} rows to {args.target}")
+    elif args.command == 'to-csv':
+        rows = trace_to_csv(args.source, args.target)
+        print(f"Wrote {rows} rows to {args.target}")
+    elif args.command == 'info':
+        with TraceFile(args.trace) as trace:
+            print(f"{args.trace}: {len(trace)} rows, steps {trace.first_step}..{trace.last_step}")
+            for name, value in trace.config.items():
+                print(f"  {name}: {value}")
+    else:
+        stop = args.stop if args.stop is not None else args.step + 1
+        with TraceFile(args.trace) as trace:
+            for row in trace.rows(args.step, stop):
+                print(_format_row(row))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,133 @@
+"""
+TRTS Sliding Windows
+Incremental statistics over the last W records of a trace stream.
+
+Slicing a fresh window at every offset and recomputing its metrics is
+O(N·W). A SlidingWindow instead keeps, per named feature, a running
+sum (for counts, densities and means) and/or monotonic deques (for
+min/max), so each push updates every statistic in amortized O(1) and a
+trace of any length - a list, an engine recorder or a generator - is
+analysed in one pass with O(W) memory.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Mapping, Optional
+
+
+class MonotonicDeque:
+    """
+    Window minimum (or maximum) in amortized O(1) per push.
+
+    Holds (index, value) pairs whose values are increasing (decreasing
+    for maximum=True); values that can never again be the extreme are
+    dropped on push, indices that left the window are dropped on evict.
+    """
+
+    def __init__(self, maximum: bool = False):
+        self.maximum = maximum
+        self._items = deque()
+
+    def push(self, index: int, value):
+        items = self._items
+        if self.maximum:
+            while items and items[-1][1] <= value:
+                items.pop()
+        else:
+            while items and items[-1][1] >= value:
+                items.pop()
+        items.append((index, value))
+
+    def evict(self, first_index: int):
+        """Forget entries older than first_index."""
+        items = self._items
+        while items and items[0][0] < first_index:
+            items.popleft()
+
+    @property
+    def value(self):
+        return self._items[0][1] if self._items else None
+
+
+class SlidingWindow:
+    """
+    Rolling statistics over the last size pushes.
+
+    sums names the features with a running total (total/mean), extrema
+    those with a window min/max. A feature value of None is absent from
+    that record: it adds nothing to the total and is not an extreme.
+    """
+
+    def __init__(self, size: int, sums: Iterable[str] = (), extrema: Iterable[str] = ()):
+        if size < 1:
+            raise ValueError("Window size must be at least 1")
+        self.size = size
+        self.sums = tuple(sums)
+        self.extrema = tuple(extrema)
+        self._totals: Dict[str, float] = {name: 0 for name in self.sums}
+        self._present: Dict[str, int] = {name: 0 for name in self.sums}
+        self._minima = {name: MonotonicDeque() for name in self.extrema}
+        self._maxima = {name: MonotonicDeque(maximum=True) for name in self.extrema}
+        self._records = deque()
+        self.pushed = 0
+
+    def push(self, values: Mapping[str, object]) -> bool:
+        """Add one record's feature values; True once the window is full."""
+        index = self.pushed
+        self.pushed += 1
+        record = {name: values.get(name) for name in self.sums}
+        self._records.append(record)
+        for name, value in record.items():
+            if value is not None:
+                self._totals[name] += value
+                self._present[name] += 1
+        for name in self.extrema:
+            value = values.get(name)
+            if value is not None:
+                self._minima[name].push(index, value)
+                self._maxima[name].push(index, value)
+
+        if len(self._records) > self.size:
+            for name, value in self._records.popleft().items():
+                if value is not None:
+                    self._totals[name] -= value
+                    self._present[name] -= 1
+            first = self.pushed - self.size
+            for name in self.extrema:
+                self._minima[name].evict(first)
+                self._maxima[name].evict(first)
+        return self.full
+
+    @property
+    def full(self) -> bool:
+        return len(self._records) == self.size
+
+    @property
+    def count(self) -> int:
+        return len(self._records)
+
+    @property
+    def start(self) -> int:
+        """Index (in push order) of the oldest record in the window."""
+        return self.pushed - len(self._records)
+
+    def total(self, name: str):
+        return self._totals[name]
+
+    def present(self, name: str) -> int:
+        """Records in the window that carry a value for name."""
+        return self._present[name]
+
+    def density(self, name: str) -> float:
+        """total / window length (the fraction of records, for 0/1 features)."""
+        return self._totals[name] / len(self._records) if self._records else 0.0
+
+    def mean(self, name: str) -> Optional[float]:
+        """Mean over the records that carry a value for name."""
+        present = self._present[name]
+        return self._totals[name] / present if present else None
+
+    def min(self, name: str):
+        return self._minima[name].value
+
+    def max(self, name: str):
+        return self._maxima[name].value
@@ -1,5 +1,21 @@
-import sympy as sp
 import math
+import argparse
+
+from trts_eventbus import (SINK_CHOICES, Convergence, Emission, EventBus, KoppaDump, NullTick,
+                           PsiTransform, StepEnd, StepStart, bus_from_specs)
+from trts_fingerprint import FingerprintLog
+from trts_lazy import lazy_import
+from trts_monitors import Monitor, MonitorSet, parse_monitor
+from trts_primes import PrimeTrigger
+from trts_recorder import RecordPolicy, TraceRecorder, ratio_float
+
+SMALL_PRIME_TRIGGER = PrimeTrigger([2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47])
+SQRT2 = math.sqrt(2)
+
+# sympy is imported by the first engine, not by importing this module
+sp = lazy_import('sympy')
+# asyncio and the telemetry server load only for runs started with --telemetry
+trts_live = lazy_import('trts_live')
 
 class TRTSEngine:
     """
@@ -8,7 +24,7 @@ class TRTSEngine:
     Prime checks use abs(), but sign is preserved in propagation.
     """
     
-    def __init__(self):
+    def __init__(self, record='step', monitor_every='step', fingerprint=False, events=None):
         self.step_count = 0
         self.microtick = 0
         self.rho_triggered = False
@@ -20,17 +36,32 @@ class TRTSEngine:
         self.koppa = []                       # Koppa ledger - stores rationals
         self.imbalance_active = True          # ϙ₁ - Initial active state
         
-        # Track state history
-        self.state_history = []
+        # Track state history (by default one columnar record per step);
+        # ratio/error against √2 are derived from υ/β only when read
+        self.record_policy = RecordPolicy(record)
+        self.recorder = TraceRecorder(ratio_target=SQRT2)
         self.emission_history = []
+        self.emissions_by_microtick = [0] * 12
+        self._emission_step = None  # last step with an emission (Ω check is O(1))
+        
+        # Emission / Ψ / Ω / κ-dump / step events (see trts_eventbus); silent
+        # and free when no sink is subscribed
+        self.events = events if events is not None else EventBus()
         
+        # Exact predicates on υ/β, checked by cross-multiplication
+        self.monitors = MonitorSet(monitor_every)
+        
+        # Rolling per-step fingerprint of (υ, β) (κ ledger as 0/1, as recorded)
+        self.fingerprints = FingerprintLog() if fingerprint else None
+        
+    def add_monitor(self, monitor: Monitor) -> Monitor:
+        """Register a monitor; one with stop=True sets monitors.stopped_by when it holds"""
+        return self.monitors.add(monitor)
+    
     def is_prime_trigger(self, n):
         """Check if number is prime using abs(), but preserve original sign"""
         # Use absolute value ONLY for prime check
-        abs_val = abs(n)
-        if abs_val <= 1:
-            return False
-        return abs_val in [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47]
+        return SMALL_PRIME_TRIGGER(n)
     
     def psi_transform(self, a, b):
         """Ψ-transformation: (a/b, c/d) → (d/a, b/c)"""
@@ -61,13 +92,18 @@ class TRTSEngine:
                     'value': current_val,
                     'prime': self.rho_prime
                 })
-                print(f"EMISSION: mt{self.microtick}, prime {self.rho_prime}")
+                self.emissions_by_microtick[self.microtick] += 1
+                self._emission_step = self.step_count
+                if self.events:
+                    self.events.publish(Emission(self.step_count, self.microtick, self.rho_prime))
         
         # Ψ-transformation at NEXT µ after ρ trigger
         if self.rho_triggered and self.microtick in [2, 5, 8, 11]:
-            print(f"Ψ-TRANSFORM at mt{self.microtick}")
             self.upsilon, self.beta = self.psi_transform(self.upsilon, self.beta)
             self.rho_triggered = False
+            if self.events:
+                self.events.publish(PsiTransform(self.step_count, self.microtick,
+                                                 self.upsilon, self.beta))
         
         # µ-transition always at mt11
         if self.microtick == 11:
@@ -79,56 +115,108 @@ class TRTSEngine:
                 pass  # Implementation for dormant state
         
         # Ω - Null Tick injection after ρ emission
-        if self.microtick == 11 and any(e['step'] == self.step_count 
-                                      for e in self.emission_history):
-            print("Ω - NULL TICK INJECTED")
+        if self.microtick == 11 and self._emission_step == self.step_count and self.events:
+            self.events.publish(NullTick(self.step_count))
         
         # Koppa dump at transition to next step's mt1
         if self.microtick == 11 and self.koppa:
-            koppa_value = sum(self.koppa, sp.Rational(0))
-            print(f"KOPPA DUMP: {koppa_value}")
+            if self.events:
+                self.events.publish(KoppaDump(self.step_count, sum(self.koppa, sp.Rational(0))))
             # Koppa value would feed into next cycle
             self.koppa = []
     
     def execute_step(self):
         """Execute one full TRTS step (11 microticks)"""
-        print(f"\n--- STEP {self.step_count} ---")
-        print(f"Initial: υ={self.upsilon}, β={self.beta}")
+        if self.events:
+            self.events.publish(StepStart(self.step_count, self.upsilon, self.beta))
         
         self.microtick = 0
         for _ in range(11):
             self.advance_microtick()
-        
-        # Record final state
-        self.state_history.append({
-            'step': self.step_count,
-            'upsilon': self.upsilon,
-            'beta': self.beta,
-            'ratio': self.upsilon/self.beta
-        })
+            if self.record_policy.wants(self.step_count, self.microtick, self.rho_triggered):
+                self._record_state()
+            else:
+                self.recorder.skip(self.step_count, self.rho_triggered)
+            if self.monitors and self.monitors.due(self.step_count, self.microtick):
+                self.monitors.check(self.step_count, self.microtick,
+                                    (self.upsilon.p, self.upsilon.q), (self.beta.p, self.beta.q))
         
         self.step_count += 1
+        if self.fingerprints is not None:
+            self.fingerprints.update((self.upsilon.p, self.upsilon.q), (self.beta.p, self.beta.q))
         
-        print(f"Final: υ={self.upsilon}, β={self.beta}")
-        print(f"Ratio υ/β: {float(self.upsilon/self.beta):.6f}")
-        print(f"Target √2: {math.sqrt(2):.6f}")
+        if self.events:
+            self.events.publish(StepEnd(self.step_count - 1, self.upsilon, self.beta,
+                                        self.ratio(), SQRT2))
+
+    def ratio(self) -> float:
+        """υ/β as a float, from integer cross-products (no Rational division)"""
+        return ratio_float((self.upsilon.p, self.upsilon.q), (self.beta.p, self.beta.q))
+
+    def _record_state(self):
+        """Record the current state (κ ledger is not a single rational: stored as 0/1)"""
+        self.recorder.append(
+            self.step_count, self.microtick,
+            (self.upsilon.p, self.upsilon.q), (self.beta.p, self.beta.q), (0, 1),
+            self.rho_triggered, self.rho_prime, self.imbalance_active
+        )
 
 # Initialize and run demonstration
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='TRTS pure propagation demonstration')
+    parser.add_argument('--record', type=str, default='step',
+                        help='Recording policy: ' + '|'.join(RecordPolicy.CHOICES))
+    parser.add_argument('--steps', type=int, default=5, help='Steps to run')
+    parser.add_argument('--monitor', type=str, action='append', default=[],
+                        help='Count hits of ratio=LOW:HIGH, square=TARGET:EPS or bits=B')
+    parser.add_argument('--stop-when', type=str, action='append', default=[],
+                        help='Stop after the step in which this predicate first holds')
+    parser.add_argument('--monitor-every', type=str, default='step',
+                        help='Monitor granularity: ' + '|'.join(MonitorSet.GRANULARITIES))
+    parser.add_argument('--fingerprints', type=str, default=None,
+                        help='Write the rolling per-step state fingerprints to this file')
+    parser.add_argument('--telemetry', type=str, default=None,
+                        help='Serve live JSON status on PORT, HOST:PORT or a socket path')
+    parser.add_argument('--events', type=str, action='append', default=None,
+                        help='Event sink (repeatable, default console): ' + '|'.join(SINK_CHOICES))
+    args = parser.parse_args()
+    try:
+        events = bus_from_specs(args.events or ['console'])
+    except (ValueError, OSError) as e:
+        parser.error(str(e))
+    
     print("🚀 TRTS PURE PROPAGATION ENGINE")
     print("CONSTRAINTS: No GCD, No Floats, Pure Rationals")
     print("PRIME CHECK: abs() used for detection only")
     print("SIGN: Preserved in all propagation\n")
     
-    engine = TRTSEngine()
+    engine = TRTSEngine(record=args.record, monitor_every=args.monitor_every,
+                        fingerprint=bool(args.fingerprints), events=events)
+    for spec in args.monitor:
+        engine.add_monitor(parse_monitor(spec))
+    for spec in args.stop_when:
+        engine.add_monitor(parse_monitor(spec, stop=True))
+    
+    telemetry = trts_live.serve_engine(engine, args.telemetry) if args.telemetry else None
     
     # Run first few steps to demonstrate
-    for i in range(5):
+    for i in range(args.steps):
         engine.execute_step()
         
         # Show convergence progress
-        if i > 0:
-            current_ratio = float(engine.upsilon/engine.beta)
-            target = math.sqrt(2)
-            error = abs(current_ratio - target)
-            print(f"Convergence Error: {error:.8f}")
+        if i > 0 and engine.events:
+            engine.events.publish(Convergence(engine.step_count - 1, abs(engine.ratio() - SQRT2)))
+        if engine.monitors.stopped_by:
+            print(f"STOPPED: monitor {engine.monitors.stopped_by.name}")
+            break
+    events.close()
+    if telemetry is not None:
+        telemetry.stop(f"stopped (monitor {engine.monitors.stopped_by.name})"
+                       if engine.monitors.stopped_by else 'completed')
+    
+    if engine.monitors:
+        print(engine.monitors.format_summary())
+    if engine.fingerprints is not None:
+        engine.fingerprints.save(args.fingerprints)
+        print(f"Fingerprint after step {len(engine.fingerprints)}: "
+              f"{engine.fingerprints.value:016x} (log: {args.fingerprints})")